@@ -7,9 +7,14 @@ import aiohttp
 import json
 import logging
 import base64
-import asyncio
 from pathlib import Path
-from faster_whisper import WhisperModel
+
+try:
+    from app.http_client import pooled_session  # webapp context
+    from app.whisper_pool import WhisperPool
+except ImportError:  # pragma: no cover
+    from http_client import pooled_session  # bot context
+    from whisper_pool import WhisperPool
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +27,8 @@ class AIAnalyzer:
         self.base_url = "https://openrouter.ai/api/v1"
         self.config = config
         
-        # Initialize local Whisper model for audio transcription
-        # Using base model for faster processing, can be upgraded to medium/large if needed
-        logger.info("Initializing local Whisper model for audio transcription...")
-        self.whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
-        logger.info("Whisper model loaded successfully")
+        # Local Whisper for voice messages; the model is loaded on first use (or warm_up)
+        self.whisper = WhisperPool()
     
     async def _call_api(self, prompt: str) -> str:
         """Call OpenRouter API"""
@@ -48,7 +50,7 @@ class AIAnalyzer:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     f"{self.base_url}/chat/completions",
                     json=payload,
@@ -170,25 +172,8 @@ class AIAnalyzer:
             
             logger.info(f"Transcribing audio file: {audio_file_path} (size: {audio_path.stat().st_size} bytes)")
             
-            # Run Whisper transcription in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            segments, info = await loop.run_in_executor(
-                None,
-                lambda: self.whisper_model.transcribe(
-                    audio_file_path,
-                    language="ru",  # Force Russian language
-                    beam_size=5,
-                    vad_filter=True,  # Voice Activity Detection to filter out silence
-                    vad_parameters=dict(min_silence_duration_ms=500)
-                )
-            )
-            
-            # Collect all transcribed text segments
-            transcription_parts = []
-            for segment in segments:
-                transcription_parts.append(segment.text.strip())
-            
-            transcription = " ".join(transcription_parts).strip()
+            # Runs on the dedicated Whisper pool; queues behind other voice messages
+            transcription = await self.whisper.transcribe(audio_file_path, language="ru")
             
             if not transcription:
                 logger.warning("Transcription resulted in empty text")
@@ -259,7 +244,7 @@ class AIAnalyzer:
                 "max_tokens": 4000,
             }
 
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     f"{self.base_url}/chat/completions",
                     json=payload,
@@ -328,7 +313,7 @@ class AIAnalyzer:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     f"{self.base_url}/chat/completions",
                     json=payload,
@@ -30,10 +30,15 @@ from config import Config
 from zoom_client import ZoomClient
 from lark_client import LarkClient
 from kimai_client import KimaiClient
-from report_generator import generate_team_report_excel
-from client_report_generator import generate_client_report_pdf
+from kimai_sync import mirror_is_fresh, build_client_report_data as build_mirror_client_report_data
+from report_service import ReportService
 from proposal_calculator import ProposalCalculator
+from llm_cache import LLMCache
+from user_upserts import UserUpsertBuffer
+from whisper_pool import WHISPER_WARMUP
+from doc_extract import TextExtractor, is_supported
 from s3_client import S3Client
+import http_client
 
 # Logging setup
 logging.basicConfig(
@@ -146,6 +151,9 @@ class NeuroConnectorBot:
     def __init__(self):
         self.config = Config()
         self.db = Database(self.config.database_url)
+        self.user_upserts = UserUpsertBuffer(self.db)
+        self.doc_extractor = TextExtractor()
+        self.reports = ReportService()
         self.ai = AIAnalyzer(
             openrouter_key=self.config.openrouter_api_key,
             model=self.config.openrouter_model,
@@ -175,7 +183,9 @@ class NeuroConnectorBot:
                 self.config.kimai_api_token,
             )
         
-        self.proposal_calculator = ProposalCalculator(self.config.openrouter_api_key)
+        self.proposal_calculator = ProposalCalculator(
+            self.config.openrouter_api_key, llm_cache=LLMCache(self.db),
+        )
     
     async def initialize_db(self):
         """Initialize database connection"""
@@ -2406,6 +2416,7 @@ _(Примеры: сложные AI-системы, финтех, e-commerce,
         """Activate staff mode when secret code is entered."""
         user = update.effective_user
         await self.initialize_db()
+        await self.user_upserts.flush()  # the users row must exist before the UPDATE
         await self.db.update_user_role(user.id, "staff")
         logger.info(f"User {user.id} ({user.first_name}) activated staff mode")
         context.user_data['is_staff'] = True
@@ -2417,6 +2428,7 @@ _(Примеры: сложные AI-системы, финтех, e-commerce,
         """Activate admin mode when admin code is entered."""
         user = update.effective_user
         await self.initialize_db()
+        await self.user_upserts.flush()  # the users row must exist before the UPDATE
         await self.db.update_user_role(user.id, "admin")
         logger.info(f"User {user.id} ({user.first_name}) activated admin mode")
         context.user_data['is_staff'] = True
@@ -4181,7 +4193,8 @@ _(Примеры: сложные AI-системы, финтех, e-commerce,
 
         try:
             data = await self.kimai.build_team_report_data(begin_api, end_api)
-            pdf_bytes = generate_team_report_excel(
+            pdf_bytes = await self.reports.render(
+                "team",
                 teams=data["teams"],
                 projects_map=data["projects_map"],
                 report_by_team=data["report_by_team"],
@@ -4424,9 +4437,15 @@ _(Примеры: сложные AI-системы, финтех, e-commerce,
         )
 
         try:
-            data = await self.kimai.build_client_report_data(selected_projects, begin_api, end_api)
+            if await mirror_is_fresh(self.db):
+                data = await build_mirror_client_report_data(
+                    self.db, selected_projects, begin_dt.date(), end_dt.date(),
+                )
+            else:
+                data = await self.kimai.build_client_report_data(selected_projects, begin_api, end_api)
 
-            pdf_bytes = generate_client_report_pdf(
+            pdf_bytes = await self.reports.render(
+                "client",
                 customer_name=customer_name,
                 projects_map=data["projects_map"],
                 report_by_project=data["report_by_project"],
@@ -4794,8 +4813,7 @@ _(Примеры: сложные AI-системы, финтех, e-commerce,
             await update.message.reply_text("❌ Файл слишком большой (макс. 20 МБ).")
             return CP_DESCRIPTION
 
-        supported = file_name.endswith(('.pdf', '.doc', '.docx', '.txt', '.md', '.rtf'))
-        if not supported:
+        if not is_supported(file_name):
             await update.message.reply_text(
                 "❌ Неподдерживаемый формат файла.\n"
                 "Поддерживаются: PDF, DOC, DOCX, TXT.",
@@ -4806,7 +4824,7 @@ _(Примеры: сложные AI-системы, финтех, e-commerce,
         try:
             tg_file = await document.get_file()
             file_bytes = await tg_file.download_as_bytearray()
-            extracted_text = self._extract_text_from_file(bytes(file_bytes), file_name)
+            extracted_text = await self.doc_extractor.extract(bytes(file_bytes), file_name)
 
             if not extracted_text or len(extracted_text.strip()) < 10:
                 await update.message.reply_text(
@@ -4972,48 +4990,6 @@ _(Примеры: сложные AI-системы, финтех, e-commerce,
         )
         return CP_DESCRIPTION
 
-    def _extract_text_from_file(self, file_bytes: bytes, file_name: str) -> str:
-        """Extract text from uploaded file."""
-        file_name_lower = file_name.lower()
-
-        if file_name_lower.endswith('.pdf'):
-            return self._extract_text_from_pdf(file_bytes)
-        elif file_name_lower.endswith(('.doc', '.docx')):
-            return self._extract_text_from_docx(file_bytes)
-        elif file_name_lower.endswith(('.txt', '.md', '.rtf')):
-            try:
-                return file_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                return file_bytes.decode('cp1251', errors='replace')
-        return ""
-
-    @staticmethod
-    def _extract_text_from_pdf(file_bytes: bytes) -> str:
-        try:
-            from pypdf import PdfReader
-            import io
-            reader = PdfReader(io.BytesIO(file_bytes))
-            text_parts = []
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-            return "\n\n".join(text_parts)
-        except Exception as e:
-            logger.error(f"PDF text extraction failed: {e}")
-            return ""
-
-    @staticmethod
-    def _extract_text_from_docx(file_bytes: bytes) -> str:
-        try:
-            from docx import Document
-            import io
-            doc = Document(io.BytesIO(file_bytes))
-            return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
-        except Exception as e:
-            logger.error(f"DOCX text extraction failed: {e}")
-            return ""
-
     async def admin_cp_generate(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Confirm and generate the commercial proposal."""
         query = update.callback_query
@@ -5270,19 +5246,16 @@ def main():
     
     # Middleware to save all users who interact with the bot
     async def save_user_middleware(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Middleware to automatically save users to database"""
+        """Middleware to automatically save users to database (batched, see user_upserts.py)"""
         if update.effective_user:
             user = update.effective_user
-            try:
-                await bot.db.save_user(
-                    telegram_id=user.id,
-                    first_name=user.first_name,
-                    last_name=user.last_name,
-                    username=user.username,
-                    language_code=user.language_code
-                )
-            except Exception as e:
-                logger.error(f"Failed to save user {user.id} in middleware: {e}")
+            bot.user_upserts.add(
+                telegram_id=user.id,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                username=user.username,
+                language_code=user.language_code
+            )
     
     # Create application
     application = Application.builder().token(bot.config.telegram_token).build()
@@ -5625,6 +5598,9 @@ def main():
     async def post_init(app: Application) -> None:
         """Initialize database, register commands, and re-schedule reminders."""
         await bot.initialize_db()
+        bot.user_upserts.start()
+        if WHISPER_WARMUP:
+            bot.ai.whisper.warm_up()  # not awaited: the model loads while the bot starts polling
         commands = [
             BotCommand("start", "🏠 Главное меню"),
             BotCommand("cancel", "❌ Отменить текущее действие"),
@@ -5643,6 +5619,16 @@ def main():
             logger.error(f"Failed to reschedule meeting reminders: {e}")
     
     application.post_init = post_init
+
+    async def post_shutdown(app: Application) -> None:
+        """Flush buffered user upserts, stop worker pools, close pooled HTTP connections."""
+        await bot.user_upserts.close()
+        bot.ai.whisper.close()
+        bot.doc_extractor.close()
+        bot.reports.close()
+        await http_client.close()
+
+    application.post_shutdown = post_shutdown
     
     # Start bot
     logger.info("Starting Neuro-Connector Bot...")
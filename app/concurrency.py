@@ -0,0 +1,238 @@
+"""Bounded-concurrency helpers for fanning out async work.
+
+No new dependencies — pure asyncio.
+
+Usage:
+
+    from app.concurrency import gather_bounded
+
+    texts = await gather_bounded(chunks, transcribe_chunk, limit=4)
+
+    limiter = RateLimiter(rate=10)      # ≤10 calls/s across all callers
+    await limiter.acquire()
+    limiter.pause(retry_after)          # e.g. on HTTP 429
+
+    results = await run_dag({
+        "summary": ((), lambda: generate_summary(text)),
+        "short":   (("summary",), generate_short_summary),   # gets summary's result
+    })
+
+Results come back in input order regardless of completion order. If any call
+raises, the still-running siblings are cancelled and the first exception
+propagates (unless `return_exceptions=True`, mirroring `asyncio.gather`).
+
+`run_dag` starts every step as soon as its dependencies have finished. A step
+that raises does not stop unrelated steps; its dependents are skipped and get
+the same exception in the returned dict.
+
+`spawn_process_pool(n)` / `kill_process_pool(pool)` back the CPU-bound
+services (document extraction, report rendering, local Whisper): workers are
+spawned, not forked, and a pool whose task overran its timeout is killed outright.
+
+`IsolatedProcessPool(n)` runs at most n calls at a time, each in its own
+single-process executor. So a call that overruns its timeout (or is cancelled)
+kills only its own process, never a neighbour's job. The timeout starts when
+a process picks the call up, not while it waits for a free one.
+
+    pool = IsolatedProcessPool(2)
+    text = await pool.run(60, extract_text_sync, data, name)   # TimeoutError past 60s
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import multiprocessing
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def gather_bounded(
+    items: Iterable[T],
+    fn: Callable[[T], Awaitable[R]],
+    limit: int,
+    return_exceptions: bool = False,
+) -> list[R]:
+    """Run `fn(item)` for every item with at most `limit` calls in flight."""
+    sem = asyncio.Semaphore(max(1, limit))
+
+    async def _run(item: T) -> R:
+        async with sem:
+            return await fn(item)
+
+    tasks = [asyncio.ensure_future(_run(item)) for item in items]
+    if not tasks:
+        return []
+    if return_exceptions:
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class RateLimiter:
+    """Token bucket shared by concurrent callers: `rate` acquisitions per second,
+    bursts of up to `burst`. `pause(seconds)` holds everyone back, e.g. after a 429."""
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = max(rate, 0.001)
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self.pauses = 0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        # Refill starts when the pause ends: the pause itself must not count as
+        # refill time, or every waiter fires in one burst the moment it lifts.
+        self._tokens = 0.0
+        self._updated = max(self._updated, self._paused_until)
+        self.pauses += 1
+
+
+async def run_dag(
+    steps: dict[str, tuple[tuple[str, ...], Callable[..., Awaitable[Any]]]],
+) -> dict[str, Any]:
+    """Run `name -> (deps, fn)` steps concurrently along dependency edges.
+
+    `fn` is called with the results of `deps`, in order. Returns name -> result,
+    or name -> exception for a step that failed or whose dependency failed.
+    """
+    for name, (deps, _) in steps.items():
+        unknown = [d for d in deps if d not in steps]
+        if unknown:
+            raise ValueError(f"step {name!r} depends on unknown step(s) {unknown}")
+    _check_acyclic(steps)
+
+    tasks: dict[str, asyncio.Future] = {}
+
+    async def _run(name: str) -> Any:
+        deps, fn = steps[name]
+        args = [await tasks[d] for d in deps]
+        return await fn(*args)
+
+    # All futures exist before any step runs, so `_run` can look up any dependency.
+    for name in steps:
+        tasks[name] = asyncio.ensure_future(_run(name))
+    try:
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    except BaseException:
+        for t in tasks.values():
+            t.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    return dict(zip(tasks, results))
+
+
+def root_failures(steps: dict, results: dict[str, Any]) -> dict[str, BaseException]:
+    """Steps of a `run_dag` result that failed themselves (not just skipped for a failed dependency)."""
+    return {
+        name: result for name, result in results.items()
+        if isinstance(result, BaseException)
+        and not any(results[dep] is result for dep in steps[name][0])
+    }
+
+
+def _check_acyclic(steps: dict[str, tuple[tuple[str, ...], Any]]) -> None:
+    state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(name: str) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"dependency cycle through step {name!r}")
+        state[name] = 1
+        for dep in steps[name][0]:
+            visit(dep)
+        state[name] = 2
+
+    for name in steps:
+        visit(name)
+
+
+def spawn_process_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    # spawn: forking a process that already runs threads and an event loop is unsafe.
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def kill_process_pool(pool: concurrent.futures.ProcessPoolExecutor | None) -> None:
+    """Terminate the workers: a future cannot be cancelled once a worker is running it."""
+    if pool is None:
+        return
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class IsolatedProcessPool:
+    """`workers` single-process executors: a timed-out call is killed without touching the others."""
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        # Idle executors; None is a slot whose process was killed or never started.
+        self._idle: list[concurrent.futures.ProcessPoolExecutor | None] = [None] * self.workers
+        self._slots = asyncio.Semaphore(self.workers)
+        self._closed = False
+        self.busy = 0
+        self.killed = 0
+
+    async def run(self, timeout: float, fn: Callable[..., R], *args: Any) -> R:
+        async with self._slots:
+            executor = self._idle.pop() or spawn_process_pool(1)
+            self.busy += 1
+            try:
+                return await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(executor, fn, *args), timeout,
+                )
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                # The process is still busy with the abandoned call; only killing it frees the slot.
+                kill_process_pool(executor)
+                executor = None
+                self.killed += 1
+                raise
+            except BrokenProcessPool:
+                executor.shutdown(wait=False)
+                executor = None
+                raise
+            finally:
+                self.busy -= 1
+                if not self._closed:
+                    self._idle.append(executor)
+                elif executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {'workers': self.workers, 'busy': self.busy, 'killed': self.killed}
+
+    def close(self) -> None:
+        self._closed = True
+        for executor in self._idle:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._idle = [None] * self.workers
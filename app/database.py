@@ -5,22 +5,63 @@ Database module for Neuro-Connector Bot
 import asyncpg
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+
+try:
+    from app.ttl_cache import TTLCache  # webapp context
+    from app.pgvector_codec import register_vector_codec
+    from app.job_queue import JOB_QUEUE_CHANNEL, decode_payload
+except ImportError:  # pragma: no cover
+    from ttl_cache import TTLCache  # bot context
+    from pgvector_codec import register_vector_codec
+    from job_queue import JOB_QUEUE_CHANNEL, decode_payload
 
 logger = logging.getLogger(__name__)
 
+# NOTIFY channel used to drop cached rows in every webapp process. Payloads:
+# "token:<session token>", "user:<telegram_id>", "meeting:<zoom meeting_id>".
+CACHE_INVALIDATE_CHANNEL = 'cache_invalidate'
+
+# Columns of the cached meeting access record (no transcript/summary blobs).
+MEETING_META_COLUMNS = "id, meeting_id, public_token, is_public, status, topic"
+
+# zoom_meetings text columns that can be hundreds of KB each. Light records
+# carry has_<name> flags instead; load the text itself with get_meeting_text_fields.
+MEETING_HEAVY_COLUMNS = ('transcript_text', 'summary', 'structured_transcript', 'mindmap_json')
+
+# Every other zoom_meetings column plus presence flags. octet_length() reads
+# the TOAST header only, so the flags don't pull the text off disk.
+MEETING_LIGHT_COLUMNS = (
+    "id, meeting_id, topic, duration, join_url, start_url, host_telegram_id, host_name, "
+    "start_time, status, recording_url, lark_message_id, public_token, "
+    "video_s3_url, audio_s3_url, is_public, created_at, "
+    "COALESCE(octet_length(transcript_text), 0) > 0 AS has_transcript, "
+    "COALESCE(octet_length(summary), 0) > 0 AS has_summary, "
+    "COALESCE(octet_length(structured_transcript), 0) > 0 AS has_structured_transcript, "
+    "COALESCE(octet_length(mindmap_json), 0) > 0 AS has_mindmap"
+)
+
+
 class Database:
     """Database handler"""
     
     def __init__(self, database_url: str):
         self.database_url = database_url
         self.pool = None
+        # Short TTL bounds staleness even if a NOTIFY is missed.
+        self.session_cache = TTLCache(maxsize=10_000, ttl=60)
+        # public_token -> MEETING_META_COLUMNS, shared by auth middleware and handlers
+        self.meeting_meta_cache = TTLCache(maxsize=5_000, ttl=60)
+        self._listen_conn = None
     
     async def connect(self):
         """Create connection pool"""
         try:
-            self.pool = await asyncpg.create_pool(self.database_url)
+            self.pool = await asyncpg.create_pool(self.database_url, init=register_vector_codec)
             await self.init_tables()
+            # init_tables may have just created the vector extension; reconnect
+            # so every pooled connection picks up the pgvector codec.
+            await self.pool.expire_connections()
             logger.info("Database connected successfully")
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
@@ -28,6 +69,9 @@ class Database:
     
     async def disconnect(self):
         """Close connection pool"""
+        if self._listen_conn and not self._listen_conn.is_closed():
+            await self._listen_conn.close()
+            self._listen_conn = None
         if self.pool:
             await self.pool.close()
             logger.info("Database disconnected")
@@ -494,6 +538,18 @@ class Database:
                     ON project_embeddings(project_id)
                 """)
 
+                # Vectors keyed by (model, sha256 of the embedded text), so unchanged
+                # chunks are never sent to the embeddings API twice.
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS embedding_cache (
+                        model VARCHAR(100) NOT NULL,
+                        content_hash CHAR(64) NOT NULL,
+                        embedding vector(1536) NOT NULL,
+                        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                        PRIMARY KEY (model, content_hash)
+                    )
+                """)
+
             # Web sessions for web app authentication
             await conn.execute("""
                 CREATE TABLE IF NOT EXISTS web_sessions (
@@ -637,6 +693,7 @@ class Database:
                 ('comment', "TEXT DEFAULT ''"),
                 ('tags', "TEXT DEFAULT ''"),
                 ('visible_to_client', "BOOLEAN DEFAULT true"),
+                ('extracted_text', "TEXT"),
             ]:
                 await conn.execute(f"""
                     DO $$ BEGIN
@@ -672,6 +729,152 @@ class Database:
                 ON CONFLICT (proposal_token, client_id) DO NOTHING
             """)
 
+            # Durable background jobs (see app/job_queue.py)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS background_jobs (
+                    id BIGSERIAL PRIMARY KEY,
+                    kind VARCHAR(50) NOT NULL,
+                    payload JSONB NOT NULL DEFAULT '{}',
+                    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL DEFAULT 3,
+                    dedupe_key VARCHAR(200),
+                    run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                    locked_by VARCHAR(100),
+                    locked_until TIMESTAMP WITH TIME ZONE,
+                    last_error TEXT,
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    finished_at TIMESTAMP WITH TIME ZONE
+                )
+            """)
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_background_jobs_claim
+                ON background_jobs(kind, run_after) WHERE status IN ('queued', 'running')
+            """)
+            # At most one queued/running job per dedupe_key
+            await conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_background_jobs_dedupe
+                ON background_jobs(dedupe_key)
+                WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'running')
+            """)
+
+            # Local mirror of Kimai (see app/kimai_sync.py). Timesheet times are
+            # Kimai wall-clock times, as shown in Kimai and used in its API filters.
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS kimai_users (
+                    id INTEGER PRIMARY KEY,
+                    username VARCHAR(255),
+                    alias VARCHAR(255),
+                    account_number VARCHAR(100),
+                    enabled BOOLEAN DEFAULT TRUE,
+                    synced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                )
+            """)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS kimai_activities (
+                    id INTEGER PRIMARY KEY,
+                    name VARCHAR(255),
+                    project_id INTEGER,
+                    visible BOOLEAN DEFAULT TRUE,
+                    synced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                )
+            """)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS kimai_projects (
+                    id INTEGER PRIMARY KEY,
+                    name VARCHAR(255),
+                    customer_id INTEGER,
+                    visible BOOLEAN DEFAULT TRUE,
+                    synced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                )
+            """)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS kimai_teams (
+                    id INTEGER PRIMARY KEY,
+                    name VARCHAR(255),
+                    synced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                )
+            """)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS kimai_team_members (
+                    team_id INTEGER NOT NULL REFERENCES kimai_teams(id) ON DELETE CASCADE,
+                    user_id INTEGER NOT NULL,
+                    teamlead BOOLEAN DEFAULT FALSE,
+                    PRIMARY KEY (team_id, user_id)
+                )
+            """)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS kimai_timesheets (
+                    id INTEGER PRIMARY KEY,
+                    user_id INTEGER,
+                    project_id INTEGER,
+                    activity_id INTEGER,
+                    begin_at TIMESTAMP NOT NULL,
+                    end_at TIMESTAMP,
+                    duration INTEGER NOT NULL DEFAULT 0,
+                    rate NUMERIC(12, 2) NOT NULL DEFAULT 0,
+                    description TEXT,
+                    synced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                )
+            """)
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_kimai_timesheets_project
+                ON kimai_timesheets(project_id, begin_at)
+            """)
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_kimai_timesheets_user
+                ON kimai_timesheets(user_id, begin_at)
+            """)
+            # Sync cursors and timestamps (name -> value)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS kimai_sync_state (
+                    name VARCHAR(50) PRIMARY KEY,
+                    value TIMESTAMP WITH TIME ZONE NOT NULL
+                )
+            """)
+
+            # Responses of deterministic LLM prompts (see app/llm_cache.py)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    cache_key CHAR(64) PRIMARY KEY,
+                    model VARCHAR(100) NOT NULL,
+                    response TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    last_hit_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                )
+            """)
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_llm_cache_last_hit ON llm_cache(last_hit_at)
+            """)
+
+            # Bot broadcasts and their per-recipient delivery log (see app/broadcaster.py)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS broadcasts (
+                    id SERIAL PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    parse_mode VARCHAR(20),
+                    status VARCHAR(20) NOT NULL DEFAULT 'running',
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    finished_at TIMESTAMP WITH TIME ZONE
+                )
+            """)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS broadcast_deliveries (
+                    broadcast_id INTEGER NOT NULL REFERENCES broadcasts(id) ON DELETE CASCADE,
+                    telegram_id BIGINT NOT NULL,
+                    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    PRIMARY KEY (broadcast_id, telegram_id)
+                )
+            """)
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_broadcast_deliveries_pending
+                ON broadcast_deliveries(broadcast_id) WHERE status = 'pending'
+            """)
+
             logger.info("Database tables initialized")
 
     async def save_user(self, telegram_id: int, first_name: str, last_name: str, username: str, language_code: str = None):
@@ -688,6 +891,20 @@ class Database:
             except Exception as e:
                 logger.error(f"Failed to save user: {e}")
     
+    async def save_users_batch(self, rows: list[tuple]):
+        """Upsert many (telegram_id, first_name, last_name, username, language_code) rows
+        in one statement; telegram_ids must be unique within the batch."""
+        ids, first_names, last_names, usernames, language_codes = (list(col) for col in zip(*rows))
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                INSERT INTO users (telegram_id, first_name, last_name, username, language_code, last_interaction)
+                SELECT *, NOW() FROM UNNEST($1::bigint[], $2::varchar[], $3::varchar[], $4::varchar[], $5::varchar[])
+                ON CONFLICT (telegram_id) DO UPDATE
+                SET first_name = EXCLUDED.first_name, last_name = EXCLUDED.last_name,
+                    username = EXCLUDED.username, language_code = EXCLUDED.language_code,
+                    last_interaction = NOW()
+            """, ids, first_names, last_names, usernames, language_codes)
+
     async def save_entrepreneur_profile(self, user_id: int, process_pain: str, time_lost: str, 
                                        department_affected: str, phone: str, email: str):
         """Save entrepreneur profile"""
@@ -992,6 +1209,11 @@ class Database:
                 logger.info(f"User {telegram_id} role updated to '{role}'")
             except Exception as e:
                 logger.error(f"Failed to update user role: {e}")
+                return
+        try:
+            await self.update_web_sessions_role(telegram_id, role)
+        except Exception as e:
+            logger.error(f"Failed to apply role change to web sessions: {e}")
 
     async def get_user_role(self, telegram_id: int) -> str:
         async with self.pool.acquire() as conn:
@@ -1069,6 +1291,49 @@ class Database:
                 logger.error(f"Failed to get zoom meeting: {e}")
                 return None
 
+    async def get_meeting_light(self, meeting_id: int) -> dict | None:
+        """Meeting row without the heavy text columns (see MEETING_LIGHT_COLUMNS)."""
+        async with self.pool.acquire() as conn:
+            try:
+                row = await conn.fetchrow(
+                    f"SELECT {MEETING_LIGHT_COLUMNS} FROM zoom_meetings WHERE meeting_id = $1",
+                    meeting_id,
+                )
+                return dict(row) if row else None
+            except Exception as e:
+                logger.error(f"Failed to get light meeting {meeting_id}: {e}")
+                return None
+
+    async def get_meeting_light_by_token(self, public_token: str) -> dict | None:
+        async with self.pool.acquire() as conn:
+            try:
+                row = await conn.fetchrow(
+                    f"SELECT {MEETING_LIGHT_COLUMNS} FROM zoom_meetings WHERE public_token = $1",
+                    public_token,
+                )
+                return dict(row) if row else None
+            except Exception as e:
+                logger.error(f"Failed to get light meeting by public_token: {e}")
+                return None
+
+    async def get_meeting_text_fields(self, meeting_id: int, *fields: str) -> dict:
+        """Load only the requested heavy text columns, e.g.
+        `await db.get_meeting_text_fields(mid, 'summary')` -> {'summary': ...}.
+        Returns {} if the meeting does not exist."""
+        unknown = set(fields) - set(MEETING_HEAVY_COLUMNS)
+        if unknown or not fields:
+            raise ValueError(f"expected one or more of {MEETING_HEAVY_COLUMNS}, got {fields}")
+        async with self.pool.acquire() as conn:
+            try:
+                row = await conn.fetchrow(
+                    f"SELECT {', '.join(fields)} FROM zoom_meetings WHERE meeting_id = $1",
+                    meeting_id,
+                )
+                return dict(row) if row else {}
+            except Exception as e:
+                logger.error(f"Failed to load {fields} for meeting {meeting_id}: {e}")
+                return {}
+
     async def get_zoom_meeting_by_db_id(self, db_id: int) -> dict | None:
         async with self.pool.acquire() as conn:
             try:
@@ -1115,10 +1380,12 @@ class Database:
                     "(SELECT meeting_id FROM zoom_meetings WHERE id = $1)",
                     db_id,
                 )
-                await conn.execute(
-                    "DELETE FROM zoom_meetings WHERE id = $1",
+                meeting_id = await conn.fetchval(
+                    "DELETE FROM zoom_meetings WHERE id = $1 RETURNING meeting_id",
                     db_id,
                 )
+                if meeting_id is not None:
+                    await self._meeting_changed(conn, meeting_id)
                 logger.info(f"Zoom meeting db_id={db_id} fully deleted from DB")
             except Exception as e:
                 logger.error(f"Failed to delete zoom meeting db_id={db_id}: {e}")
@@ -1154,6 +1421,7 @@ class Database:
                             start_time      = COALESCE(EXCLUDED.start_time, zoom_meetings.start_time)
                 """, meeting_id, recording_url, transcript_text, summary, status,
                      topic, duration, start_time)
+                await self._meeting_changed(conn, meeting_id)
                 logger.info(f"Zoom meeting {meeting_id} recording upserted")
             except Exception as e:
                 logger.error(f"Failed to upsert meeting recording: {e}")
@@ -1168,6 +1436,7 @@ class Database:
                     ON CONFLICT (meeting_id) DO UPDATE
                         SET public_token = EXCLUDED.public_token
                 """, meeting_id, public_token)
+                await self._meeting_changed(conn, meeting_id)
                 logger.info(f"Zoom meeting {meeting_id} public_token saved")
             except Exception as e:
                 logger.error(f"Failed to update meeting public_token: {e}")
@@ -1189,6 +1458,17 @@ class Database:
             except Exception as e:
                 logger.error(f"Failed to update meeting transcript/summary: {e}")
 
+    async def update_meeting_summary(self, meeting_id: int, summary: str | None):
+        async with self.pool.acquire() as conn:
+            try:
+                await conn.execute(
+                    "UPDATE zoom_meetings SET summary = $2 WHERE meeting_id = $1",
+                    meeting_id, summary,
+                )
+                logger.info(f"Zoom meeting {meeting_id} summary updated")
+            except Exception as e:
+                logger.error(f"Failed to update meeting summary: {e}")
+
     async def update_meeting_structured_transcript(
         self,
         meeting_id: int,
@@ -1217,6 +1497,38 @@ class Database:
                 logger.error(f"Failed to get meeting by public_token: {e}")
                 return None
 
+    async def get_meeting_meta_by_token(self, public_token: str) -> dict | None:
+        """Cached access record for a meeting page/API request:
+        id, meeting_id, public_token, is_public, status, topic."""
+        cached = self.meeting_meta_cache.get(public_token)
+        if cached is not None:
+            return dict(cached)
+        async with self.pool.acquire() as conn:
+            try:
+                row = await conn.fetchrow(
+                    f"SELECT {MEETING_META_COLUMNS} FROM zoom_meetings WHERE public_token = $1",
+                    public_token,
+                )
+            except Exception as e:
+                logger.error(f"Failed to get meeting meta by public_token: {e}")
+                return None
+        if not row:
+            return None
+        meta = dict(row)
+        self.meeting_meta_cache.set(public_token, meta)
+        return dict(meta)
+
+    def _invalidate_meeting_meta(self, meeting_id: int | None = None, db_id: int | None = None) -> None:
+        self.meeting_meta_cache.invalidate_where(
+            lambda _, m: (meeting_id is not None and m['meeting_id'] == meeting_id)
+            or (db_id is not None and m['id'] == db_id)
+        )
+
+    async def _meeting_changed(self, conn, meeting_id: int) -> None:
+        """Drop the cached access record here and in other webapp processes."""
+        self._invalidate_meeting_meta(meeting_id)
+        await self._notify_invalidate(conn, f"meeting:{meeting_id}")
+
     async def get_host_upcoming_meetings(self, host_telegram_id: int) -> list[dict]:
         """Return scheduled (not yet ended) meetings created by this host, newest first."""
         async with self.pool.acquire() as conn:
@@ -1243,6 +1555,7 @@ class Database:
                     "UPDATE zoom_meetings SET status = $2 WHERE meeting_id = $1",
                     meeting_id, status,
                 )
+                await self._meeting_changed(conn, meeting_id)
                 logger.info(f"Zoom meeting {meeting_id} status updated to: {status}")
             except Exception as e:
                 logger.error(f"Failed to update meeting status: {e}")
@@ -1298,6 +1611,7 @@ class Database:
                     "UPDATE zoom_meetings SET topic = $2 WHERE meeting_id = $1",
                     meeting_id, topic,
                 )
+                await self._meeting_changed(conn, meeting_id)
                 logger.info(f"Zoom meeting {meeting_id} topic updated: {topic}")
             except Exception as e:
                 logger.error(f"Failed to update meeting topic: {e}")
@@ -1331,6 +1645,7 @@ class Database:
                     start_time,
                     duration,
                 )
+                await self._meeting_changed(conn, meeting_id)
                 logger.info(
                     f"Zoom meeting {meeting_id} schedule updated: start_time={start_time}, duration={duration}"
                 )
@@ -1422,10 +1737,7 @@ class Database:
         async with self.pool.acquire() as conn:
             try:
                 rows = await conn.fetch(
-                    "SELECT id, meeting_id, topic, duration, join_url, "
-                    "start_time, host_name, host_telegram_id, lark_message_id, "
-                    "recording_url, transcript_text, summary, public_token, "
-                    "video_s3_url, audio_s3_url, status "
+                    f"SELECT {MEETING_LIGHT_COLUMNS} "
                     "FROM zoom_meetings "
                     "WHERE status = 'scheduled' "
                     "AND start_time IS NOT NULL "
@@ -1444,10 +1756,7 @@ class Database:
         async with self.pool.acquire() as conn:
             try:
                 rows = await conn.fetch(
-                    "SELECT id, meeting_id, topic, duration, join_url, "
-                    "start_time, host_name, host_telegram_id, lark_message_id, "
-                    "recording_url, transcript_text, summary, public_token, "
-                    "video_s3_url, audio_s3_url "
+                    f"SELECT {MEETING_LIGHT_COLUMNS} "
                     "FROM zoom_meetings "
                     "WHERE status = 'scheduled' "
                     "ORDER BY created_at",
@@ -1462,10 +1771,7 @@ class Database:
         async with self.pool.acquire() as conn:
             try:
                 rows = await conn.fetch(
-                    "SELECT id, meeting_id, topic, duration, join_url, "
-                    "start_time, host_name, host_telegram_id, lark_message_id, "
-                    "recording_url, transcript_text, summary, public_token, "
-                    "video_s3_url, audio_s3_url "
+                    f"SELECT {MEETING_LIGHT_COLUMNS} "
                     "FROM zoom_meetings "
                     "WHERE status = 'recorded' "
                     "AND recording_url IS NOT NULL "
@@ -1506,6 +1812,7 @@ class Database:
                     "DELETE FROM zoom_meetings WHERE meeting_id = $1",
                     meeting_id,
                 )
+                await self._meeting_changed(conn, meeting_id)
                 
                 logger.info(f"Meeting {meeting_id} deleted from database")
             except Exception as e:
@@ -1524,12 +1831,73 @@ class Database:
             )
 
     async def get_web_session(self, token: str) -> dict | None:
+        cached = self.session_cache.get(token)
+        if cached is not None:
+            if cached['expires_at'] > datetime.now(timezone.utc):
+                return dict(cached)
+            self.session_cache.invalidate(token)
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow(
                 "SELECT * FROM web_sessions WHERE token = $1 AND expires_at > NOW()",
                 token,
             )
-            return dict(row) if row else None
+        if not row:
+            return None
+        session = dict(row)
+        ttl = (session['expires_at'] - datetime.now(timezone.utc)).total_seconds()
+        self.session_cache.set(token, session, ttl=ttl)
+        return dict(session)
+
+    async def delete_web_session(self, token: str) -> None:
+        """Delete one session (logout) and drop it from every process cache."""
+        self.session_cache.invalidate(token)
+        async with self.pool.acquire() as conn:
+            await conn.execute("DELETE FROM web_sessions WHERE token = $1", token)
+            await self._notify_invalidate(conn, f"token:{token}")
+
+    async def update_web_sessions_role(self, telegram_id: int, role: str) -> None:
+        """Apply a role change to the user's live sessions and invalidate cached copies."""
+        self._invalidate_user_sessions(telegram_id)
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                "UPDATE web_sessions SET role = $2 WHERE telegram_id = $1 AND expires_at > NOW()",
+                telegram_id, role,
+            )
+            await self._notify_invalidate(conn, f"user:{telegram_id}")
+
+    def _invalidate_user_sessions(self, telegram_id: int) -> None:
+        self.session_cache.invalidate_where(lambda _, s: s.get('telegram_id') == telegram_id)
+
+    @staticmethod
+    async def _notify_invalidate(conn, payload: str) -> None:
+        await conn.execute("SELECT pg_notify($1, $2)", CACHE_INVALIDATE_CHANNEL, payload)
+
+    def _on_cache_invalidate(self, conn, pid, channel, payload: str) -> None:
+        kind, _, value = payload.partition(':')
+        if kind == 'token':
+            self.session_cache.invalidate(value)
+        elif kind == 'user' and value.lstrip('-').isdigit():
+            self._invalidate_user_sessions(int(value))
+        elif kind == 'meeting' and value.lstrip('-').isdigit():
+            self._invalidate_meeting_meta(int(value))
+
+    def _on_listen_conn_lost(self, conn) -> None:
+        logger.warning("Cache invalidation listener disconnected — relying on cache TTL")
+        self.session_cache.clear()
+        self.meeting_meta_cache.clear()
+        self._listen_conn = None
+
+    async def start_cache_listener(self) -> None:
+        """LISTEN for cross-process cache invalidations (webapp only).
+        If it cannot start, the caches still work but entries may be stale up to their TTL."""
+        try:
+            self._listen_conn = await asyncpg.connect(self.database_url)
+            await self._listen_conn.add_listener(CACHE_INVALIDATE_CHANNEL, self._on_cache_invalidate)
+            self._listen_conn.add_termination_listener(self._on_listen_conn_lost)
+            logger.info("Listening for cache invalidations")
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener not started: {e}")
+            self._listen_conn = None
 
     async def delete_expired_sessions(self) -> int:
         async with self.pool.acquire() as conn:
@@ -1542,6 +1910,7 @@ class Database:
                 "UPDATE zoom_meetings SET is_public = $2 WHERE meeting_id = $1",
                 meeting_id, is_public,
             )
+            await self._meeting_changed(conn, meeting_id)
 
     # ---- Invite links helpers ----
 
@@ -2148,29 +2517,61 @@ class Database:
                 if not await self._has_embeddings_table(conn):
                     logger.warning("project_embeddings table does not exist, skipping save")
                     return
-                await conn.execute(
-                    "DELETE FROM project_embeddings WHERE project_id = $1 AND zoom_meeting_db_id = $2",
-                    project_id, zoom_meeting_db_id,
-                )
-                for chunk in chunks:
-                    embedding_str = "[" + ",".join(str(v) for v in chunk["embedding"]) + "]"
-                    await conn.execute("""
-                        INSERT INTO project_embeddings
-                            (project_id, zoom_meeting_db_id, chunk_index, chunk_text, embedding)
-                        VALUES ($1, $2, $3, $4, $5::vector)
-                    """, project_id, zoom_meeting_db_id, chunk["chunk_index"],
-                         chunk["chunk_text"], embedding_str)
+                # Replace the meeting's chunks atomically, streamed in one binary COPY
+                # (vectors go through the pgvector codec as float4 arrays).
+                async with conn.transaction():
+                    await conn.execute(
+                        "DELETE FROM project_embeddings WHERE project_id = $1 AND zoom_meeting_db_id = $2",
+                        project_id, zoom_meeting_db_id,
+                    )
+                    await conn.copy_records_to_table(
+                        "project_embeddings",
+                        columns=["project_id", "zoom_meeting_db_id", "chunk_index", "chunk_text", "embedding"],
+                        records=[
+                            (project_id, zoom_meeting_db_id, c["chunk_index"], c["chunk_text"], c["embedding"])
+                            for c in chunks
+                        ],
+                    )
                 logger.info(f"Saved {len(chunks)} embeddings for project {project_id}, meeting {zoom_meeting_db_id}")
             except Exception as e:
                 logger.error(f"Failed to save embeddings: {e}")
                 raise
 
+    async def get_cached_embeddings(self, model: str, content_hashes: list[str]) -> dict[str, list[float]]:
+        """Return {content_hash: embedding} for the hashes already in embedding_cache."""
+        if not content_hashes:
+            return {}
+        async with self.pool.acquire() as conn:
+            try:
+                rows = await conn.fetch(
+                    "SELECT content_hash, embedding FROM embedding_cache "
+                    "WHERE model = $1 AND content_hash = ANY($2::char(64)[])",
+                    model, list(content_hashes),
+                )
+                return {row['content_hash']: row['embedding'] for row in rows}
+            except Exception as e:
+                logger.warning(f"Embedding cache lookup failed: {e}")
+                return {}
+
+    async def save_cached_embeddings(self, model: str, items: list[tuple[str, list[float]]]):
+        """Store (content_hash, embedding) pairs; best-effort, existing keys are kept."""
+        if not items:
+            return
+        async with self.pool.acquire() as conn:
+            try:
+                await conn.executemany(
+                    "INSERT INTO embedding_cache (model, content_hash, embedding) "
+                    "VALUES ($1, $2, $3) ON CONFLICT DO NOTHING",
+                    [(model, h, e) for h, e in items],
+                )
+            except Exception as e:
+                logger.warning(f"Embedding cache save failed: {e}")
+
     async def search_similar_chunks(self, project_id: int, query_embedding: list[float], limit: int = 10) -> list[dict]:
         async with self.pool.acquire() as conn:
             try:
                 if not await self._has_embeddings_table(conn):
                     return []
-                embedding_str = "[" + ",".join(str(v) for v in query_embedding) + "]"
                 rows = await conn.fetch("""
                     SELECT pe.chunk_text, pe.chunk_index, pe.zoom_meeting_db_id,
                            zm.topic AS meeting_topic,
@@ -2181,7 +2582,7 @@ class Database:
                     WHERE pe.project_id = $2
                     ORDER BY pe.embedding <=> $1::vector
                     LIMIT $3
-                """, embedding_str, project_id, limit)
+                """, query_embedding, project_id, limit)
                 return [dict(row) for row in rows]
             except Exception as e:
                 logger.error(f"Failed to search similar chunks: {e}")
@@ -2500,17 +2901,30 @@ class Database:
             """, proposal_token)
             return [dict(r) for r in rows]
 
+    async def get_proposal_documents_text(self, proposal_token: str) -> list[dict]:
+        """original_name + extracted_text of the documents whose text could be read, oldest first."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT original_name, extracted_text
+                FROM proposal_documents
+                WHERE proposal_token = $1 AND extracted_text IS NOT NULL AND extracted_text <> ''
+                ORDER BY created_at
+            """, proposal_token)
+            return [dict(r) for r in rows]
+
     async def add_proposal_document(self, proposal_token: str, filename: str,
                                      original_name: str, s3_url: str, s3_key: str,
                                      file_size: int, content_type: str,
-                                     uploaded_by: str = 'admin') -> dict:
+                                     uploaded_by: str = 'admin', extracted_text: str | None = None) -> dict:
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow("""
                 INSERT INTO proposal_documents
-                    (proposal_token, filename, original_name, s3_url, s3_key, file_size, content_type, uploaded_by)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                    (proposal_token, filename, original_name, s3_url, s3_key, file_size, content_type, uploaded_by,
+                     extracted_text)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
                 RETURNING *
-            """, proposal_token, filename, original_name, s3_url, s3_key, file_size, content_type, uploaded_by)
+            """, proposal_token, filename, original_name, s3_url, s3_key, file_size, content_type, uploaded_by,
+                extracted_text)
             return dict(row)
 
     async def delete_proposal_document(self, doc_id: int) -> dict | None:
@@ -2968,3 +3382,351 @@ class Database:
                 ORDER BY m.created_at ASC
             """, thread_id, telegram_id)
             return [dict(r) for r in rows]
+
+    # ---- Kimai mirror (app/kimai_sync.py) ----
+
+    async def get_kimai_sync_state(self, name: str):
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval("SELECT value FROM kimai_sync_state WHERE name = $1", name)
+
+    async def set_kimai_sync_state(self, name: str, value):
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                INSERT INTO kimai_sync_state (name, value) VALUES ($1, $2)
+                ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value
+            """, name, value)
+
+    async def replace_kimai_reference_data(self, users: list[tuple], activities: list[tuple],
+                                           projects: list[tuple], teams: list[tuple],
+                                           members: list[tuple]):
+        """Upsert users/activities/projects and replace teams with their members,
+        in one transaction. Tuples are in table column order (without synced_at)."""
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany("""
+                    INSERT INTO kimai_users (id, username, alias, account_number, enabled)
+                    VALUES ($1, $2, $3, $4, $5)
+                    ON CONFLICT (id) DO UPDATE SET username = EXCLUDED.username, alias = EXCLUDED.alias,
+                        account_number = EXCLUDED.account_number, enabled = EXCLUDED.enabled, synced_at = NOW()
+                """, users)
+                await conn.executemany("""
+                    INSERT INTO kimai_activities (id, name, project_id, visible)
+                    VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name, project_id = EXCLUDED.project_id,
+                        visible = EXCLUDED.visible, synced_at = NOW()
+                """, activities)
+                await conn.executemany("""
+                    INSERT INTO kimai_projects (id, name, customer_id, visible)
+                    VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name, customer_id = EXCLUDED.customer_id,
+                        visible = EXCLUDED.visible, synced_at = NOW()
+                """, projects)
+                await conn.execute("DELETE FROM kimai_teams")
+                await conn.executemany("INSERT INTO kimai_teams (id, name) VALUES ($1, $2)", teams)
+                await conn.executemany(
+                    "INSERT INTO kimai_team_members (team_id, user_id, teamlead) VALUES ($1, $2, $3) "
+                    "ON CONFLICT DO NOTHING",
+                    members,
+                )
+
+    async def upsert_kimai_timesheets(self, rows: list[tuple]):
+        """rows: (id, user_id, project_id, activity_id, begin_at, end_at, duration, rate, description)."""
+        if not rows:
+            return
+        async with self.pool.acquire() as conn:
+            await conn.executemany("""
+                INSERT INTO kimai_timesheets
+                    (id, user_id, project_id, activity_id, begin_at, end_at, duration, rate, description)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+                ON CONFLICT (id) DO UPDATE SET
+                    user_id = EXCLUDED.user_id, project_id = EXCLUDED.project_id,
+                    activity_id = EXCLUDED.activity_id, begin_at = EXCLUDED.begin_at,
+                    end_at = EXCLUDED.end_at, duration = EXCLUDED.duration, rate = EXCLUDED.rate,
+                    description = EXCLUDED.description, synced_at = NOW()
+            """, rows)
+
+    async def prune_kimai_timesheets(self, keep_ids: list[int]) -> int:
+        """Delete mirrored timesheets that no longer exist in Kimai. Returns rows removed."""
+        async with self.pool.acquire() as conn:
+            result = await conn.execute(
+                "DELETE FROM kimai_timesheets WHERE NOT (id = ANY($1::int[]))", keep_ids,
+            )
+            return int(result.split()[-1])
+
+    async def get_kimai_project_finance(self, kimai_project_id: int, date_from=None, date_to=None) -> list[dict]:
+        """Aggregate a project's mirrored timesheets in one query.
+        Each row has `dim` = 'total' | 'month' | 'activity' | 'user' with hours and cost;
+        activity/user rows carry the resolved name."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                WITH ts AS (
+                    SELECT to_char(begin_at, 'YYYY-MM') AS month, activity_id, user_id, duration, rate
+                    FROM kimai_timesheets
+                    WHERE project_id = $1
+                      AND ($2::date IS NULL OR begin_at >= $2::date)
+                      AND ($3::date IS NULL OR begin_at < $3::date + 1)
+                ), agg AS (
+                    SELECT CASE WHEN GROUPING(month) = 0 THEN 'month'
+                                WHEN GROUPING(activity_id) = 0 THEN 'activity'
+                                WHEN GROUPING(user_id) = 0 THEN 'user'
+                                ELSE 'total' END AS dim,
+                           month, activity_id, user_id,
+                           COALESCE(SUM(duration), 0) / 3600.0 AS hours,
+                           COALESCE(SUM(rate), 0) AS cost
+                    FROM ts
+                    GROUP BY GROUPING SETS ((month), (activity_id), (user_id), ())
+                )
+                SELECT agg.dim, agg.month, agg.activity_id, agg.user_id,
+                       agg.hours::float8 AS hours, agg.cost::float8 AS cost,
+                       a.name AS activity_name,
+                       COALESCE(NULLIF(u.alias, ''), u.username) AS user_name
+                FROM agg
+                LEFT JOIN kimai_activities a ON a.id = agg.activity_id
+                LEFT JOIN kimai_users u ON u.id = agg.user_id
+            """, kimai_project_id, date_from, date_to)
+            return [dict(r) for r in rows]
+
+    async def get_kimai_project_entries(self, kimai_project_ids: list[int], date_from, date_to) -> list[dict]:
+        """Mirrored timesheets of the given projects with activity/user names, oldest first."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT t.project_id, t.begin_at, t.duration, t.description,
+                       a.name AS activity_name,
+                       COALESCE(NULLIF(u.alias, ''), u.username) AS user_name
+                FROM kimai_timesheets t
+                LEFT JOIN kimai_activities a ON a.id = t.activity_id
+                LEFT JOIN kimai_users u ON u.id = t.user_id
+                WHERE t.project_id = ANY($1::int[])
+                  AND t.begin_at >= $2::date AND t.begin_at < $3::date + 1
+                ORDER BY t.begin_at
+            """, kimai_project_ids, date_from, date_to)
+            return [dict(r) for r in rows]
+
+    async def get_kimai_projects_map(self) -> dict[int, str]:
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("SELECT id, name FROM kimai_projects")
+            return {r['id']: r['name'] for r in rows}
+
+    # ---- LLM response cache (app/llm_cache.py) ----
+
+    async def get_llm_cache(self, cache_key: str, ttl_days: int) -> str | None:
+        """Return a cached response younger than `ttl_days` and count the hit."""
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval("""
+                UPDATE llm_cache SET hits = hits + 1, last_hit_at = NOW()
+                WHERE cache_key = $1 AND created_at > NOW() - $2::int * INTERVAL '1 day'
+                RETURNING response
+            """, cache_key, ttl_days)
+
+    async def save_llm_cache(self, cache_key: str, model: str, response: str):
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                INSERT INTO llm_cache (cache_key, model, response) VALUES ($1, $2, $3)
+                ON CONFLICT (cache_key) DO UPDATE
+                SET response = EXCLUDED.response, model = EXCLUDED.model,
+                    created_at = NOW(), last_hit_at = NOW()
+            """, cache_key, model, response)
+
+    async def purge_llm_cache(self, ttl_days: int, max_rows: int) -> int:
+        """Drop expired entries, then the least recently hit ones beyond `max_rows`."""
+        async with self.pool.acquire() as conn:
+            expired = await conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < NOW() - $1::int * INTERVAL '1 day'", ttl_days,
+            )
+            evicted = await conn.execute("""
+                DELETE FROM llm_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_cache ORDER BY last_hit_at DESC OFFSET $1
+                )
+            """, max_rows)
+            return int(expired.split()[-1]) + int(evicted.split()[-1])
+
+    # ---- Broadcasts (app/broadcaster.py) ----
+
+    async def create_broadcast(self, text: str, parse_mode: str | None = None) -> int:
+        """Create a broadcast and snapshot every non-blocked user as a pending delivery."""
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                broadcast_id = await conn.fetchval(
+                    "INSERT INTO broadcasts (text, parse_mode) VALUES ($1, $2) RETURNING id",
+                    text, parse_mode,
+                )
+                await conn.execute("""
+                    INSERT INTO broadcast_deliveries (broadcast_id, telegram_id)
+                    SELECT $1, telegram_id FROM users
+                    WHERE is_blocked = FALSE AND telegram_id IS NOT NULL
+                """, broadcast_id)
+                return broadcast_id
+
+    async def get_broadcast(self, broadcast_id: int) -> dict | None:
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow("SELECT * FROM broadcasts WHERE id = $1", broadcast_id)
+            return dict(row) if row else None
+
+    async def get_latest_unfinished_broadcast(self) -> dict | None:
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT * FROM broadcasts WHERE status = 'running' ORDER BY id DESC LIMIT 1"
+            )
+            return dict(row) if row else None
+
+    async def get_pending_broadcast_recipients(self, broadcast_id: int) -> list[int]:
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT telegram_id FROM broadcast_deliveries WHERE broadcast_id = $1 AND status = 'pending'",
+                broadcast_id,
+            )
+            return [r['telegram_id'] for r in rows]
+
+    async def record_broadcast_deliveries(self, broadcast_id: int,
+                                          results: list[tuple[int, str, int, str | None]]) -> None:
+        """Store a batch of (telegram_id, status, attempts, error) outcomes in one statement,
+        and mark the recipients that blocked the bot in users."""
+        if not results:
+            return
+        ids, statuses, attempts, errors = (list(col) for col in zip(*results))
+        blocked = [tid for tid, status, _, _ in results if status == 'blocked']
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("""
+                    UPDATE broadcast_deliveries d
+                    SET status = r.status, attempts = d.attempts + r.attempts, error = r.error,
+                        updated_at = NOW()
+                    FROM UNNEST($2::bigint[], $3::text[], $4::int[], $5::text[])
+                        AS r(telegram_id, status, attempts, error)
+                    WHERE d.broadcast_id = $1 AND d.telegram_id = r.telegram_id
+                """, broadcast_id, ids, statuses, attempts, errors)
+                if blocked:
+                    await conn.execute(
+                        "UPDATE users SET is_blocked = TRUE WHERE telegram_id = ANY($1::bigint[])", blocked,
+                    )
+
+    async def finish_broadcast(self, broadcast_id: int) -> None:
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                "UPDATE broadcasts SET status = 'done', finished_at = NOW() WHERE id = $1", broadcast_id,
+            )
+
+    async def get_broadcast_stats(self, broadcast_id: int) -> dict:
+        """Delivery counts by status, e.g. {'sent': 120, 'blocked': 3, 'pending': 0}."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT status, COUNT(*) AS n FROM broadcast_deliveries WHERE broadcast_id = $1 GROUP BY status",
+                broadcast_id,
+            )
+            return {r['status']: r['n'] for r in rows}
+
+    # ---- Background jobs (app/job_queue.py) ----
+
+    async def enqueue_job(self, kind: str, payload: dict, *, dedupe_key: str | None = None,
+                          max_attempts: int = 3, delay_seconds: float = 0) -> int | None:
+        """Queue a job. Returns its id, or None if a job with the same dedupe_key
+        is already queued or running."""
+        async with self.pool.acquire() as conn:
+            job_id = await conn.fetchval("""
+                INSERT INTO background_jobs (kind, payload, dedupe_key, max_attempts, run_after)
+                VALUES ($1, $2::jsonb, $3, $4, NOW() + $5::float8 * INTERVAL '1 second')
+                ON CONFLICT (dedupe_key)
+                    WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'running')
+                    DO NOTHING
+                RETURNING id
+            """, kind, json.dumps(payload), dedupe_key, max_attempts, float(delay_seconds))
+            if job_id is not None:
+                await conn.execute("SELECT pg_notify($1, $2)", JOB_QUEUE_CHANNEL, kind)
+            return job_id
+
+    async def claim_jobs(self, kind: str, worker_id: str, limit: int, lease_seconds: int) -> list[dict]:
+        """Lease up to `limit` due jobs of `kind`: queued ones, plus running ones whose
+        worker let the lease expire. Concurrent claimers skip each other's rows."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                UPDATE background_jobs j
+                SET status = 'running',
+                    attempts = j.attempts + 1,
+                    locked_by = $2,
+                    locked_until = NOW() + $4::float8 * INTERVAL '1 second'
+                WHERE j.id IN (
+                    SELECT id FROM background_jobs
+                    WHERE kind = $1
+                      AND run_after <= NOW()
+                      AND (status = 'queued' OR (status = 'running' AND locked_until < NOW()))
+                    ORDER BY run_after, id
+                    LIMIT $3
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING j.id, j.kind, j.payload, j.attempts, j.max_attempts
+            """, kind, worker_id, limit, float(lease_seconds))
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job['payload'] = decode_payload(job['payload'])
+            jobs.append(job)
+        return jobs
+
+    async def extend_job_leases(self, job_ids: list[int], worker_id: str, lease_seconds: int):
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                UPDATE background_jobs SET locked_until = NOW() + $3::float8 * INTERVAL '1 second'
+                WHERE id = ANY($1::bigint[]) AND locked_by = $2 AND status = 'running'
+            """, job_ids, worker_id, float(lease_seconds))
+
+    async def complete_job(self, job_id: int, worker_id: str):
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                UPDATE background_jobs
+                SET status = 'done', finished_at = NOW(), locked_until = NULL, last_error = NULL
+                WHERE id = $1 AND locked_by = $2
+            """, job_id, worker_id)
+
+    async def fail_job(self, job_id: int, worker_id: str, error: str, retry_in: float | None):
+        """Record a failed attempt: requeue after `retry_in` seconds, or mark failed if None."""
+        async with self.pool.acquire() as conn:
+            if retry_in is None:
+                await conn.execute("""
+                    UPDATE background_jobs
+                    SET status = 'failed', finished_at = NOW(), locked_until = NULL, last_error = $3
+                    WHERE id = $1 AND locked_by = $2
+                """, job_id, worker_id, error[:2000])
+            else:
+                await conn.execute("""
+                    UPDATE background_jobs
+                    SET status = 'queued', locked_until = NULL, last_error = $3,
+                        run_after = NOW() + $4::float8 * INTERVAL '1 second'
+                    WHERE id = $1 AND locked_by = $2
+                """, job_id, worker_id, error[:2000], float(retry_in))
+
+    async def release_job(self, job_id: int, worker_id: str):
+        """Hand a job back without counting the attempt (worker shutting down)."""
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                UPDATE background_jobs
+                SET status = 'queued', attempts = GREATEST(attempts - 1, 0), locked_until = NULL
+                WHERE id = $1 AND locked_by = $2 AND status = 'running'
+            """, job_id, worker_id)
+
+    async def has_active_job(self, dedupe_key: str) -> bool:
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval("""
+                SELECT EXISTS (SELECT 1 FROM background_jobs
+                               WHERE dedupe_key = $1 AND status IN ('queued', 'running'))
+            """, dedupe_key)
+
+    async def get_job_stats(self) -> dict:
+        """{kind: {status: count}} for jobs that are pending or finished in the last day."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT kind, status, COUNT(*) AS n FROM background_jobs
+                WHERE status IN ('queued', 'running') OR finished_at > NOW() - INTERVAL '1 day'
+                GROUP BY kind, status
+            """)
+        stats: dict = {}
+        for row in rows:
+            stats.setdefault(row['kind'], {})[row['status']] = row['n']
+        return stats
+
+    async def purge_finished_jobs(self, older_than_days: int):
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                DELETE FROM background_jobs
+                WHERE status IN ('done', 'failed')
+                  AND finished_at < NOW() - $1::int * INTERVAL '1 day'
+            """, older_than_days)
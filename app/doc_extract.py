@@ -0,0 +1,125 @@
+"""Text extraction from uploaded documents (PDF, DOCX, TXT) off the event loop.
+
+No new dependencies — concurrent.futures + PyMuPDF / pypdf / python-docx.
+
+Usage:
+
+    from app.doc_extract import TextExtractor, is_supported
+
+    extractor = TextExtractor()
+    if is_supported(file_name):
+        text = await extractor.extract(file_bytes, file_name)   # "" if nothing could be read
+    extractor.stats()
+    extractor.close()
+
+Parsing runs in DOC_EXTRACT_WORKERS spawned processes, so a 100-page PDF
+no longer stalls every other update. PDFs are read with PyMuPDF, falling
+back to pypdf when it fails or finds no text. A document taking longer than
+DOC_EXTRACT_TIMEOUT seconds is abandoned, and its worker process is killed so
+it does not keep burning CPU. Each document runs in its own process, so the
+kill never takes another user's extraction down with it. Results are
+cached in memory by content hash, so re-sending the same file is instant.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+
+try:
+    from app.concurrency import IsolatedProcessPool  # webapp context
+    from app.ttl_cache import TTLCache
+except ImportError:  # pragma: no cover
+    from concurrency import IsolatedProcessPool  # bot context
+    from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+DOC_EXTRACT_WORKERS = int(os.getenv("DOC_EXTRACT_WORKERS") or 2)
+DOC_EXTRACT_TIMEOUT = int(os.getenv("DOC_EXTRACT_TIMEOUT") or 60)
+SUPPORTED_EXTENSIONS = ('.pdf', '.doc', '.docx', '.txt', '.md', '.rtf')
+
+
+def is_supported(file_name: str) -> bool:
+    return (file_name or "").lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def _extract_pdf(file_bytes: bytes) -> str:
+    try:
+        import fitz  # PyMuPDF
+        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+            text = "\n\n".join(t for t in (page.get_text() for page in doc) if t.strip())
+        if text.strip():
+            return text
+    except Exception as e:
+        logger.warning(f"PyMuPDF extraction failed, falling back to pypdf: {e}")
+    from pypdf import PdfReader
+    reader = PdfReader(io.BytesIO(file_bytes))
+    return "\n\n".join(t for t in (page.extract_text() for page in reader.pages) if t)
+
+
+def _extract_docx(file_bytes: bytes) -> str:
+    from docx import Document
+    doc = Document(io.BytesIO(file_bytes))
+    return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+
+
+def extract_text_sync(file_bytes: bytes, file_name: str) -> str:
+    """Blocking extraction; runs inside a pool worker."""
+    name = file_name.lower()
+    if name.endswith('.pdf'):
+        return _extract_pdf(file_bytes)
+    if name.endswith(('.doc', '.docx')):
+        return _extract_docx(file_bytes)
+    if name.endswith(('.txt', '.md', '.rtf')):
+        try:
+            return file_bytes.decode('utf-8')
+        except UnicodeDecodeError:
+            return file_bytes.decode('cp1251', errors='replace')
+    return ""
+
+
+class TextExtractor:
+    def __init__(self, workers: int = DOC_EXTRACT_WORKERS, timeout: float = DOC_EXTRACT_TIMEOUT,
+                 cache_size: int = 64):
+        self.timeout = timeout
+        self.cache = TTLCache(maxsize=cache_size, ttl=3600)
+        self.pool = IsolatedProcessPool(workers)
+        self.extracted = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    async def extract(self, file_bytes: bytes, file_name: str) -> str:
+        kind = os.path.splitext(file_name.lower())[1]
+        key = (hashlib.sha256(file_bytes).hexdigest(), kind)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            text = await self.pool.run(self.timeout, extract_text_sync, file_bytes, file_name)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.error(f"Text extraction from {file_name} timed out after {self.timeout}s")
+            return ""
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Text extraction from {file_name} failed: {e!r}")
+            return ""
+        self.extracted += 1
+        self.cache.set(key, text)
+        return text
+
+    def stats(self) -> dict:
+        return {
+            'extracted': self.extracted,
+            'failed': self.failed,
+            'timeouts': self.timeouts,
+            'pool': self.pool.stats(),
+            'cache': self.cache.stats(),
+        }
+
+    def close(self) -> None:
+        self.pool.close()
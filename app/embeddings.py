@@ -3,14 +3,34 @@ Embeddings service for project-level RAG chat.
 
 Uses OpenAI text-embedding-3-small (1536 dims) for vectorisation
 and tiktoken for token-aware chunking of transcripts.
+
+Vectors are cached in the `embedding_cache` table by (model, sha256 of the
+embedded text). Chunks are embedded with the meeting topic only; the project
+name/description is stored in chunk_text for the chat prompt but kept out of
+the vector, so renaming a project re-embeds from cache at no API cost.
+
+API calls are packed into token-budgeted batches that run concurrently under
+a process-wide limit (EMBEDDING_CONCURRENCY) and are retried on 429/5xx.
 """
 
+import asyncio
+import hashlib
 import os
 import logging
+import time
 from typing import Callable, Awaitable
 
+import openai
 import tiktoken
-from openai import AsyncOpenAI
+
+try:
+    from app.http_client import get_openai_client  # webapp context
+    from app.concurrency import gather_bounded
+    from app.retry import retry_async
+except ImportError:  # pragma: no cover
+    from http_client import get_openai_client  # bot context
+    from concurrency import gather_bounded
+    from retry import retry_async
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +39,26 @@ ENCODING_NAME = "cl100k_base"
 MAX_CHUNK_TOKENS = 500
 CHUNK_OVERLAP_TOKENS = 50
 
+# Per-request API limits: 2048 inputs, 300k tokens total, 8191 tokens per input.
+MAX_BATCH_INPUTS = 2048
+MAX_BATCH_TOKENS = 250_000
+MAX_INPUT_TOKENS = 8191
+# Embedding requests in flight across the whole process.
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY") or 4)
+# Meetings re-embedded in parallel by reembed_all_project_meetings.
+REEMBED_MEETING_CONCURRENCY = 3
+
+# Client errors that won't succeed on retry; 429, 5xx and network errors are retried.
+_NON_RETRYABLE = (
+    openai.BadRequestError,
+    openai.AuthenticationError,
+    openai.PermissionDeniedError,
+    openai.NotFoundError,
+    openai.UnprocessableEntityError,
+)
+
+_limiter: asyncio.Semaphore | None = None
+
 
 def chunk_text(text: str, max_tokens: int = MAX_CHUNK_TOKENS, overlap: int = CHUNK_OVERLAP_TOKENS) -> list[str]:
     """Split *text* into overlapping chunks of roughly *max_tokens* tokens."""
@@ -39,18 +79,103 @@ def chunk_text(text: str, max_tokens: int = MAX_CHUNK_TOKENS, overlap: int = CHU
     return chunks
 
 
-async def generate_embeddings(chunks: list[str]) -> list[list[float]]:
-    """Call OpenAI embeddings API for a batch of text chunks."""
+def content_hash(text: str) -> str:
+    """Cache key for an embedded text (hex sha256)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+async def generate_embeddings(chunks: list[str], db=None) -> list[list[float]]:
+    """Embed a batch of text chunks, in input order.
+
+    With `db`, vectors already in embedding_cache are reused and only the
+    missing texts are sent to the API (then cached)."""
+    if db is None:
+        return await _create_embeddings(chunks)
+
+    hashes = [content_hash(c) for c in chunks]
+    vectors = await db.get_cached_embeddings(EMBEDDING_MODEL, list(set(hashes)))
+    missing: dict[str, str] = {}
+    for h, c in zip(hashes, chunks):
+        if h not in vectors:
+            missing.setdefault(h, c)
+    if missing:
+        fresh = await _create_embeddings(list(missing.values()))
+        new_items = list(zip(missing.keys(), fresh))
+        vectors.update(new_items)
+        await db.save_cached_embeddings(EMBEDDING_MODEL, new_items)
+    logger.info(f"Embeddings: {len(missing)} of {len(chunks)} chunks sent to API, rest from cache")
+    return [vectors[h] for h in hashes]
+
+
+def pack_batches(
+    token_counts: list[int],
+    max_tokens: int = MAX_BATCH_TOKENS,
+    max_inputs: int = MAX_BATCH_INPUTS,
+) -> list[list[int]]:
+    """Group input indices into consecutive batches under both per-request limits."""
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for i, n in enumerate(token_counts):
+        if current and (current_tokens + n > max_tokens or len(current) >= max_inputs):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += n
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _get_limiter() -> asyncio.Semaphore:
+    global _limiter
+    if _limiter is None:
+        _limiter = asyncio.Semaphore(max(1, EMBEDDING_CONCURRENCY))
+    return _limiter
+
+
+@retry_async(attempts=5, base_delay=1.0, max_delay=30.0, dont_retry=_NON_RETRYABLE)
+async def _embed_batch(client, texts: list[str]) -> list[list[float]]:
+    async with _get_limiter():
+        response = await client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
+    return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+async def _create_embeddings(chunks: list[str]) -> list[list[float]]:
+    """Call OpenAI embeddings API for any number of chunks, in input order."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
+    if not chunks:
+        return []
+
+    enc = tiktoken.get_encoding(ENCODING_NAME)
+    texts: list[str] = []
+    token_counts: list[int] = []
+    for chunk in chunks:
+        tokens = enc.encode(chunk)
+        if len(tokens) > MAX_INPUT_TOKENS:
+            tokens = tokens[:MAX_INPUT_TOKENS]
+            chunk = enc.decode(tokens)
+        texts.append(chunk)
+        token_counts.append(len(tokens))
 
-    client = AsyncOpenAI(api_key=api_key)
-    response = await client.embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=chunks,
+    # Retries are ours (above); don't let the client retry underneath them.
+    client = get_openai_client(api_key).with_options(max_retries=0)
+    batches = pack_batches(token_counts, MAX_BATCH_TOKENS, MAX_BATCH_INPUTS)
+    started = time.monotonic()
+    results = await gather_bounded(
+        batches,
+        lambda idx: _embed_batch(client, [texts[i] for i in idx]),
+        limit=EMBEDDING_CONCURRENCY,
     )
-    return [item.embedding for item in response.data]
+    elapsed = max(time.monotonic() - started, 1e-6)
+    total_tokens = sum(token_counts)
+    logger.info(
+        f"Embedded {len(texts)} chunks ({total_tokens} tokens) in {len(batches)} batches, "
+        f"{elapsed:.1f}s — {len(texts) / elapsed:.1f} chunks/s, {total_tokens / elapsed:.0f} tokens/s"
+    )
+    return [vector for batch in results for vector in batch]
 
 
 async def generate_single_embedding(text: str) -> list[float]:
@@ -80,25 +205,31 @@ async def embed_meeting_for_project(db, project_id: int, zoom_meeting_db_id: int
         logger.info(f"No text to embed for meeting db_id={zoom_meeting_db_id}")
         return
 
-    header_parts = [f"Проект: {project_name}"]
-    if project_desc:
-        header_parts.append(f"Описание проекта: {project_desc}")
-    header_parts.append(f"Встреча: {meeting_topic}")
+    # Meeting-level header goes into the vector; project-level fields are the same
+    # for every chunk of the project (search is already scoped by project_id),
+    # so they only go into the stored text.
+    meeting_parts = [f"Встреча: {meeting_topic}"]
     if host_name:
-        header_parts.append(f"Организатор: {host_name}")
-    metadata_header = "\n".join(header_parts)
+        meeting_parts.append(f"Организатор: {host_name}")
+    meeting_header = "\n".join(meeting_parts)
+
+    project_parts = [f"Проект: {project_name}"]
+    if project_desc:
+        project_parts.append(f"Описание проекта: {project_desc}")
+    metadata_header = "\n".join(project_parts + meeting_parts)
 
     chunks = chunk_text(text)
     if not chunks:
         return
 
+    embedded_chunks = [f"{meeting_header}\n\n{chunk}" for chunk in chunks]
     enriched_chunks = [f"{metadata_header}\n\n{chunk}" for chunk in chunks]
 
     logger.info(
         f"Generating {len(enriched_chunks)} embeddings for "
         f"project '{project_name}' (id={project_id}), meeting '{meeting_topic}' (db_id={zoom_meeting_db_id})"
     )
-    embeddings = await generate_embeddings(enriched_chunks)
+    embeddings = await generate_embeddings(embedded_chunks, db=db)
 
     records = [
         {"chunk_index": i, "chunk_text": enriched, "embedding": e}
@@ -114,8 +245,16 @@ async def reembed_all_project_meetings(db, project_id: int):
     if not meetings:
         logger.info(f"No meetings in project {project_id}, nothing to re-embed")
         return
-    for m in meetings:
-        try:
-            await embed_meeting_for_project(db, project_id, m["db_id"])
-        except Exception as e:
-            logger.error(f"Failed to re-embed meeting {m['db_id']} for project {project_id}: {e}")
+    started = time.monotonic()
+    results = await gather_bounded(
+        meetings,
+        lambda m: embed_meeting_for_project(db, project_id, m["db_id"]),
+        limit=REEMBED_MEETING_CONCURRENCY,
+        return_exceptions=True,
+    )
+    for m, result in zip(meetings, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to re-embed meeting {m['db_id']} for project {project_id}: {result}")
+    logger.info(
+        f"Re-embedded {len(meetings)} meetings for project {project_id} in {time.monotonic() - started:.1f}s"
+    )
@@ -0,0 +1,101 @@
+"""App-scoped pooled HTTP client for outbound integrations.
+
+One aiohttp.ClientSession (and one AsyncOpenAI client per API key) is shared by
+OpenRouter, Telegram, Lark, Zoom, Kimai and the embeddings code, so repeated
+calls reuse keep-alive connections instead of paying a TCP + TLS handshake
+each time.
+
+Usage:
+
+    from app.http_client import pooled_session
+
+    async with pooled_session() as session:
+        async with session.post(url, json=payload) as resp:
+            ...
+
+`pooled_session()` is a drop-in for `aiohttp.ClientSession()` in an
+`async with` block, except leaving the block does NOT close the session.
+
+Lifecycle: the webapp calls `start()` from `app.on_startup` and `close()` from
+`app.on_cleanup`. Anything running without those hooks (the bot, scripts)
+gets a session lazily on first use inside its event loop.
+"""
+from __future__ import annotations
+
+import contextlib
+import logging
+from typing import AsyncIterator
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Total sockets across all hosts, and per (host, port, ssl) pool.
+POOL_LIMIT = 100
+POOL_LIMIT_PER_HOST = 20
+KEEPALIVE_TIMEOUT = 60
+# Defaults only — long calls (transcription, downloads) pass their own timeout.
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=300, connect=15, sock_connect=15)
+
+_session: aiohttp.ClientSession | None = None
+_openai_clients: dict[str, object] = {}
+
+
+def _new_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=POOL_LIMIT,
+        limit_per_host=POOL_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=300,
+    )
+    # Integrations authenticate with headers; never let cookies leak between hosts.
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=DEFAULT_TIMEOUT,
+        cookie_jar=aiohttp.DummyCookieJar(),
+    )
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the shared session, creating it in the running loop if needed."""
+    global _session
+    if _session is None or _session.closed:
+        _session = _new_session()
+    return _session
+
+
+@contextlib.asynccontextmanager
+async def pooled_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """`async with` wrapper around the shared session; does not close it on exit."""
+    yield get_session()
+
+
+def get_openai_client(api_key: str):
+    """Return a cached AsyncOpenAI client (its own httpx pool) for `api_key`."""
+    client = _openai_clients.get(api_key)
+    if client is None:
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=api_key)
+        _openai_clients[api_key] = client
+    return client
+
+
+async def start(app=None):
+    """aiohttp `on_startup` hook: open the shared session eagerly."""
+    get_session()
+    logger.info("Shared HTTP client pool started (limit=%d, per_host=%d)", POOL_LIMIT, POOL_LIMIT_PER_HOST)
+
+
+async def close(app=None):
+    """aiohttp `on_cleanup` hook: close the shared session and OpenAI clients."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    for client in list(_openai_clients.values()):
+        try:
+            await client.close()
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Failed to close OpenAI client: %s", e)
+    _openai_clients.clear()
+    logger.info("Shared HTTP client pool closed")
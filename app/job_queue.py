@@ -0,0 +1,228 @@
+"""Durable background jobs on Postgres (`background_jobs` table).
+
+No new dependencies — asyncpg + asyncio. Jobs are claimed with
+`SELECT … FOR UPDATE SKIP LOCKED`, so any number of workers (the webapp
+process, `mini_app/worker.py` containers) can share one queue.
+
+Usage:
+
+    from app.job_queue import JobKind, JobWorker
+
+    await db.enqueue_job("transcribe", {"meeting_id": mid}, dedupe_key=f"transcribe:{mid}")
+
+    worker = JobWorker(db, [
+        JobKind("transcribe", transcribe_meeting, concurrency=2, on_give_up=notify_failed),
+        JobKind("upload_video_s3", upload_video, concurrency=3),
+    ])
+    await worker.start()      # or: await worker.run_forever()
+    ...
+    await worker.stop()
+
+A handler is called as `handler(**payload)`. If it raises, the job is
+retried with exponential backoff until `max_attempts` (set at enqueue time)
+is used up; then `on_give_up(**payload)` runs and the job is marked failed.
+Running jobs hold a lease that the worker renews; if a worker dies, the
+lease expires and another worker picks the job up.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from typing import Awaitable, Callable
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel used to wake idle workers when a job is enqueued.
+JOB_QUEUE_CHANNEL = 'background_jobs'
+
+LEASE_SECONDS = 120
+POLL_INTERVAL = 5.0
+RETRY_BASE_DELAY = 30.0
+RETRY_MAX_DELAY = 600.0
+# Finished jobs are kept this long for inspection, then purged.
+KEEP_FINISHED_DAYS = 7
+
+
+def retry_delay(attempt: int) -> float:
+    """Backoff before attempt `attempt + 1`: 30s, 60s, 120s, … capped at 10 min."""
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** max(0, attempt - 1))
+
+
+class JobKind:
+    """A job type the worker knows how to run, with its own concurrency limit."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[..., Awaitable[object]],
+        concurrency: int = 1,
+        on_give_up: Callable[..., Awaitable[object]] | None = None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.on_give_up = on_give_up
+
+
+class JobWorker:
+    def __init__(
+        self,
+        db,
+        kinds: list[JobKind],
+        worker_id: str | None = None,
+        lease_seconds: int = LEASE_SECONDS,
+        poll_interval: float = POLL_INTERVAL,
+        listen: bool = True,
+    ):
+        self.db = db
+        self.kinds = {k.name: k for k in kinds}
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.listen = listen
+        self._running: dict[str, dict[int, asyncio.Task]] = {name: {} for name in self.kinds}
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._listen_conn = None
+        self.processed = 0
+        self.failed = 0
+
+    # ---- lifecycle ----
+
+    async def start(self) -> None:
+        if self.listen:
+            await self._start_listener()
+        self._tasks = [
+            asyncio.create_task(self._claim_loop()),
+            asyncio.create_task(self._heartbeat_loop()),
+            asyncio.create_task(self._purge_loop()),
+        ]
+        logger.info(
+            "Job worker %s started: %s", self.worker_id,
+            ", ".join(f"{k.name}×{k.concurrency}" for k in self.kinds.values()),
+        )
+
+    async def run_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Stop claiming, cancel running jobs and hand them back to the queue."""
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        running = [t for jobs in self._running.values() for t in jobs.values()]
+        for t in running:
+            t.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        if self._listen_conn is not None and not self._listen_conn.is_closed():
+            await self._listen_conn.close()
+        self._listen_conn = None
+        logger.info("Job worker %s stopped (%d done, %d failed)", self.worker_id, self.processed, self.failed)
+
+    def stats(self) -> dict:
+        return {
+            'worker_id': self.worker_id,
+            'running': {name: len(jobs) for name, jobs in self._running.items()},
+            'processed': self.processed,
+            'failed': self.failed,
+        }
+
+    # ---- internals ----
+
+    async def _start_listener(self) -> None:
+        try:
+            self._listen_conn = await asyncpg.connect(self.db.database_url)
+            await self._listen_conn.add_listener(JOB_QUEUE_CHANNEL, lambda *_: self._wake.set())
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Job queue LISTEN not started, polling every %.0fs: %s", self.poll_interval, e)
+            self._listen_conn = None
+
+    async def _claim_loop(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self._fill_slots()
+            except Exception as e:  # noqa: BLE001
+                logger.error("Job worker %s: claim failed: %s", self.worker_id, e)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fill_slots(self) -> None:
+        for kind in self.kinds.values():
+            free = kind.concurrency - len(self._running[kind.name])
+            if free <= 0:
+                continue
+            jobs = await self.db.claim_jobs(kind.name, self.worker_id, free, self.lease_seconds)
+            for job in jobs:
+                task = asyncio.create_task(self._run(kind, job))
+                self._running[kind.name][job['id']] = task
+
+    async def _run(self, kind: JobKind, job: dict) -> None:
+        job_id, attempt = job['id'], job['attempts']
+        payload = job['payload']
+        try:
+            if attempt > job['max_attempts']:
+                # Lease expired on the last attempt (worker crash) — don't run it again.
+                raise RuntimeError("lease expired on final attempt")
+            logger.info("Job %s #%d (%s) attempt %d/%d", kind.name, job_id, payload, attempt, job['max_attempts'])
+            await kind.handler(**payload)
+            await self.db.complete_job(job_id, self.worker_id)
+            self.processed += 1
+        except asyncio.CancelledError:
+            await asyncio.shield(self.db.release_job(job_id, self.worker_id))
+            raise
+        except Exception as e:  # noqa: BLE001
+            if attempt < job['max_attempts']:
+                delay = retry_delay(attempt)
+                logger.warning("Job %s #%d failed (%s) — retry in %.0fs", kind.name, job_id, e, delay)
+                await self.db.fail_job(job_id, self.worker_id, repr(e), retry_in=delay)
+            else:
+                logger.error("Job %s #%d gave up after %d attempts: %s", kind.name, job_id, attempt, e)
+                await self.db.fail_job(job_id, self.worker_id, repr(e), retry_in=None)
+                self.failed += 1
+                if kind.on_give_up is not None:
+                    try:
+                        await kind.on_give_up(**payload)
+                    except Exception as give_up_err:  # noqa: BLE001
+                        logger.error("Job %s #%d on_give_up failed: %s", kind.name, job_id, give_up_err)
+        finally:
+            self._running[kind.name].pop(job_id, None)
+            self._wake.set()
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            ids = [job_id for jobs in self._running.values() for job_id in jobs]
+            if not ids:
+                continue
+            try:
+                await self.db.extend_job_leases(ids, self.worker_id, self.lease_seconds)
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Job worker %s: lease renewal failed: %s", self.worker_id, e)
+
+    async def _purge_loop(self) -> None:
+        while True:
+            await asyncio.sleep(3600)
+            try:
+                await self.db.purge_finished_jobs(KEEP_FINISHED_DAYS)
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Job worker %s: purge failed: %s", self.worker_id, e)
+
+
+def decode_payload(raw) -> dict:
+    """asyncpg returns jsonb as text unless a codec is set."""
+    if isinstance(raw, (str, bytes)):
+        return json.loads(raw)
+    return dict(raw or {})
@@ -2,18 +2,25 @@
 Async client for Kimai Time Tracking REST API.
 """
 
+import asyncio
 import logging
 from typing import Any
 
-import aiohttp
-
 try:
     from app.retry import retry_async  # webapp context
+    from app.http_client import pooled_session
+    from app.concurrency import gather_bounded
 except ImportError:  # pragma: no cover
     from retry import retry_async  # bot context
+    from http_client import pooled_session
+    from concurrency import gather_bounded
 
 logger = logging.getLogger(__name__)
 
+# Parallel Kimai requests per fan-out (team details, user details).
+KIMAI_CONCURRENCY = 6
+PAGE_SIZE = 500
+
 
 class KimaiClient:
     def __init__(self, base_url: str, api_token: str):
@@ -27,8 +34,8 @@ class KimaiClient:
     @retry_async(attempts=3, base_delay=0.5)
     async def _get(self, path: str, params: dict | None = None) -> Any:
         url = f"{self.base_url}{path}"
-        async with aiohttp.ClientSession(headers=self._headers) as session:
-            async with session.get(url, params=params, ssl=False) as resp:
+        async with pooled_session() as session:
+            async with session.get(url, params=params, headers=self._headers, ssl=False) as resp:
                 if resp.status != 200:
                     body = await resp.text()
                     logger.error("Kimai API error %s %s: %s", resp.status, url, body)
@@ -50,7 +57,7 @@ class KimaiClient:
     async def get_users_with_rates(self) -> list[dict]:
         """Fetch all users and enrich each with hourly_rate and email from detail."""
         users = await self.get_users()
-        import asyncio
+
         async def enrich(u: dict) -> dict:
             try:
                 detail = await self.get_user(u["id"])
@@ -66,7 +73,7 @@ class KimaiClient:
                 u.setdefault("hourly_rate", None)
                 u.setdefault("email", None)
             return u
-        return list(await asyncio.gather(*[enrich(u) for u in users]))
+        return await gather_bounded(users, enrich, KIMAI_CONCURRENCY)
 
     async def get_projects(self) -> list[dict]:
         return await self._get("/api/projects", params={"size": "500"})
@@ -87,29 +94,33 @@ class KimaiClient:
         end: str,
     ) -> list[dict]:
         """Fetch all timesheets for a project (across all users) in the date range."""
-        users = await self.get_users()
+        return await self._get_timesheet_pages(
+            {"user": "all", "project": str(project_id), "begin": begin, "end": end},
+        )
+
+    async def get_all_timesheets(self, modified_after: str | None = None) -> list[dict]:
+        """Fetch timesheets of all users (needs `view_other_timesheet`), optionally
+        only those created/changed after `modified_after` (YYYY-MM-DDTHH:mm:ss)."""
+        params = {"user": "all"}
+        if modified_after:
+            params["modified_after"] = modified_after
+        return await self._get_timesheet_pages(params)
+
+    async def get_timesheets_in_range(self, begin: str, end: str) -> list[dict]:
+        """Fetch timesheets of all users in the date range with one paginated pull."""
+        return await self._get_timesheet_pages({"user": "all", "begin": begin, "end": end})
+
+    async def _get_timesheet_pages(self, params: dict) -> list[dict]:
         all_records: list[dict] = []
-        for user in users:
-            uid = user.get("id")
-            if not uid:
-                continue
-            page = 1
-            while True:
-                data = await self._get(
-                    "/api/timesheets",
-                    params={
-                        "user": str(uid),
-                        "project": str(project_id),
-                        "begin": begin,
-                        "end": end,
-                        "size": "500",
-                        "page": str(page),
-                    },
-                )
-                all_records.extend(data)
-                if len(data) < 500:
-                    break
-                page += 1
+        page = 1
+        while True:
+            data = await self._get(
+                "/api/timesheets", params={**params, "size": str(PAGE_SIZE), "page": str(page)},
+            )
+            all_records.extend(data)
+            if len(data) < PAGE_SIZE:
+                break
+            page += 1
         return all_records
 
     async def build_client_report_data(
@@ -123,21 +134,27 @@ class KimaiClient:
         Returns dict with keys: projects, activities_map, users_map,
         report_by_project (project_id -> list of timesheet dicts with resolved names).
         """
-        activities_list = await self.get_activities()
+        activities_list, users_list, projects_list, timesheets_by_project = await asyncio.gather(
+            self.get_activities(),
+            self.get_users(),
+            self.get_projects(),
+            gather_bounded(
+                project_ids,
+                lambda pid: self.get_project_timesheets(pid, begin, end),
+                KIMAI_CONCURRENCY,
+            ),
+        )
         activities_map: dict[int, str] = {a["id"]: a["name"] for a in activities_list}
 
-        users_list = await self.get_users()
         users_map: dict[int, str] = {}
         for u in users_list:
             users_map[u["id"]] = u.get("alias") or u.get("username") or f"User {u['id']}"
 
-        projects_list = await self.get_projects()
         projects_map: dict[int, str] = {p["id"]: p["name"] for p in projects_list}
 
         report_by_project: dict[int, list[dict]] = {}
 
-        for pid in project_ids:
-            timesheets = await self.get_project_timesheets(pid, begin, end)
+        for pid, timesheets in zip(project_ids, timesheets_by_project):
             entries: list[dict] = []
             for ts in timesheets:
                 entries.append({
@@ -198,30 +215,38 @@ class KimaiClient:
 
         Returns dict with keys: teams, projects_map, report_by_team.
         report_by_team maps team_id -> list of member dicts with timesheets.
+
+        All timesheets of the period are fetched in one pull and grouped by
+        user; a member of several teams is summarised once.
         """
-        teams_list = await self.get_teams()
-        projects_list = await self.get_projects()
+        teams_list, projects_list, activities_list, all_timesheets = await asyncio.gather(
+            self.get_teams(),
+            self.get_projects(),
+            self.get_activities(),
+            self.get_timesheets_in_range(begin, end),
+        )
         projects_map: dict[int, str] = {p["id"]: p["name"] for p in projects_list}
+        teams: list[dict] = await gather_bounded(
+            [t["id"] for t in teams_list], self.get_team, KIMAI_CONCURRENCY,
+        )
 
-        teams: list[dict] = []
-        report_by_team: dict[int, list[dict]] = {}
-
-        # Fetch activities once to detect "Бонусы" activity type
-        activities_list = await self.get_activities()
+        # Activity type "Бонусы" goes to bonus, not regular earnings
         bonus_activity_ids: set[int] = {
             a["id"] for a in activities_list
             if "бонус" in (a.get("name") or "").lower()
         }
 
-        for team_summary in teams_list:
-            team_id = team_summary["id"]
-            team_detail = await self.get_team(team_id)
-            teams.append(team_detail)
+        timesheets_by_user: dict[int, list[dict]] = {}
+        for ts in all_timesheets:
+            timesheets_by_user.setdefault(ts.get("user"), []).append(ts)
 
-            members = team_detail.get("members", [])
+        totals_by_user: dict[int, dict] = {}
+        report_by_team: dict[int, list[dict]] = {}
+
+        for team_detail in teams:
             member_reports: list[dict] = []
 
-            for member in members:
+            for member in team_detail.get("members", []):
                 user_info = member.get("user", {})
                 user_id = user_info.get("id")
                 if not user_id:
@@ -232,43 +257,53 @@ class KimaiClient:
                     or user_info.get("username")
                     or f"User {user_id}"
                 )
-                is_teamlead = member.get("teamlead", False)
-
-                timesheets = await self.get_timesheets(user_id, begin, end)
-
-                project_hours: dict[int, float] = {}
-                project_money: dict[int, float] = {}
-                bonus_from_activity: float = 0.0
-
-                for ts in timesheets:
-                    proj_id = ts.get("project")
-                    activity_id = ts.get("activity")
-                    duration_sec = ts.get("duration", 0) or 0
-                    rate = ts.get("rate", 0) or 0
-
-                    # Timesheets with "Бонусы" activity go to bonus, not regular earnings
-                    if activity_id in bonus_activity_ids:
-                        bonus_from_activity += rate
-                    elif proj_id is not None:
-                        project_hours[proj_id] = project_hours.get(proj_id, 0) + duration_sec / 3600
-                        project_money[proj_id] = project_money.get(proj_id, 0) + rate
+                if user_id not in totals_by_user:
+                    totals_by_user[user_id] = _summarize_timesheets(
+                        timesheets_by_user.get(user_id, []), bonus_activity_ids,
+                    )
+                totals = totals_by_user[user_id]
 
                 member_reports.append({
                     "user_id": user_id,
                     "name": alias,
-                    "is_teamlead": is_teamlead,
+                    "is_teamlead": member.get("teamlead", False),
                     "account_number": user_info.get("accountNumber") or "",
-                    "project_hours": project_hours,
-                    "project_money": project_money,
-                    "total_hours": sum(project_hours.values()),
-                    "total_money": sum(project_money.values()),
-                    "bonus_from_activity": bonus_from_activity,
+                    "project_hours": totals["project_hours"],
+                    "project_money": totals["project_money"],
+                    "total_hours": sum(totals["project_hours"].values()),
+                    "total_money": sum(totals["project_money"].values()),
+                    "bonus_from_activity": totals["bonus_from_activity"],
                 })
 
-            report_by_team[team_id] = member_reports
+            report_by_team[team_detail["id"]] = member_reports
 
         return {
             "teams": teams,
             "projects_map": projects_map,
             "report_by_team": report_by_team,
         }
+
+
+def _summarize_timesheets(timesheets: list[dict], bonus_activity_ids: set[int]) -> dict:
+    """Per-project hours and money for one user; bonus-activity rates summed separately."""
+    project_hours: dict[int, float] = {}
+    project_money: dict[int, float] = {}
+    bonus_from_activity: float = 0.0
+
+    for ts in timesheets:
+        proj_id = ts.get("project")
+        activity_id = ts.get("activity")
+        duration_sec = ts.get("duration", 0) or 0
+        rate = ts.get("rate", 0) or 0
+
+        if activity_id in bonus_activity_ids:
+            bonus_from_activity += rate
+        elif proj_id is not None:
+            project_hours[proj_id] = project_hours.get(proj_id, 0) + duration_sec / 3600
+            project_money[proj_id] = project_money.get(proj_id, 0) + rate
+
+    return {
+        "project_hours": project_hours,
+        "project_money": project_money,
+        "bonus_from_activity": bonus_from_activity,
+    }
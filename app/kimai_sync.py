@@ -0,0 +1,210 @@
+"""Local Postgres mirror of Kimai: users, activities, projects, teams, timesheets.
+
+No new dependencies — KimaiClient + asyncpg (via Database).
+
+Usage:
+
+    from app.kimai_sync import KimaiSync, mirror_is_fresh, build_client_report_data
+
+    kimai_sync = KimaiSync(db, kimai_client)
+    asyncio.create_task(kimai_sync.run_forever())   # webapp: keep the mirror current
+    await kimai_sync.ensure_synced()                # before the first read after deploy
+
+    rows = await db.get_kimai_project_finance(kimai_project_id, date_from, date_to)
+
+Timesheets are pulled incrementally with Kimai's `modified_after` filter. Kimai
+does not report deletions that way, so once a day the whole timesheet list is
+re-read and rows missing from it are pruned.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+try:
+    from app.concurrency import gather_bounded  # webapp context
+except ImportError:  # pragma: no cover
+    from concurrency import gather_bounded  # bot context
+
+logger = logging.getLogger(__name__)
+
+KIMAI_SYNC_INTERVAL = int(os.getenv("KIMAI_SYNC_INTERVAL") or 600)
+FULL_RESYNC_INTERVAL = timedelta(hours=24)
+# `modified_after` is read in the Kimai user's timezone; re-reading a day of
+# changes covers any offset from our UTC cursor (upserts are idempotent).
+MODIFIED_OVERLAP = timedelta(hours=24)
+# Readers that can fall back to the live API do so when the mirror is older than this.
+MAX_MIRROR_AGE = timedelta(hours=1)
+TEAM_FETCH_CONCURRENCY = 4
+
+CURSOR_STATE = "timesheets_cursor"
+FULL_SYNC_STATE = "timesheets_full"
+
+
+def parse_kimai_time(value: str | None) -> datetime | None:
+    """'2024-03-05T10:00:00+0300' -> naive 2024-03-05 10:00 (Kimai wall-clock time)."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+    except ValueError:
+        return None
+
+
+def timesheet_row(ts: dict) -> tuple | None:
+    """Kimai timesheet (collection format, ids not objects) -> kimai_timesheets row."""
+    begin = parse_kimai_time(ts.get("begin"))
+    if not ts.get("id") or begin is None:
+        return None
+    return (
+        ts["id"],
+        ts.get("user"),
+        ts.get("project"),
+        ts.get("activity"),
+        begin,
+        parse_kimai_time(ts.get("end")),
+        int(ts.get("duration") or 0),
+        float(ts.get("rate") or 0),
+        ts.get("description") or "",
+    )
+
+
+async def mirror_synced_at(db) -> datetime | None:
+    """When timesheets were last pulled into the mirror (None: never)."""
+    return await db.get_kimai_sync_state(CURSOR_STATE)
+
+
+async def mirror_is_fresh(db, max_age: timedelta = MAX_MIRROR_AGE) -> bool:
+    try:
+        synced_at = await mirror_synced_at(db)
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Kimai mirror state unavailable: %s", e)
+        return False
+    return synced_at is not None and datetime.now(timezone.utc) - synced_at <= max_age
+
+
+async def build_client_report_data(db, project_ids: list[int], date_from, date_to) -> dict:
+    """Same shape as KimaiClient.build_client_report_data, read from the mirror."""
+    projects_map = await db.get_kimai_projects_map()
+    rows = await db.get_kimai_project_entries(project_ids, date_from, date_to)
+    report_by_project: dict[int, list[dict]] = {pid: [] for pid in project_ids}
+    for r in rows:
+        report_by_project[r["project_id"]].append({
+            "date": r["begin_at"].isoformat(),
+            "activity": r["activity_name"] or "Other",
+            "user": r["user_name"] or "Unknown",
+            "description": r["description"] or "",
+            "hours": (r["duration"] or 0) / 3600,
+        })
+    return {
+        "projects_map": projects_map,
+        "report_by_project": report_by_project,
+    }
+
+
+class KimaiSync:
+    def __init__(self, db, kimai, interval: int = KIMAI_SYNC_INTERVAL):
+        self.db = db
+        self.kimai = kimai
+        self.interval = interval
+        self._current: asyncio.Future | None = None
+        self.last_result: dict | None = None
+        self.last_error: str | None = None
+
+    async def sync(self, full: bool = False) -> dict:
+        """Sync reference data and timesheets. Concurrent callers share one run."""
+        if self._current is None or self._current.done():
+            self._current = asyncio.ensure_future(self._sync(full))
+        return await asyncio.shield(self._current)
+
+    async def ensure_synced(self, timeout: float = 60) -> None:
+        """Wait for the initial sync if the mirror has never been filled."""
+        if await mirror_synced_at(self.db) is None:
+            await asyncio.wait_for(self.sync(), timeout)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.sync()
+                self.last_error = None
+            except Exception as e:  # noqa: BLE001
+                self.last_error = str(e)
+                logger.error(f"Kimai sync failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {'last_result': self.last_result, 'last_error': self.last_error}
+
+    async def _sync(self, full: bool) -> dict:
+        t0 = time.monotonic()
+        started = datetime.now(timezone.utc)
+        await self._sync_reference()
+
+        cursor = await self.db.get_kimai_sync_state(CURSOR_STATE)
+        last_full = await self.db.get_kimai_sync_state(FULL_SYNC_STATE)
+        full = full or cursor is None or last_full is None or started - last_full > FULL_RESYNC_INTERVAL
+        if full:
+            records = await self.kimai.get_all_timesheets()
+        else:
+            since = (cursor - MODIFIED_OVERLAP).strftime("%Y-%m-%dT%H:%M:%S")
+            records = await self.kimai.get_all_timesheets(modified_after=since)
+
+        rows = [row for row in map(timesheet_row, records) if row is not None]
+        await self.db.upsert_kimai_timesheets(rows)
+        pruned = 0
+        if full:
+            # An empty answer is more likely a permissions problem than "everything deleted".
+            if rows:
+                pruned = await self.db.prune_kimai_timesheets([row[0] for row in rows])
+            await self.db.set_kimai_sync_state(FULL_SYNC_STATE, started)
+        await self.db.set_kimai_sync_state(CURSOR_STATE, started)
+
+        self.last_result = {
+            'full': full, 'timesheets': len(rows), 'pruned': pruned,
+            'seconds': round(time.monotonic() - t0, 1), 'at': started.isoformat(),
+        }
+        logger.info(
+            f"Kimai sync ({'full' if full else 'incremental'}): {len(rows)} timesheets upserted, "
+            f"{pruned} pruned in {self.last_result['seconds']}s"
+        )
+        return self.last_result
+
+    async def _sync_reference(self) -> None:
+        users, activities, projects, teams = await asyncio.gather(
+            self.kimai.get_users(),
+            self.kimai.get_activities(),
+            self.kimai.get_projects(),
+            self.kimai.get_teams(),
+        )
+        team_details = await gather_bounded(
+            [t["id"] for t in teams], self.kimai.get_team, TEAM_FETCH_CONCURRENCY,
+        )
+
+        users_by_id = {u["id"]: u for u in users}
+        team_rows, member_rows = [], []
+        for team in team_details:
+            team_rows.append((team["id"], team.get("name")))
+            for member in team.get("members", []):
+                user = member.get("user") or {}
+                if not user.get("id"):
+                    continue
+                users_by_id.setdefault(user["id"], user)
+                member_rows.append((team["id"], user["id"], bool(member.get("teamlead"))))
+
+        await self.db.replace_kimai_reference_data(
+            users=[
+                (u["id"], u.get("username"), u.get("alias"), u.get("accountNumber"), u.get("enabled", True))
+                for u in users_by_id.values()
+            ],
+            activities=[
+                (a["id"], a.get("name"), a.get("project"), a.get("visible", True)) for a in activities
+            ],
+            projects=[
+                (p["id"], p.get("name"), p.get("customer"), p.get("visible", True)) for p in projects
+            ],
+            teams=team_rows,
+            members=member_rows,
+        )
@@ -2,15 +2,17 @@
 Lark (Feishu) Bot API Client
 """
 
-import aiohttp
-import time
 import json
 import logging
 
 try:
     from app.retry import retry_async  # webapp context
+    from app.http_client import pooled_session
+    from app.token_provider import TokenProvider
 except ImportError:  # pragma: no cover
     from retry import retry_async  # bot context
+    from http_client import pooled_session
+    from token_provider import TokenProvider
 
 logger = logging.getLogger(__name__)
 
@@ -23,15 +25,14 @@ class LarkClient:
         self.app_id = app_id
         self.app_secret = app_secret
         self.group_chat_id = group_chat_id
-        self._token: str | None = None
-        self._token_expires_at: float = 0
+        self.tokens = TokenProvider(self._fetch_tenant_token, name="Lark")
 
-    @retry_async(attempts=3, base_delay=1.0)
     async def get_tenant_token(self) -> str:
-        if self._token and time.time() < self._token_expires_at - 60:
-            return self._token
+        return await self.tokens.get()
 
-        async with aiohttp.ClientSession() as session:
+    @retry_async(attempts=3, base_delay=1.0)
+    async def _fetch_tenant_token(self) -> tuple[str, float]:
+        async with pooled_session() as session:
             async with session.post(
                 self.TOKEN_URL,
                 json={"app_id": self.app_id, "app_secret": self.app_secret},
@@ -41,10 +42,8 @@ class LarkClient:
                     logger.error(f"Lark token error: {data}")
                     raise Exception(f"Failed to get Lark token: {data}")
 
-                self._token = data["tenant_access_token"]
-                self._token_expires_at = time.time() + data.get("expire", 7200)
                 logger.info("Lark tenant token obtained successfully")
-                return self._token
+                return data["tenant_access_token"], data.get("expire", 7200)
 
     @retry_async(attempts=3, base_delay=0.5)
     async def _send_message(self, msg_type: str, content: str) -> dict:
@@ -58,7 +57,7 @@ class LarkClient:
             "content": content,
         }
 
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.post(
                 self.MSG_URL,
                 params=params,
@@ -80,7 +79,7 @@ class LarkClient:
         token = await self.get_tenant_token()
         url = f"https://open.feishu.cn/open-apis/im/v1/messages/{message_id}"
 
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.delete(
                 url,
                 headers={"Authorization": f"Bearer {token}"},
@@ -641,7 +640,7 @@ class LarkClient:
         """Fetch open_ids of chat owner + admins only."""
         token = await self.get_tenant_token()
 
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             chat_url = f"https://open.feishu.cn/open-apis/im/v1/chats/{self.group_chat_id}"
             async with session.get(
                 chat_url,
@@ -706,7 +705,7 @@ class LarkClient:
         except Exception as me:
             logger.warning(f"Could not add members to Lark task: {me}")
 
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.post(
                 "https://open.feishu.cn/open-apis/task/v2/tasks",
                 headers={
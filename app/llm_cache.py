@@ -0,0 +1,141 @@
+"""Persistent cache for deterministic LLM calls (`llm_cache` table).
+
+No new dependencies — hashlib + asyncpg (via Database), with a small
+in-process TTLCache in front.
+
+Usage:
+
+    from app.llm_cache import LLMCache
+
+    llm_cache = LLMCache(db)
+    text = await llm_cache.get_or_call(
+        model, messages, {"max_tokens": 2000, "temperature": 0.3},
+        lambda: _openrouter_chat(api_key, model, messages, 2000, 0.3),
+        bypass=regenerate,
+    )
+    llm_cache.stats()   # hits / misses / bypasses / shared / hit_rate
+
+The key is sha256 of (model, messages, params), so any change to the prompt,
+the input, the requested model or the sampling params is a miss. Empty or
+None answers are not stored. `bypass=True` ("regenerate") skips the lookup
+but stores the fresh answer, so the next normal read returns it. Identical
+calls already in flight share one request. Entries expire after
+LLM_CACHE_TTL_DAYS; beyond LLM_CACHE_MAX_ROWS the least recently hit rows
+are evicted.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable
+
+try:
+    from app.ttl_cache import TTLCache  # webapp context
+except ImportError:  # pragma: no cover
+    from ttl_cache import TTLCache  # bot context
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_TTL_DAYS = int(os.getenv("LLM_CACHE_TTL_DAYS") or 30)
+LLM_CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS") or 20_000)
+PURGE_INTERVAL = 3600.0
+
+
+def cache_key(model: str, messages: list[dict], params: dict | None = None) -> str:
+    blob = json.dumps(
+        {"model": model, "messages": messages, "params": params or {}},
+        ensure_ascii=False, sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, db, ttl_days: int = LLM_CACHE_TTL_DAYS, max_rows: int = LLM_CACHE_MAX_ROWS,
+                 memory_size: int = 256):
+        self.db = db
+        self.ttl_days = ttl_days
+        self.max_rows = max_rows
+        self.memory = TTLCache(maxsize=memory_size, ttl=min(ttl_days * 86400, 3600))
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._last_purge = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.shared = 0
+
+    async def get_or_call(
+        self,
+        model: str,
+        messages: list[dict],
+        params: dict | None,
+        call: Callable[[], Awaitable[str | None]],
+        bypass: bool = False,
+    ) -> str | None:
+        key = cache_key(model, messages, params)
+        if bypass:
+            self.bypasses += 1
+            return await self._call_and_store(key, model, call)
+
+        cached = self.memory.get(key)
+        if cached is None:
+            cached = await self._load(key)
+        if cached is not None:
+            self.memory.set(key, cached)
+            self.hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        fut = asyncio.ensure_future(self._call_and_store(key, model, call))
+        self._inflight[key] = fut
+        fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded: a disconnecting client must not throw away a paid-for answer.
+        return await asyncio.shield(fut)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.shared
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'shared': self.shared,
+            'bypasses': self.bypasses,
+            'hit_rate': round((self.hits + self.shared) / lookups, 3) if lookups else None,
+            'memory': self.memory.stats(),
+        }
+
+    async def _load(self, key: str) -> str | None:
+        try:
+            return await self.db.get_llm_cache(key, self.ttl_days)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("LLM cache lookup failed: %s", e)
+            return None
+
+    async def _call_and_store(self, key: str, model: str, call) -> str | None:
+        result = await call()
+        if not result:
+            return result
+        self.memory.set(key, result)
+        try:
+            await self.db.save_llm_cache(key, model, result)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("LLM cache store failed: %s", e)
+        if time.monotonic() - self._last_purge > PURGE_INTERVAL:
+            self._last_purge = time.monotonic()
+            asyncio.ensure_future(self._purge())
+        return result
+
+    async def _purge(self) -> None:
+        try:
+            removed = await self.db.purge_llm_cache(self.ttl_days, self.max_rows)
+            if removed:
+                logger.info("LLM cache: purged %d expired/evicted entries", removed)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("LLM cache purge failed: %s", e)
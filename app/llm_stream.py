@@ -0,0 +1,148 @@
+"""Stream OpenRouter chat completions to the browser as Server-Sent Events.
+
+No new dependencies — aiohttp StreamResponse + the pooled client session.
+
+Usage:
+
+    from app.llm_stream import stream_chat_sse
+
+    return await stream_chat_sse(
+        request, api_key, model, messages, max_tokens=2000,
+        done_extra={'model_used': 'default'},
+        on_complete=persist_answer,        # optional: async fn(answer)
+    )
+
+The browser receives:
+
+    event: delta   data: {"text": "..."}          (repeated)
+    event: done    data: {"answer": "...", ...}   (done_extra merged in)
+    event: error   data: {"error": "..."}
+
+OpenRouter is called with `stream: true` and each content delta is forwarded
+as soon as it arrives. If the client goes away mid-answer the upstream request
+is closed (OpenRouter stops generating and billing) and `on_complete` is not
+called.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable
+
+import aiohttp
+from aiohttp import web
+
+try:
+    from app.http_client import pooled_session  # webapp context
+except ImportError:  # pragma: no cover
+    from http_client import pooled_session  # bot context
+
+logger = logging.getLogger(__name__)
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+# No total limit: long answers are fine as long as tokens keep coming.
+STREAM_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=15, sock_read=120)
+
+
+class ClientGone(Exception):
+    """The browser closed the SSE connection."""
+
+
+def sse_event(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+def parse_sse_line(line: str) -> str | None:
+    """Content delta from one OpenRouter SSE line; None for comments, keep-alives and [DONE]."""
+    if not line.startswith("data:"):
+        return None
+    payload = line[5:].strip()
+    if not payload or payload == "[DONE]":
+        return None
+    try:
+        chunk = json.loads(payload)
+    except json.JSONDecodeError:
+        return None
+    if chunk.get("error"):
+        err = chunk["error"]
+        raise RuntimeError(err.get("message") if isinstance(err, dict) else str(err))
+    choices = chunk.get("choices") or []
+    if not choices:
+        return None
+    return (choices[0].get("delta") or {}).get("content") or None
+
+
+async def stream_openrouter(
+    api_key: str, model: str, messages: list[dict], max_tokens: int, **extra,
+) -> AsyncIterator[str]:
+    """Yield content deltas from a streaming OpenRouter completion."""
+    async with pooled_session() as session:
+        async with session.post(
+            OPENROUTER_URL,
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            json={"model": model, "messages": messages, "max_tokens": max_tokens, "stream": True, **extra},
+            timeout=STREAM_TIMEOUT,
+        ) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"OpenRouter {resp.status}: {(await resp.text())[:300]}")
+            async for raw in resp.content:
+                delta = parse_sse_line(raw.decode("utf-8", errors="replace").strip())
+                if delta:
+                    yield delta
+
+
+def wants_stream(request: web.Request, body: dict) -> bool:
+    return bool(body.get("stream")) or "text/event-stream" in request.headers.get("Accept", "")
+
+
+async def stream_chat_sse(
+    request: web.Request,
+    api_key: str,
+    model: str,
+    messages: list[dict],
+    max_tokens: int,
+    done_extra: dict | None = None,
+    on_complete: Callable[[str], Awaitable[dict | None]] | None = None,
+    **extra,
+) -> web.StreamResponse:
+    """Proxy a streaming completion to the client; `on_complete` may add fields to `done`."""
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream; charset=utf-8",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # nginx: flush every event
+    })
+    await response.prepare(request)
+
+    async def send(event: str, data: dict) -> None:
+        transport = request.transport
+        if transport is None or transport.is_closing():
+            raise ClientGone()
+        try:
+            await response.write(sse_event(event, data))
+        except ConnectionResetError as e:
+            raise ClientGone() from e
+
+    parts: list[str] = []
+    try:
+        # aclosing: leaving the loop early closes the upstream connection right away.
+        async with contextlib.aclosing(stream_openrouter(api_key, model, messages, max_tokens, **extra)) as deltas:
+            async for delta in deltas:
+                parts.append(delta)
+                await send("delta", {"text": delta})
+        answer = "".join(parts).strip()
+        done = {"answer": answer, **(done_extra or {})}
+        if on_complete and answer:
+            done.update(await on_complete(answer) or {})
+        await send("done", done)
+    except ClientGone:
+        logger.info("SSE client disconnected after %d chunks, upstream closed", len(parts))
+        return response
+    except Exception as e:  # noqa: BLE001
+        logger.error(f"Streaming chat error ({model}): {e}")
+        try:
+            await send("error", {"error": "Произошла ошибка при обработке запроса."})
+        except ClientGone:
+            return response
+    await response.write_eof()
+    return response
@@ -74,7 +74,8 @@ async def auth_middleware(request, handler):
                 token_idx = 3 if path.startswith('/api/') else 2
                 if len(parts) > token_idx:
                     meeting_token = parts[token_idx]
-                    meeting = await db.get_meeting_by_public_token(meeting_token)
+                    meeting = await db.get_meeting_meta_by_token(meeting_token)
+                    request['meeting_meta'] = meeting
                     if not meeting or not meeting.get('is_public'):
                         if path.startswith('/api/'):
                             return web.json_response({'error': 'access denied'}, status=403)
@@ -84,7 +85,8 @@ async def auth_middleware(request, handler):
         token_idx = 3 if path.startswith('/api/') else 2
         if len(parts) > token_idx:
             meeting_token = parts[token_idx]
-            meeting = await db.get_meeting_by_public_token(meeting_token)
+            meeting = await db.get_meeting_meta_by_token(meeting_token)
+            request['meeting_meta'] = meeting
             if meeting and meeting.get('is_public'):
                 return await handler(request)
         if path.startswith('/api/'):
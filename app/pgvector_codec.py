@@ -0,0 +1,55 @@
+"""Binary asyncpg codec for the pgvector `vector` type.
+
+No new dependencies — struct only. Mirrors pgvector's wire format:
+int16 dim, int16 unused (0), then `dim` big-endian float4.
+
+Usage:
+
+    from app.pgvector_codec import register_vector_codec
+
+    pool = await asyncpg.create_pool(dsn, init=register_vector_codec)
+    await conn.execute("INSERT ... VALUES ($1)", [0.1, 0.2, ...])   # list[float] in
+    await conn.copy_records_to_table("t", records=rows)             # binary COPY works too
+
+With the codec registered, vector parameters and results are plain
+list[float]; nothing is formatted as a decimal string.
+"""
+from __future__ import annotations
+
+import logging
+import struct
+from typing import Sequence
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">HH")
+
+
+def encode_vector(values: Sequence[float]) -> bytes:
+    dim = len(values)
+    return _HEADER.pack(dim, 0) + struct.pack(f">{dim}f", *values)
+
+
+def decode_vector(data: bytes) -> list[float]:
+    dim, _ = _HEADER.unpack_from(data)
+    return list(struct.unpack_from(f">{dim}f", data, _HEADER.size))
+
+
+async def register_vector_codec(conn) -> bool:
+    """Register the codec on one connection (use as asyncpg `init=`).
+    Returns False, without raising, when the pgvector extension isn't installed."""
+    try:
+        await conn.set_type_codec(
+            "vector",
+            schema="public",
+            encoder=encode_vector,
+            decoder=decode_vector,
+            format="binary",
+        )
+        return True
+    except ValueError:
+        # "unknown type: public.vector" — extension not created (yet)
+        return False
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Failed to register pgvector codec: %s", e)
+        return False
@@ -14,6 +14,11 @@ import json
 import logging
 import re
 
+try:
+    from app.http_client import pooled_session  # webapp context
+except ImportError:  # pragma: no cover
+    from http_client import pooled_session  # bot context
+
 logger = logging.getLogger(__name__)
 
 _DESIGN_RE = re.compile(r'дизайн|ux|ui|wireframe|вайрфрейм|макет', re.IGNORECASE)
@@ -29,8 +34,9 @@ _DEFAULT_PERSPECTIVES = [
 
 
 class ProposalCalculator:
-    def __init__(self, openrouter_api_key: str):
+    def __init__(self, openrouter_api_key: str, llm_cache=None):
         self.api_key = openrouter_api_key
+        self.llm_cache = llm_cache
         self.model = "anthropic/claude-opus-4-5"
         self.base_url = "https://openrouter.ai/api/v1"
 
@@ -43,13 +49,14 @@ class ProposalCalculator:
         design_type: str,
         hourly_rate: float,
         currency: str,
+        regenerate: bool = False,
     ) -> dict:
         prompt = self._build_prompt(
             project_description, proposal_type, budget_constraint,
             budget_currency, design_type, hourly_rate, currency,
         )
 
-        result = await self._call_api(prompt)
+        result = await self._call_api(prompt, regenerate)
         if result is None:
             return self._error_result("AI API call failed")
 
@@ -439,7 +446,21 @@ FINAL CHECKLIST (verify before responding):
     # API call & parsing
     # ------------------------------------------------------------------
 
-    async def _call_api(self, prompt: str) -> str | None:
+    async def _call_api(self, prompt: str, regenerate: bool = False) -> str | None:
+        if self.llm_cache is None:
+            return await self._post(prompt)
+
+        async def _call() -> str | None:
+            raw = await self._post(prompt)
+            # Unparseable answers are not cached, so the next attempt asks again.
+            return raw if raw is not None and self._parse_response(raw) is not None else None
+
+        return await self.llm_cache.get_or_call(
+            self.model, [{"role": "user", "content": prompt}],
+            {"temperature": 0.1, "max_tokens": 16000}, _call, bypass=regenerate,
+        )
+
+    async def _post(self, prompt: str) -> str | None:
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -453,7 +474,7 @@ FINAL CHECKLIST (verify before responding):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     f"{self.base_url}/chat/completions",
                     json=payload,
@@ -0,0 +1,139 @@
+"""Render Kimai PDF reports in a process pool, caching finished files.
+
+No new dependencies — concurrent.futures + reportlab (imported by the workers only).
+
+Usage:
+
+    from app.report_service import ReportService
+
+    reports = ReportService()
+    pdf = await reports.render(
+        "team", teams=..., projects_map=..., report_by_team=...,
+        begin_label="01.02.2026", end_label="15.02.2026",
+    )
+    reports.stats()
+    reports.close()
+
+Report types: "team" (report_generator.generate_team_report_excel, which
+despite its name builds a PDF) and "client"
+(client_report_generator.generate_client_report_pdf).
+
+Rendering runs in REPORT_WORKERS spawned processes, one report per process
+at a time. Only the workers import the generator modules, and those register
+their fonts at import time. So reportlab and font loading cost nothing in the
+calling process, and happen once per worker rather than per report. A render
+taking longer than REPORT_TIMEOUT seconds raises TimeoutError and only its own
+process is killed; reports queued or running beside it are unaffected.
+Finished PDFs are kept in memory keyed by (report type, sha256 of all keyword
+arguments). The data is part of the key, so a repeated request for the same
+period is served instantly while the source data is unchanged, and
+re-rendered once it changes. Identical requests already in flight share one
+render.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib
+import json
+import logging
+import os
+import time
+
+try:
+    from app.concurrency import IsolatedProcessPool  # webapp context
+    from app.ttl_cache import TTLCache
+except ImportError:  # pragma: no cover
+    from concurrency import IsolatedProcessPool  # bot context
+    from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS") or 1)
+REPORT_TIMEOUT = int(os.getenv("REPORT_TIMEOUT") or 120)
+REPORT_CACHE_TTL = 6 * 3600
+
+# report type -> (module, function), resolved inside the worker
+_RENDERERS = {
+    "team": ("report_generator", "generate_team_report_excel"),
+    "client": ("client_report_generator", "generate_client_report_pdf"),
+}
+
+
+def _render_in_worker(kind: str, kwargs: dict) -> bytes:
+    """Runs inside a pool worker."""
+    module_name, func_name = _RENDERERS[kind]
+    try:
+        module = importlib.import_module(f"app.{module_name}")  # webapp context
+    except ImportError:  # pragma: no cover
+        module = importlib.import_module(module_name)  # bot context
+    return getattr(module, func_name)(**kwargs)
+
+
+def report_fingerprint(kind: str, kwargs: dict) -> str | None:
+    """Cache key for a report, or None if the arguments cannot be serialised stably."""
+    try:
+        blob = json.dumps([kind, kwargs], sort_keys=True, ensure_ascii=False, default=str)
+    except TypeError:  # e.g. mixed int/str dict keys
+        return None
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ReportService:
+    def __init__(self, workers: int = REPORT_WORKERS, timeout: float = REPORT_TIMEOUT, cache_size: int = 32):
+        self.timeout = timeout
+        self.cache = TTLCache(maxsize=cache_size, ttl=REPORT_CACHE_TTL)
+        self.pool = IsolatedProcessPool(workers)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.rendered = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    async def render(self, kind: str, **kwargs) -> bytes:
+        if kind not in _RENDERERS:
+            raise ValueError(f"unknown report type {kind!r}")
+        key = report_fingerprint(kind, kwargs)
+        if key is None:
+            return await self._render(kind, kwargs)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared += 1
+            return await asyncio.shield(inflight)
+
+        fut = asyncio.ensure_future(self._render_and_cache(key, kind, kwargs))
+        self._inflight[key] = fut
+        fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded: the bot user giving up does not throw away a finished render.
+        return await asyncio.shield(fut)
+
+    def stats(self) -> dict:
+        return {
+            'rendered': self.rendered,
+            'shared': self.shared,
+            'timeouts': self.timeouts,
+            'pool': self.pool.stats(),
+            'cache': self.cache.stats(),
+        }
+
+    def close(self) -> None:
+        self.pool.close()
+
+    async def _render_and_cache(self, key: str, kind: str, kwargs: dict) -> bytes:
+        pdf = await self._render(kind, kwargs)
+        self.cache.set(key, pdf)
+        return pdf
+
+    async def _render(self, kind: str, kwargs: dict) -> bytes:
+        started = time.monotonic()
+        try:
+            pdf = await self.pool.run(self.timeout, _render_in_worker, kind, kwargs)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"{kind} report took longer than {self.timeout}s") from None
+        self.rendered += 1
+        logger.info("Rendered %s report (%d bytes) in %.1fs", kind, len(pdf), time.monotonic() - started)
+        return pdf
@@ -70,6 +70,9 @@ async def auth_callback(request):
 
 @routes.get('/auth/logout')
 async def auth_logout(request):
+    token = request.cookies.get('session_token')
+    if token:
+        await request.app['db'].delete_web_session(token)
     resp = web.HTTPFound('/login')
     resp.del_cookie('session_token', path='/')
     return resp
@@ -1,16 +1,137 @@
 """S3-compatible storage client for TWC Storage."""
+import asyncio
 import io
 import logging
 import os
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
+S3_PRESIGN_TTL = int(os.getenv("S3_PRESIGN_TTL") or 900)
+
+
+class S3MultipartWriter:
+    """Async sink that streams bytes into an S3 multipart upload.
+
+    Incoming data is buffered until a part is full, then the part is sent via
+    the default executor (boto3 is synchronous). Up to `max_in_flight` parts
+    upload concurrently; `write` waits for a free slot, so memory stays around
+    part_size * (max_in_flight + 1) regardless of the object size.
+
+    Usage:
+
+        writer = s3_client.open_video_upload(meeting_id, "mp4")
+        await writer.start()
+        try:
+            async for chunk in source:
+                await writer.write(chunk)
+            url = await writer.complete()
+        except BaseException:
+            await writer.abort()
+            raise
+    """
+
+    PART_SIZE = 5 * 1024 * 1024  # S3 minimum for every part except the last
+    MAX_IN_FLIGHT = 3
+
+    def __init__(self, s3: "S3Client", key: str, content_type: str, label: str = "object",
+                 part_size: int = PART_SIZE, max_in_flight: int = MAX_IN_FLIGHT):
+        self._s3 = s3
+        self.key = key
+        self.content_type = content_type
+        self.label = label
+        self.part_size = max(part_size, self.PART_SIZE)
+        self.bytes_written = 0
+        self._upload_id: str | None = None
+        self._buffer = bytearray()
+        self._parts: list[dict] = []
+        self._tasks: list[asyncio.Future] = []
+        self._slots = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def _run(self, fn):
+        return await asyncio.get_event_loop().run_in_executor(None, fn)
+
+    async def start(self):
+        client = self._s3._get_client()
+        resp = await self._run(lambda: client.create_multipart_upload(
+            Bucket=self._s3.bucket, Key=self.key,
+            ContentType=self.content_type, ACL="public-read",
+        ))
+        self._upload_id = resp["UploadId"]
+
+    async def write(self, data: bytes):
+        self._buffer.extend(data)
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[:self.part_size])
+            del self._buffer[:self.part_size]
+            await self._send_part(part)
+
+    async def _send_part(self, body: bytes):
+        await self._slots.acquire()
+        part_number = len(self._tasks) + 1
+        client = self._s3._get_client()
+
+        def _upload():
+            resp = client.upload_part(
+                Bucket=self._s3.bucket, Key=self.key, UploadId=self._upload_id,
+                PartNumber=part_number, Body=body,
+            )
+            return {"PartNumber": part_number, "ETag": resp["ETag"]}
+
+        task = asyncio.ensure_future(self._run(_upload))
+        task.add_done_callback(lambda _: self._slots.release())
+        self._tasks.append(task)
+        # Surface a failed part early instead of after the whole body is read
+        for t in self._tasks:
+            if t.done() and not t.cancelled() and t.exception():
+                raise t.exception()
+
+    async def complete(self) -> str:
+        """Flush the tail part, wait for every part and finish the upload. Returns the public URL."""
+        if self._buffer or not self._tasks:
+            tail = bytes(self._buffer)
+            self._buffer.clear()
+            await self._send_part(tail)
+        self._parts = list(await asyncio.gather(*self._tasks))
+        client = self._s3._get_client()
+        await self._run(lambda: client.complete_multipart_upload(
+            Bucket=self._s3.bucket, Key=self.key, UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts},
+        ))
+        url = f"{self._s3.endpoint}/{self._s3.bucket}/{self.key}"
+        logger.info(f"S3 multipart {self.label} upload complete — {self.bytes_written} bytes, "
+                    f"{len(self._parts)} part(s) -> {url}")
+        return url
+
+    async def abort(self):
+        """Cancel the multipart upload so S3 drops the already-uploaded parts."""
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if not self._upload_id:
+            return
+        client = self._s3._get_client()
+        try:
+            await self._run(lambda: client.abort_multipart_upload(
+                Bucket=self._s3.bucket, Key=self.key, UploadId=self._upload_id,
+            ))
+            logger.info(f"S3 multipart {self.label} upload aborted: {self.key}")
+        except Exception as e:
+            logger.warning(f"S3 multipart abort failed for {self.key}: {e}")
+
 
 class S3Client:
+    # Multipart settings for file uploads: parts are read from disk one at a
+    # time, so memory stays at roughly chunksize * max_concurrency.
+    _TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=16 * 1024 * 1024,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=4,
+    )
+
     def __init__(self):
         self.endpoint = os.getenv("S3_ENDPOINT", "https://s3.twcstorage.ru")
         self.bucket = os.getenv("S3_BUCKET", "runneurosoft")
@@ -54,6 +175,47 @@ class S3Client:
             logger.error(f"Meeting {meeting_id}: unexpected S3 error: {e}")
             return None
 
+    def upload_video_file(self, meeting_id: int | str, path: str, fmt: str = "mp4") -> str | None:
+        """Stream a video file from disk to S3 (multipart for large files) and return the public URL."""
+        key = f"meetings/{meeting_id}/video.{fmt}"
+        content_type = "video/mp4" if fmt == "mp4" else f"video/{fmt}"
+        return self._upload_file(meeting_id, path, key, content_type, "video")
+
+    def download_video_file(self, meeting_id: int | str, path: str, fmt: str = "mp4") -> bool:
+        """Download meetings/{id}/video.{fmt} to `path` (ranged multipart GETs). Returns success."""
+        key = f"meetings/{meeting_id}/video.{fmt}"
+        try:
+            self._get_client().download_file(self.bucket, key, path, Config=self._TRANSFER_CONFIG)
+            logger.info(f"Meeting {meeting_id}: video downloaded from S3 — {os.path.getsize(path)} bytes")
+            return True
+        except Exception as e:
+            logger.error(f"Meeting {meeting_id}: S3 video download error: {e}")
+            return False
+
+    def open_video_upload(self, meeting_id: int | str, fmt: str = "mp4") -> S3MultipartWriter:
+        """Multipart writer for meetings/{id}/video.{fmt} — for streaming request bodies."""
+        key = f"meetings/{meeting_id}/video.{fmt}"
+        content_type = "video/mp4" if fmt == "mp4" else f"video/{fmt}"
+        return S3MultipartWriter(self, key, content_type, label=f"meeting {meeting_id} video")
+
+    def _upload_file(self, meeting_id: int | str, path: str, key: str, content_type: str, label: str) -> str | None:
+        try:
+            client = self._get_client()
+            client.upload_file(
+                path, self.bucket, key,
+                ExtraArgs={"ContentType": content_type, "ACL": "public-read"},
+                Config=self._TRANSFER_CONFIG,
+            )
+            url = f"{self.endpoint}/{self.bucket}/{key}"
+            logger.info(f"Meeting {meeting_id}: {label} uploaded to S3 — {os.path.getsize(path)} bytes -> {url}")
+            return url
+        except ClientError as e:
+            logger.error(f"Meeting {meeting_id}: S3 {label} upload error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Meeting {meeting_id}: unexpected S3 {label} error: {e}")
+            return None
+
     def delete_video(self, meeting_id: int | str, fmt: str = "mp4") -> bool:
         """Delete video from S3."""
         key = f"meetings/{meeting_id}/video.{fmt}"
@@ -97,6 +259,12 @@ class S3Client:
             logger.error(f"Meeting {meeting_id}: unexpected S3 audio error: {e}")
             return None
 
+    def upload_audio_file(self, meeting_id: int | str, path: str, fmt: str = "m4a") -> str | None:
+        """Stream an audio file from disk to S3 and return the public URL."""
+        key = f"meetings/{meeting_id}/audio.{fmt}"
+        content_type = self._AUDIO_CONTENT_TYPES.get(fmt, f"audio/{fmt}")
+        return self._upload_file(meeting_id, path, key, content_type, "audio")
+
     def delete_audio(self, meeting_id: int | str, fmt: str = "m4a") -> bool:
         """Delete audio from S3."""
         key = f"meetings/{meeting_id}/audio.{fmt}"
@@ -204,6 +372,41 @@ class S3Client:
             logger.error(f"S3 document delete error ({s3_key}): {e}")
             return False
 
+    def key_from_url(self, url: str) -> str | None:
+        """Object key for a URL returned by the upload methods; None if it is not in our bucket."""
+        prefix = f"{self.endpoint}/{self.bucket}/"
+        if not url or not url.startswith(prefix):
+            return None
+        return url[len(prefix):].split("?", 1)[0] or None
+
+    def presigned_get_url(self, key: str, expires: int = S3_PRESIGN_TTL) -> str:
+        """Short-lived signed GET URL for `key` (signing is local, no request to S3)."""
+        return self._get_client().generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": key}, ExpiresIn=expires,
+        )
+
+    def signed_url(self, url: str, expires: int = S3_PRESIGN_TTL) -> str:
+        """Presigned version of a stored public URL; other URLs are returned unchanged."""
+        key = self.key_from_url(url)
+        if key is None:
+            return url
+        try:
+            return self.presigned_get_url(key, expires)
+        except Exception as e:
+            logger.warning(f"S3 presign failed for {key}: {e}")
+            return url
+
+    def object_etag(self, url: str) -> str | None:
+        """ETag of the object behind a stored URL (HEAD request); None if missing or not ours."""
+        key = self.key_from_url(url)
+        if key is None:
+            return None
+        try:
+            return self._get_client().head_object(Bucket=self.bucket, Key=key).get("ETag", "").strip('"') or None
+        except Exception as e:
+            logger.warning(f"S3 head_object failed for {key}: {e}")
+            return None
+
     def check_connection(self) -> bool:
         """Verify S3 connection works."""
         try:
@@ -0,0 +1,181 @@
+"""Meeting media from S3: Range-aware streaming proxy and an on-disk LRU audio cache.
+
+No new dependencies — aiohttp + the pooled client session; presigned URLs
+come from S3Client.
+
+Usage:
+
+    from app.s3_media import MediaCache, stream_media
+
+    # Playback: forwards Range/If-Range, relays 200/206/416 chunk by chunk.
+    return await stream_media(request, s3_client.signed_url(meeting["video_s3_url"]))
+
+    # Reprocessing: the object lands on disk once, later runs hard-link it.
+    media_cache = MediaCache()
+    size = await media_cache.fetch(url, dest_path, download=lambda p: download_to(url, p))
+
+The proxy never buffers more than one chunk, so seeking in a two-hour video
+costs one small ranged GET upstream. The cache keeps recently used files in
+MEDIA_CACHE_DIR up to MEDIA_CACHE_MAX_MB (least recently used evicted first);
+callers get a hard link (or a copy across filesystems), so eviction never
+pulls a file out from under a running job. MEDIA_CACHE_MAX_MB=0 disables it.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from typing import Awaitable, Callable
+
+import aiohttp
+from aiohttp import web
+
+try:
+    from app.http_client import pooled_session  # webapp context
+except ImportError:  # pragma: no cover
+    from http_client import pooled_session  # bot context
+
+logger = logging.getLogger(__name__)
+
+MEDIA_CACHE_DIR = os.getenv("MEDIA_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "media_cache")
+MEDIA_CACHE_MAX_MB = int(os.getenv("MEDIA_CACHE_MAX_MB") or 2048)
+STREAM_CHUNK_BYTES = 256 * 1024
+# Connect quickly, but let a paused player hold the connection open.
+PROXY_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=15, sock_read=300)
+
+_FORWARD_REQUEST_HEADERS = ("Range", "If-Range", "If-None-Match", "If-Modified-Since")
+_FORWARD_RESPONSE_HEADERS = (
+    "Content-Type", "Content-Length", "Content-Range", "Accept-Ranges", "ETag", "Last-Modified",
+)
+
+
+async def stream_media(request: web.Request, url: str) -> web.StreamResponse:
+    """Proxy a GET/HEAD (including Range requests) for `url` without buffering the body."""
+    headers = {h: request.headers[h] for h in _FORWARD_REQUEST_HEADERS if h in request.headers}
+    async with pooled_session() as session:
+        async with session.request(
+            request.method, url, headers=headers, timeout=PROXY_TIMEOUT, auto_decompress=False,
+        ) as upstream:
+            if upstream.status not in (200, 206, 304, 416):
+                logger.warning("Media upstream returned %s for %s", upstream.status, url.split("?", 1)[0])
+                return web.Response(status=502 if upstream.status >= 500 else 404)
+
+            response = web.StreamResponse(status=upstream.status)
+            for h in _FORWARD_RESPONSE_HEADERS:
+                if h in upstream.headers:
+                    response.headers[h] = upstream.headers[h]
+            response.headers.setdefault("Accept-Ranges", "bytes")
+            response.headers["Cache-Control"] = "private, max-age=3600"
+            await response.prepare(request)
+            if request.method == "HEAD" or upstream.status in (304, 416):
+                await response.write_eof()
+                return response
+            try:
+                async for chunk in upstream.content.iter_chunked(STREAM_CHUNK_BYTES):
+                    await response.write(chunk)
+            except ConnectionResetError:  # also aiohttp's ClientConnectionResetError
+                # The player seeked or closed the tab; leaving the block drops the upstream read.
+                # Cancellation is not caught: it propagates and the `async with` closes upstream.
+                return response
+            await response.write_eof()
+            return response
+
+
+class MediaCache:
+    def __init__(self, directory: str = MEDIA_CACHE_DIR, max_bytes: int = MEDIA_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    async def fetch(self, key: str, dest_path: str, download: Callable[[str], Awaitable[int]]) -> int:
+        """Place the object for `key` at `dest_path`; `download(path)` writes it and returns its size.
+
+        Returns the size in bytes, 0 when the download produced nothing.
+        """
+        if not self.enabled:
+            return await download(dest_path)
+
+        cached = self._path(key)
+        if os.path.exists(cached):
+            self.hits += 1
+            os.utime(cached)  # mark as recently used
+            return self._place(cached, dest_path)
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            self.misses += 1
+            inflight = asyncio.ensure_future(self._download(cached, download))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        size = await asyncio.shield(inflight)
+        return self._place(cached, dest_path) if size else 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'bytes': sum(size for _, size, _ in self._entries()) if self.enabled else 0,
+        }
+
+    async def _download(self, cached: str, download: Callable[[str], Awaitable[int]]) -> int:
+        os.makedirs(self.directory, exist_ok=True)
+        part = f"{cached}.part"
+        try:
+            size = await download(part)
+            if size:
+                os.replace(part, cached)
+                self._evict(keep=cached)
+            return size
+        finally:
+            if os.path.exists(part):
+                os.unlink(part)
+
+    @staticmethod
+    def _place(cached: str, dest_path: str) -> int:
+        try:
+            os.link(cached, dest_path)
+        except OSError:
+            shutil.copyfile(cached, dest_path)
+        return os.path.getsize(dest_path)
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for e in it:
+                    if e.is_file() and not e.name.endswith(".part"):
+                        st = e.stat()
+                        entries.append((st.st_mtime, st.st_size, e.path))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _evict(self, keep: str) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+                total -= size
+                logger.info("Media cache: evicted %s (%d bytes)", os.path.basename(path), size)
+            except OSError:
+                pass
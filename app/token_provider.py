@@ -0,0 +1,97 @@
+"""Single-flight OAuth token cache with refresh-ahead, shared by API clients.
+
+No new dependencies — pure asyncio.
+
+Usage:
+
+    from app.token_provider import TokenProvider
+
+    async def fetch() -> tuple[str, float]:
+        ...                                  # POST to the token endpoint
+        return data["access_token"], data["expires_in"]
+
+    tokens = TokenProvider(fetch, name="Zoom")
+    token = await tokens.get()
+    tokens.invalidate(token)                 # e.g. after a 401 with that token
+
+At most one token request is in flight per provider: concurrent callers of an
+expired token await the same fetch. Once a token is within `refresh_ahead`
+seconds of expiry it is renewed in the background (on a timer and on access),
+so callers keep getting the still-valid token instead of blocking.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Never hand out a token this close to expiry.
+EXPIRY_MARGIN = 60.0
+REFRESH_AHEAD = 300.0
+
+
+class TokenProvider:
+    def __init__(self, fetch: Callable[[], Awaitable[tuple[str, float]]], name: str = "token",
+                 refresh_ahead: float = REFRESH_AHEAD):
+        self._fetch = fetch
+        self.name = name
+        self.refresh_ahead = refresh_ahead
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._inflight: asyncio.Future | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self.fetches = 0
+        self.failures = 0
+
+    async def get(self) -> str:
+        now = time.time()
+        if self._token and now < self._expires_at - EXPIRY_MARGIN:
+            if now >= self._expires_at - self.refresh_ahead:
+                self._refresh()  # background; this caller keeps the current token
+            return self._token
+        return await asyncio.shield(self._refresh())
+
+    def invalidate(self, token: str | None = None) -> None:
+        """Forget the cached token (only if it is still `token`, when given)."""
+        if token is None or token == self._token:
+            self._token = None
+            self._expires_at = 0.0
+
+    def stats(self) -> dict:
+        return {
+            'fetches': self.fetches,
+            'failures': self.failures,
+            'expires_in': round(self._expires_at - time.time()) if self._token else None,
+        }
+
+    def _refresh(self) -> asyncio.Future:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._do_fetch())
+            self._inflight.add_done_callback(self._consume_error)
+        return self._inflight
+
+    async def _do_fetch(self) -> str:
+        self.fetches += 1
+        try:
+            token, expires_in = await self._fetch()
+        except Exception:
+            self.failures += 1
+            raise
+        self._token = token
+        self._expires_at = time.time() + expires_in
+        self._schedule_refresh(expires_in)
+        return token
+
+    def _schedule_refresh(self, expires_in: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = max(expires_in - self.refresh_ahead, EXPIRY_MARGIN)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._refresh)
+
+    def _consume_error(self, fut: asyncio.Future) -> None:
+        # Background refreshes have no awaiter; log instead of "exception never retrieved".
+        if not fut.cancelled() and fut.exception() is not None:
+            logger.warning("%s token refresh failed: %s", self.name, fut.exception())
@@ -0,0 +1,105 @@
+"""Write-behind buffer for the bot's per-update user upserts.
+
+No new dependencies — asyncio + TTLCache.
+
+Usage:
+
+    from app.user_upserts import UserUpsertBuffer
+
+    users = UserUpsertBuffer(db)
+    users.start()                       # in post_init (needs the running loop)
+    users.add(user.id, user.first_name, user.last_name, user.username, user.language_code)
+    await users.close()                 # in post_shutdown: final flush
+
+`add` only records the profile in memory, keyed by telegram_id, so a user
+tapping through a survey collapses into one pending row. Every
+USER_FLUSH_INTERVAL_MS the pending rows are written with one multi-row
+upsert. A profile already written unchanged within USER_REFRESH_SECONDS is
+not queued again, so most updates cost no DB write at all (`last_interaction`
+is then at most that stale). A failed flush keeps its rows for the next one.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+
+try:
+    from app.ttl_cache import TTLCache  # webapp context
+except ImportError:  # pragma: no cover
+    from ttl_cache import TTLCache  # bot context
+
+logger = logging.getLogger(__name__)
+
+USER_FLUSH_INTERVAL_MS = int(os.getenv("USER_FLUSH_INTERVAL_MS") or 500)
+USER_REFRESH_SECONDS = int(os.getenv("USER_REFRESH_SECONDS") or 300)
+
+
+class UserUpsertBuffer:
+    def __init__(self, db, interval_ms: int = USER_FLUSH_INTERVAL_MS,
+                 refresh_seconds: int = USER_REFRESH_SECONDS, max_tracked: int = 50_000):
+        self.db = db
+        self.interval = interval_ms / 1000
+        self._pending: dict[int, tuple] = {}
+        self._written = TTLCache(maxsize=max_tracked, ttl=refresh_seconds)
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self.updates = 0
+        self.skipped = 0
+        self.rows_written = 0
+        self.flushes = 0
+
+    def add(self, telegram_id: int, first_name: str | None, last_name: str | None,
+            username: str | None, language_code: str | None = None) -> None:
+        self.updates += 1
+        row = (telegram_id, first_name, last_name, username, language_code)
+        if telegram_id not in self._pending and self._written.get(telegram_id) == row:
+            self.skipped += 1
+            return
+        self._pending[telegram_id] = row
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self) -> None:
+        # Not cancel(): a flush already in progress must finish, not lose its batch.
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        rows = list(batch.values())
+        try:
+            await self.db.save_users_batch(rows)
+        except Exception as e:  # noqa: BLE001
+            logger.error("Failed to flush %d user upserts: %s", len(rows), e)
+            # Newer updates that arrived meanwhile win over the failed batch.
+            self._pending = {**batch, **self._pending}
+            return 0
+        for row in rows:
+            self._written.set(row[0], row)
+        self.rows_written += len(rows)
+        self.flushes += 1
+        return len(rows)
+
+    def stats(self) -> dict:
+        return {
+            'updates': self.updates,
+            'skipped': self.skipped,
+            'rows_written': self.rows_written,
+            'flushes': self.flushes,
+            'pending': len(self._pending),
+        }
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                await self.flush()
@@ -0,0 +1,161 @@
+"""Local faster-whisper transcription on a dedicated worker pool, loading the model lazily.
+
+No new dependencies — concurrent.futures + faster-whisper (imported on first use).
+
+Usage:
+
+    from app.whisper_pool import WhisperPool
+
+    whisper = WhisperPool()                   # cheap: no model, no workers yet
+    whisper.warm_up()                         # optional (WHISPER_WARMUP=1 in the bot), in the background
+    text = await whisper.transcribe(path)     # "" when nothing was recognised
+    whisper.stats()
+    whisper.close()
+
+WHISPER_POOL=thread (default) keeps one model in the bot process and lets
+CTranslate2 run up to WHISPER_WORKERS transcriptions on it in parallel.
+WHISPER_POOL=process starts WHISPER_WORKERS spawned processes, each loading
+its own model on first use. Memory is higher, but decoding never competes
+with the bot's event loop for the GIL. Either way the pool is separate from
+the default executor.
+
+Requests beyond WHISPER_WORKERS wait in FIFO order. The whole transcription
+runs in the worker, including iterating faster-whisper's lazy segments
+generator, which is where decoding actually happens.
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+
+try:
+    from app.concurrency import spawn_process_pool  # webapp context
+except ImportError:  # pragma: no cover
+    from concurrency import spawn_process_pool  # bot context
+
+logger = logging.getLogger(__name__)
+
+WHISPER_MODEL = os.getenv("WHISPER_MODEL") or "base"
+WHISPER_POOL = (os.getenv("WHISPER_POOL") or "thread").lower()
+WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS") or 1)
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS") or 0)  # 0: CTranslate2 default
+WHISPER_WARMUP = os.getenv("WHISPER_WARMUP", "0").lower() in ("1", "true", "yes")
+
+# Per process: the bot process in thread mode, each worker in process mode.
+_model = None
+_model_lock = threading.Lock()
+
+
+def _load_model(model_size: str, num_workers: int, cpu_threads: int):
+    global _model
+    with _model_lock:
+        if _model is None:
+            from faster_whisper import WhisperModel
+            started = time.monotonic()
+            _model = WhisperModel(model_size, device="cpu", compute_type="int8",
+                                  cpu_threads=cpu_threads, num_workers=num_workers)
+            logger.info("Whisper model '%s' loaded in %.1fs (pid %d)",
+                        model_size, time.monotonic() - started, os.getpid())
+        return _model
+
+
+def _transcribe_file(path: str, language: str, model_size: str, num_workers: int, cpu_threads: int) -> str:
+    model = _load_model(model_size, num_workers, cpu_threads)
+    segments, _ = model.transcribe(
+        path,
+        language=language,
+        beam_size=5,
+        vad_filter=True,  # Voice Activity Detection to filter out silence
+        vad_parameters=dict(min_silence_duration_ms=500),
+    )
+    return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+def _warm(model_size: str, num_workers: int, cpu_threads: int) -> None:
+    _load_model(model_size, num_workers, cpu_threads)
+
+
+class WhisperPool:
+    def __init__(self, model_size: str = WHISPER_MODEL, mode: str = WHISPER_POOL,
+                 workers: int = WHISPER_WORKERS, cpu_threads: int = WHISPER_CPU_THREADS):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"WHISPER_POOL must be 'thread' or 'process', got {mode!r}")
+        self.model_size = model_size
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.cpu_threads = cpu_threads
+        self._executor: concurrent.futures.Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+
+    def _model_args(self) -> tuple:
+        # A shared model needs one CTranslate2 worker per concurrent call; a process model only one.
+        return self.model_size, self.workers if self.mode == "thread" else 1, self.cpu_threads
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = spawn_process_pool(self.workers)
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="whisper",
+                )
+            self._slots = asyncio.Semaphore(self.workers)
+            logger.info("Whisper pool started (%s x%d, model '%s')", self.mode, self.workers, self.model_size)
+        return self._executor
+
+    def warm_up(self) -> asyncio.Future:
+        """Load the model in every worker now instead of on the first voice message."""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        return asyncio.gather(*(
+            loop.run_in_executor(executor, _warm, *self._model_args()) for _ in range(self.workers)
+        ), return_exceptions=True)
+
+    async def transcribe(self, path: str, language: str = "ru") -> str:
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.running += 1
+        started = time.monotonic()
+        try:
+            text = await loop.run_in_executor(executor, _transcribe_file, path, language, *self._model_args())
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            self.busy_seconds += time.monotonic() - started
+            self._slots.release()
+        self.completed += 1
+        return text
+
+    def stats(self) -> dict:
+        return {
+            'mode': self.mode,
+            'workers': self.workers,
+            'started': self._executor is not None,
+            'queued': self.queued,
+            'running': self.running,
+            'completed': self.completed,
+            'failed': self.failed,
+            'avg_seconds': round(self.busy_seconds / (self.completed + self.failed), 2)
+            if self.completed + self.failed else None,
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -4,18 +4,54 @@ Zoom Server-to-Server OAuth API Client
 
 import aiohttp
 import base64
-import time
+import os
 import logging
 import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from yarl import URL
 
 try:
     from app.retry import retry_async  # webapp context (server.py imports as `app.zoom_client`)
+    from app.http_client import pooled_session
+    from app.concurrency import RateLimiter
+    from app.token_provider import TokenProvider
 except ImportError:  # pragma: no cover
     from retry import retry_async  # bot context (bot.py imports as `zoom_client`)
+    from http_client import pooled_session
+    from concurrency import RateLimiter
+    from token_provider import TokenProvider
 
 logger = logging.getLogger(__name__)
 
+# Client-side cap on Zoom REST calls per second (Zoom's "Medium" APIs allow 20/s on Pro).
+ZOOM_API_RATE = float(os.getenv("ZOOM_API_RATE") or 10)
+RATE_LIMIT_RETRIES = 4
+# Longer Retry-After (e.g. the daily limit) is not waited out — the call fails instead.
+RATE_LIMIT_MAX_WAIT = 60.0
+
+
+def retry_after_seconds(value: str | None, attempt: int) -> float:
+    """Seconds to wait from a Retry-After header (delta-seconds or a date);
+    exponential fallback when the header is missing or unparsable."""
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                when = None
+        if when is not None:
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    return float(2 ** attempt)
+
 
 class ZoomClient:
     TOKEN_URL = "https://zoom.us/oauth/token"
@@ -25,19 +61,20 @@ class ZoomClient:
         self.account_id = account_id
         self.client_id = client_id
         self.client_secret = client_secret
-        self._token: str | None = None
-        self._token_expires_at: float = 0
+        # Shared by every concurrent caller (startup sync, webhooks, jobs).
+        self.tokens = TokenProvider(self._fetch_access_token, name="Zoom")
+        self.limiter = RateLimiter(ZOOM_API_RATE)
 
     def _basic_auth(self) -> str:
         credentials = f"{self.client_id}:{self.client_secret}"
         return base64.b64encode(credentials.encode()).decode()
 
-    @retry_async(attempts=3, base_delay=1.0)
     async def get_access_token(self) -> str:
-        if self._token and time.time() < self._token_expires_at - 60:
-            return self._token
+        return await self.tokens.get()
 
-        async with aiohttp.ClientSession() as session:
+    @retry_async(attempts=3, base_delay=1.0)
+    async def _fetch_access_token(self) -> tuple[str, float]:
+        async with pooled_session() as session:
             async with session.post(
                 self.TOKEN_URL,
                 headers={
@@ -54,10 +91,8 @@ class ZoomClient:
                     logger.error(f"Zoom token error: {data}")
                     raise Exception(f"Failed to get Zoom token: {data}")
 
-                self._token = data["access_token"]
-                self._token_expires_at = time.time() + data.get("expires_in", 3600)
                 logger.info("Zoom access token obtained successfully")
-                return self._token
+                return data["access_token"], data.get("expires_in", 3600)
 
     async def create_meeting(
         self,
@@ -88,7 +123,7 @@ class ZoomClient:
             body["start_time"] = start_time
             body["timezone"] = "Europe/Moscow"
 
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.post(
                 f"{self.API_BASE}/users/me/meetings",
                 headers={
@@ -120,7 +155,7 @@ class ZoomClient:
             "timezone": "Europe/Moscow",
         }
 
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.patch(
                 f"{self.API_BASE}/meetings/{meeting_id}",
                 headers={
@@ -138,62 +173,73 @@ class ZoomClient:
                 logger.error(f"Zoom update meeting error: {data}")
                 raise Exception(f"Failed to update Zoom meeting: {data}")
 
+    async def _api_get(self, path: str, params: dict | None = None) -> tuple[int, dict | None]:
+        """GET an API path through the shared rate limiter.
+        Returns (status, json); json is None for 404. On 429 every caller is
+        paused for Retry-After and the request is retried; a 401 refreshes the
+        token and retries once."""
+        for attempt in range(1, RATE_LIMIT_RETRIES + 1):
+            await self.limiter.acquire()
+            token = await self.get_access_token()
+            async with pooled_session() as session:
+                async with session.get(
+                    f"{self.API_BASE}{path}",
+                    headers={"Authorization": f"Bearer {token}"},
+                    params=params,
+                ) as resp:
+                    if resp.status == 429 and attempt < RATE_LIMIT_RETRIES:
+                        wait = retry_after_seconds(resp.headers.get("Retry-After"), attempt)
+                        if wait <= RATE_LIMIT_MAX_WAIT:
+                            logger.warning(
+                                "Zoom rate limit (%s) on %s — pausing %.1fs",
+                                resp.headers.get("X-RateLimit-Type", "unknown"), path, wait,
+                            )
+                            self.limiter.pause(wait)
+                            continue
+                    if resp.status == 401 and attempt == 1:
+                        # Revoked or rotated token: fetch a new one once (other callers share it).
+                        self.tokens.invalidate(token)
+                        continue
+                    if resp.status == 404:
+                        return 404, None
+                    return resp.status, await resp.json()
+        raise AssertionError("unreachable")
+
     async def get_meeting_details(self, meeting_id: int | str) -> dict | None:
         """Fetch meeting details (status, duration, etc.)."""
-        token = await self.get_access_token()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.API_BASE}/meetings/{meeting_id}",
-                headers={"Authorization": f"Bearer {token}"},
-            ) as resp:
-                if resp.status == 404:
-                    return None
-                data = await resp.json()
-                if resp.status != 200:
-                    logger.error(f"Zoom meeting details error: {data}")
-                    return None
-                return data
+        status, data = await self._api_get(f"/meetings/{meeting_id}")
+        if status == 404:
+            return None
+        if status != 200:
+            logger.error(f"Zoom meeting details error: {data}")
+            return None
+        return data
 
     async def get_past_meeting(self, meeting_id: int | str) -> dict | None:
         """Fetch past meeting instance details (actual duration, end_time, etc.)."""
-        token = await self.get_access_token()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.API_BASE}/past_meetings/{meeting_id}",
-                headers={"Authorization": f"Bearer {token}"},
-            ) as resp:
-                if resp.status == 404:
-                    return None
-                data = await resp.json()
-                if resp.status != 200:
-                    logger.error(f"Zoom past meeting error: {data}")
-                    return None
-                return data
+        status, data = await self._api_get(f"/past_meetings/{meeting_id}")
+        if status == 404:
+            return None
+        if status != 200:
+            logger.error(f"Zoom past meeting error: {data}")
+            return None
+        return data
 
     async def get_meeting_recordings(self, meeting_id: int | str) -> dict | None:
         """Fetch recording details for a meeting."""
-        token = await self.get_access_token()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.API_BASE}/meetings/{meeting_id}/recordings",
-                headers={"Authorization": f"Bearer {token}"},
-            ) as resp:
-                if resp.status == 404:
-                    return None
-                data = await resp.json()
-                if resp.status != 200:
-                    logger.error(f"Zoom recordings error: {data}")
-                    return None
-                return data
+        status, data = await self._api_get(f"/meetings/{meeting_id}/recordings")
+        if status == 404:
+            return None
+        if status != 200:
+            logger.error(f"Zoom recordings error: {data}")
+            return None
+        return data
 
     async def delete_meeting_recordings(self, meeting_id: int | str) -> bool:
         """Delete all recordings for a meeting."""
         token = await self.get_access_token()
 
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.delete(
                 f"{self.API_BASE}/meetings/{meeting_id}/recordings",
                 headers={"Authorization": f"Bearer {token}"},
@@ -217,7 +263,7 @@ class ZoomClient:
         """
         token = await self.get_access_token()
 
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.delete(
                 f"{self.API_BASE}/meetings/{meeting_id}/recordings",
                 headers={"Authorization": f"Bearer {token}"},
@@ -240,43 +286,30 @@ class ZoomClient:
         with its own UUID and recordings.
         Returns list of dicts with uuid, start_time.
         """
-        token = await self.get_access_token()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.API_BASE}/past_meetings/{meeting_id}/instances",
-                headers={"Authorization": f"Bearer {token}"},
-            ) as resp:
-                if resp.status == 404:
-                    return []
-                data = await resp.json()
-                if resp.status != 200:
-                    logger.error(f"Zoom past meeting instances error: {data}")
-                    return []
-                return data.get("meetings", [])
+        status, data = await self._api_get(f"/past_meetings/{meeting_id}/instances")
+        if status == 404:
+            return []
+        if status != 200:
+            logger.error(f"Zoom past meeting instances error: {data}")
+            return []
+        return data.get("meetings", [])
 
     async def get_meeting_recordings_by_uuid(self, meeting_uuid: str) -> dict | None:
         """Fetch recordings for a specific meeting instance by UUID.
 
         UUID must be double-encoded if it contains '/' or '//' characters.
         """
-        token = await self.get_access_token()
         # Double-encode UUID if it contains / or //
         import urllib.parse
         encoded_uuid = urllib.parse.quote(urllib.parse.quote(meeting_uuid, safe=""), safe="")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.API_BASE}/meetings/{encoded_uuid}/recordings",
-                headers={"Authorization": f"Bearer {token}"},
-            ) as resp:
-                if resp.status == 404:
-                    return None
-                data = await resp.json()
-                if resp.status != 200:
-                    logger.error(f"Zoom recordings by UUID error: {data}")
-                    return None
-                return data
+        status, data = await self._api_get(f"/meetings/{encoded_uuid}/recordings")
+        if status == 404:
+            return None
+        if status != 200:
+            logger.error(f"Zoom recordings by UUID error: {data}")
+            return None
+        return data
 
     async def get_latest_instance_recordings(self, meeting_id: int | str) -> dict | None:
         """Get recordings from the latest (most recent) instance of a meeting.
@@ -311,31 +344,29 @@ class ZoomClient:
 
         Returns list of dicts with name, user_email, join_time, leave_time, duration.
         """
-        token = await self.get_access_token()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.API_BASE}/past_meetings/{meeting_id}/participants",
-                headers={"Authorization": f"Bearer {token}"},
-                params={"page_size": 100},
-            ) as resp:
-                if resp.status == 404:
-                    return []
-                data = await resp.json()
-                if resp.status != 200:
-                    logger.error(f"Zoom past meeting participants error: {data}")
-                    return []
-                return data.get("participants", [])
+        status, data = await self._api_get(
+            f"/past_meetings/{meeting_id}/participants", params={"page_size": 100},
+        )
+        if status == 404:
+            return []
+        if status != 200:
+            logger.error(f"Zoom past meeting participants error: {data}")
+            return []
+        return data.get("participants", [])
 
-    async def _download_zoom_file(self, meeting_id: int | str, download_url: str, label: str) -> bytes | None:
-        """Download a file from Zoom's download URL.
+    async def _stream_zoom_file(self, meeting_id: int | str, download_url: str, label: str,
+                                write) -> int:
+        """Stream a file from Zoom's download URL into `write(chunk)`.
 
         Zoom redirects to a CloudFront CDN signed URL. aiohttp re-encodes the URL
         and breaks the signature, so we get the redirect manually and use
         yarl.URL(encoded=True) to preserve the exact CDN URL.
+
+        Returns the number of bytes written (0 on failure). The body is never
+        held in memory as a whole — callers decide where chunks go.
         """
         token = await self.get_access_token()
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.get(
                 download_url,
                 headers={"Authorization": f"Bearer {token}"},
@@ -345,19 +376,19 @@ class ZoomClient:
                     if resp.status == 200:
                         ct = resp.headers.get("Content-Type", "")
                         if "html" not in ct.lower():
-                            data = await resp.read()
-                            if len(data) > 10000:
-                                logger.info(f"Meeting {meeting_id}: {label} downloaded directly — {len(data)} bytes")
-                                return data
+                            size = await self._copy_body(resp, write)
+                            if size > 10000:
+                                logger.info(f"Meeting {meeting_id}: {label} downloaded directly — {size} bytes")
+                                return size
                         logger.warning(f"Meeting {meeting_id}: {label} got HTML on direct download")
                     else:
                         logger.error(f"Meeting {meeting_id}: {label} download status {resp.status}")
-                    return None
+                    return 0
                 cdn_url = resp.headers.get("Location", "")
 
             if not cdn_url:
                 logger.error(f"Meeting {meeting_id}: {label} redirect with no Location")
-                return None
+                return 0
 
             # Use yarl.URL(encoded=True) to prevent aiohttp from re-encoding
             # the CloudFront signed URL (which breaks the signature)
@@ -368,19 +399,44 @@ class ZoomClient:
                 if cdn_resp.status == 200:
                     ct = cdn_resp.headers.get("Content-Type", "")
                     if "html" not in ct.lower():
-                        data = await cdn_resp.read()
-                        if len(data) > 10000:
-                            logger.info(f"Meeting {meeting_id}: {label} downloaded via CDN — {len(data)} bytes")
-                            return data
+                        size = await self._copy_body(cdn_resp, write)
+                        if size > 10000:
+                            logger.info(f"Meeting {meeting_id}: {label} downloaded via CDN — {size} bytes")
+                            return size
                     logger.warning(f"Meeting {meeting_id}: {label} CDN returned HTML")
                 else:
                     logger.error(f"Meeting {meeting_id}: {label} CDN download failed {cdn_resp.status}")
-        return None
+        return 0
 
-    async def download_meeting_audio(self, meeting_id: int | str, instance_uuid: str | None = None) -> tuple[bytes, str] | None:
-        """Download audio (M4A) or video (MP4) file for a meeting.
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+    @classmethod
+    async def _copy_body(cls, resp: aiohttp.ClientResponse, write) -> int:
+        size = 0
+        async for chunk in resp.content.iter_chunked(cls.DOWNLOAD_CHUNK_SIZE):
+            write(chunk)
+            size += len(chunk)
+        return size
+
+    async def _download_zoom_file(self, meeting_id: int | str, download_url: str, label: str) -> bytes | None:
+        """Download a file from Zoom into memory. Prefer _download_zoom_file_to_path for recordings."""
+        buf = bytearray()
+        size = await self._stream_zoom_file(meeting_id, download_url, label, buf.extend)
+        return bytes(buf) if size else None
+
+    async def _download_zoom_file_to_path(self, meeting_id: int | str, download_url: str, label: str,
+                                          dest_path: str) -> bool:
+        """Stream a file from Zoom straight to `dest_path`. Removes the partial file on failure."""
+        with open(dest_path, "wb") as f:
+            size = await self._stream_zoom_file(meeting_id, download_url, label, f.write)
+        if not size and os.path.exists(dest_path):
+            os.unlink(dest_path)
+        return bool(size)
+
+    async def _find_audio_download(self, meeting_id: int | str,
+                                   instance_uuid: str | None = None) -> tuple[str, str] | None:
+        """Pick the best audio source for a meeting: (download_url, format).
 
-        Returns (file_bytes, format) or None if not available.
         Prefers M4A over MP4 since it's smaller.
         If instance_uuid is provided, fetches from that specific instance.
         Otherwise uses the latest instance if the meeting was restarted.
@@ -394,57 +450,78 @@ class ZoomClient:
             return None
 
         recording_files = recordings.get("recording_files", [])
-        download_url = None
-        fmt = "m4a"
+        for file_type, fmt in (("M4A", "m4a"), ("MP4", "mp4")):
+            for rf in recording_files:
+                if rf.get("file_type") == file_type and rf.get("download_url"):
+                    return rf["download_url"], fmt
+
+        file_types = [rf.get("file_type") for rf in recording_files]
+        logger.info(f"Meeting {meeting_id}: no M4A/MP4 file found, available: {file_types}")
+        return None
+
+    async def _find_video_download(self, meeting_id: int | str) -> str | None:
+        """Return the MP4 download URL of the latest instance, or None."""
+        recordings = await self.get_latest_instance_recordings(meeting_id)
+        if not recordings:
+            logger.info(f"Meeting {meeting_id}: no recordings found for video download")
+            return None
 
+        recording_files = recordings.get("recording_files", [])
         for rf in recording_files:
-            if rf.get("file_type") == "M4A":
-                download_url = rf.get("download_url")
-                fmt = "m4a"
-                break
+            if rf.get("file_type") == "MP4" and rf.get("download_url"):
+                return rf["download_url"]
 
-        if not download_url:
-            for rf in recording_files:
-                if rf.get("file_type") == "MP4":
-                    download_url = rf.get("download_url")
-                    fmt = "mp4"
-                    break
+        file_types = [rf.get("file_type") for rf in recording_files]
+        logger.info(f"Meeting {meeting_id}: no MP4 file found, available: {file_types}")
+        return None
 
-        if not download_url:
-            file_types = [rf.get("file_type") for rf in recording_files]
-            logger.info(f"Meeting {meeting_id}: no M4A/MP4 file found, available: {file_types}")
-            return None
+    async def download_meeting_audio(self, meeting_id: int | str, instance_uuid: str | None = None) -> tuple[bytes, str] | None:
+        """Download audio (M4A) or video (MP4) file for a meeting.
 
+        Returns (file_bytes, format) or None if not available.
+        """
+        found = await self._find_audio_download(meeting_id, instance_uuid)
+        if not found:
+            return None
+        download_url, fmt = found
         data = await self._download_zoom_file(meeting_id, download_url, f"audio ({fmt})")
         return (data, fmt) if data else None
 
+    async def download_meeting_audio_to_file(self, meeting_id: int | str, dest_dir: str,
+                                             instance_uuid: str | None = None) -> tuple[str, str] | None:
+        """Stream meeting audio (M4A, falling back to MP4) into `dest_dir`.
+
+        Returns (file_path, format) or None if not available.
+        """
+        found = await self._find_audio_download(meeting_id, instance_uuid)
+        if not found:
+            return None
+        download_url, fmt = found
+        dest_path = os.path.join(dest_dir, f"zoom_audio.{fmt}")
+        ok = await self._download_zoom_file_to_path(meeting_id, download_url, f"audio ({fmt})", dest_path)
+        return (dest_path, fmt) if ok else None
+
     async def download_meeting_video(self, meeting_id: int | str) -> tuple[bytes, str] | None:
         """Download MP4 video file for a meeting.
 
         Returns (file_bytes, 'mp4') or None if not available.
         Uses the latest instance if the meeting was restarted.
         """
-        recordings = await self.get_latest_instance_recordings(meeting_id)
-        if not recordings:
-            logger.info(f"Meeting {meeting_id}: no recordings found for video download")
-            return None
-
-        recording_files = recordings.get("recording_files", [])
-        download_url = None
-
-        for rf in recording_files:
-            if rf.get("file_type") == "MP4":
-                download_url = rf.get("download_url")
-                break
-
+        download_url = await self._find_video_download(meeting_id)
         if not download_url:
-            file_types = [rf.get("file_type") for rf in recording_files]
-            logger.info(f"Meeting {meeting_id}: no MP4 file found, available: {file_types}")
             return None
-
         data = await self._download_zoom_file(meeting_id, download_url, "video (mp4)")
         return (data, "mp4") if data else None
 
+    async def download_meeting_video_to_file(self, meeting_id: int | str, dest_dir: str) -> tuple[str, str] | None:
+        """Stream the meeting MP4 into `dest_dir`. Returns (file_path, 'mp4') or None."""
+        download_url = await self._find_video_download(meeting_id)
+        if not download_url:
+            return None
+        dest_path = os.path.join(dest_dir, "zoom_video.mp4")
+        ok = await self._download_zoom_file_to_path(meeting_id, download_url, "video (mp4)", dest_path)
+        return (dest_path, "mp4") if ok else None
+
     async def download_meeting_transcript(self, meeting_id: int | str, instance_uuid: str | None = None) -> str | None:
         """Poll Zoom API for a meeting's transcript and download it.
 
@@ -475,7 +552,7 @@ class ZoomClient:
             return None
 
         token = await self.get_access_token()
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             # Step 1: follow redirect manually so Authorization header is NOT forwarded to CDN
             async with session.get(
                 transcript_url,
@@ -8,9 +8,19 @@ Connects to Zoom's WebSocket endpoint to receive real-time events
 import asyncio
 import json
 import logging
+import shutil
+import tempfile
+import time
 import uuid
 import aiohttp
 
+try:
+    from app.http_client import pooled_session  # webapp context
+    from app.concurrency import root_failures, run_dag
+except ImportError:  # pragma: no cover
+    from http_client import pooled_session  # bot context
+    from concurrency import root_failures, run_dag
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,7 +31,7 @@ class ZoomWSListener:
 
     def __init__(self, zoom_client, lark_client, db, config,
                  generate_summary_fn=None, generate_structured_fn=None, parse_vtt_fn=None,
-                 s3_client=None, auto_transcribe_fn=None):
+                 s3_client=None, auto_transcribe_fn=None, generate_short_summary_fn=None):
         self.zoom = zoom_client
         self.lark = lark_client
         self.db = db
@@ -31,6 +41,7 @@ class ZoomWSListener:
         self.generate_structured = generate_structured_fn
         self.parse_vtt = parse_vtt_fn
         self.auto_transcribe = auto_transcribe_fn
+        self.generate_short_summary = generate_short_summary_fn
         self._running = False
         self._task: asyncio.Task | None = None
 
@@ -126,7 +137,7 @@ class ZoomWSListener:
     async def _get_meeting_project_name(self, meeting_id: int) -> str | None:
         """Get project name linked to this meeting."""
         try:
-            db_meeting = await self.db.get_zoom_meeting(meeting_id)
+            db_meeting = await self.db.get_meeting_light(meeting_id)
             if not db_meeting:
                 return None
             db_id = db_meeting.get('id')
@@ -165,12 +176,14 @@ class ZoomWSListener:
 
     async def _generate_short_summary(self, full_summary: str) -> str:
         """Generate a 3-sentence summary from full summary using OpenRouter."""
+        if self.generate_short_summary:
+            return await self.generate_short_summary(full_summary)
         api_key = getattr(self.config, 'openrouter_api_key', None)
         model = getattr(self.config, 'openrouter_model', 'gpt-4o')
         if not api_key or not full_summary:
             return ""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     "https://openrouter.ai/api/v1/chat/completions",
                     headers={
@@ -221,6 +234,7 @@ class ZoomWSListener:
         sub_id = self.config.zoom_ws_subscription_id
         url = f"{self.WS_BASE}?subscriptionId={sub_id}&access_token={token}"
 
+        # Long-lived socket: keep it on its own session, outside the shared pool
         async with aiohttp.ClientSession() as session:
             async with session.ws_connect(url, heartbeat=30) as ws:
                 logger.info("Connected to Zoom WebSocket")
@@ -312,7 +326,7 @@ class ZoomWSListener:
                 logger.info(f"Meeting {meeting_id}: downloading Zoom VTT transcript...")
                 try:
                     token = await self.zoom.get_access_token()
-                    async with aiohttp.ClientSession() as session:
+                    async with pooled_session() as session:
                         async with session.get(
                             transcript_download_url,
                             headers={"Authorization": f"Bearer {token}"},
@@ -330,7 +344,7 @@ class ZoomWSListener:
                 logger.info(f"Meeting {meeting_id}: downloading Zoom AI SUMMARY...")
                 try:
                     token = await self.zoom.get_access_token()
-                    async with aiohttp.ClientSession() as session:
+                    async with pooled_session() as session:
                         async with session.get(
                             summary_download_url,
                             headers={"Authorization": f"Bearer {token}"},
@@ -353,131 +367,24 @@ class ZoomWSListener:
                     "Will poll Zoom API in 10/20/30 min as fallback."
                 )
 
-            summary = ""
-            # Generate summary from VTT transcript if available, otherwise from Zoom Summary overall_summary
-            if transcript_text and self.generate_summary:
+            # VTT → clean readable text [2:29] Speaker: text (this is what gets saved)
+            vtt_entries = []
+            if transcript_text and self.parse_vtt:
                 try:
-                    summary = await self.generate_summary(transcript_text)
-                    logger.info(f"Meeting {meeting_id}: summary generated from VTT — {len(summary)} chars")
-                except Exception as e:
-                    logger.error(f"Meeting {meeting_id}: summary generation error: {e}")
-            elif zoom_summary_json and zoom_summary_json.get("overall_summary"):
-                summary = zoom_summary_json["overall_summary"]
-                logger.info(f"Meeting {meeting_id}: using Zoom overall_summary as summary — {len(summary)} chars")
-
-            # Build structured transcript:
-            # If VTT available — parse and generate AI structured transcript
-            # If only Zoom Summary available — use it directly (already structured)
-            structured_transcript_json = None
-            if transcript_text and self.parse_vtt and self.generate_structured:
-                try:
-                    vtt_entries = self.parse_vtt(transcript_text)
+                    vtt_entries = self.parse_vtt(transcript_text) or []
                     if vtt_entries:
-                        # Convert raw VTT to clean readable text [2:29] Speaker: text
-                        clean_lines = []
-                        for e in vtt_entries:
-                            try:
-                                parts = e['start_time'].split(':')
-                                h, m, s = int(parts[0]), int(parts[1]), int(parts[2].split('.')[0])
-                                ts = f"{h}:{m:02d}:{s:02d}" if h > 0 else f"{m}:{s:02d}"
-                            except (ValueError, IndexError):
-                                ts = e['start_time']
-                            prefix = f"[{ts}]"
-                            if e.get("speaker"):
-                                prefix += f" {e['speaker']}:"
-                            clean_lines.append(f"{prefix} {e['text']}")
-                        transcript_text = "\n".join(clean_lines)
+                        transcript_text = self._clean_vtt_text(vtt_entries)
                         logger.info(f"Meeting {meeting_id}: parsed {len(vtt_entries)} VTT entries, cleaned transcript (WS)")
-                        structured_transcript_json = await self.generate_structured(vtt_entries)
-                        if structured_transcript_json:
-                            logger.info(f"Meeting {meeting_id}: structured transcript generated from VTT (WS)")
                 except Exception as e:
-                    logger.error(f"Meeting {meeting_id}: structured transcript error (WS): {e}")
-            
-            # Fall back to Zoom Summary JSON as structured transcript if no VTT-based one
-            if not structured_transcript_json and zoom_summary_json:
-                structured_transcript_json = zoom_summary_json
-                logger.info(f"Meeting {meeting_id}: using Zoom AI Summary as structured_transcript")
+                    logger.error(f"Meeting {meeting_id}: VTT parse error (WS): {e}")
 
             public_token = uuid.uuid4().hex[:16]
-
             start_time_raw = payload.get("start_time")  # ISO string from Zoom
 
-            try:
-                await self.db.update_meeting_recording(
-                    meeting_id=meeting_id,
-                    recording_url=recording_url,
-                    transcript_text=transcript_text[:50000] if transcript_text else None,
-                    summary=summary or None,
-                    status="recorded",
-                    topic=topic,
-                    duration=duration,
-                    start_time=start_time_raw,
-                )
-                await self.db.update_meeting_public_token(meeting_id, public_token)
-                if structured_transcript_json:
-                    await self.db.update_meeting_structured_transcript(meeting_id, structured_transcript_json)
-            except Exception as e:
-                logger.error(f"Meeting {meeting_id}: failed to update recording in DB: {e}")
-
-            # Only send Lark card if we have a summary
-            if self.lark and summary:
-                try:
-                    db_meeting = await self.db.get_zoom_meeting(meeting_id)
-                    if db_meeting and db_meeting.get("lark_message_id"):
-                        try:
-                            await self.lark.delete_message(db_meeting["lark_message_id"])
-                            logger.info(f"Meeting {meeting_id}: old Lark card deleted")
-                        except Exception as e:
-                            logger.error(f"Meeting {meeting_id}: failed to delete old Lark card: {e}")
-                except Exception as e:
-                    logger.error(f"Meeting {meeting_id}: failed to look up DB for Lark card: {e}")
-
-                webapp_url = getattr(self.config, 'webapp_url', '') or ''
-                public_page_url = f"{webapp_url}/meeting/{public_token}" if webapp_url else None
-
-                db_meeting = await self.db.get_zoom_meeting(meeting_id)
-                host_name = db_meeting.get('host_name') if db_meeting else None
-                host_telegram_id = db_meeting.get('host_telegram_id') if db_meeting else None
-                host_note = await self._get_host_note(host_telegram_id)
-                participants = await self._get_participants_with_notes(meeting_id)
-
-                actual_start, actual_end, actual_duration = await self._get_actual_times(meeting_id)
-
-                if actual_duration:
-                    await self.db.update_meeting_duration(meeting_id, actual_duration)
-
-                start_time_str = actual_start or (self._format_start_time(db_meeting.get('start_time')) if db_meeting else None)
-                end_time_str = actual_end or (self._format_end_time(db_meeting.get('start_time'), duration) if db_meeting and db_meeting.get('start_time') else None)
-
-                zoom_participants = await self._get_zoom_participants(meeting_id)
-                project_name = await self._get_meeting_project_name(meeting_id)
-
-                short_summary = await self._generate_short_summary(summary)
-
-                try:
-                    await self.lark.send_recording_card(
-                        topic=topic,
-                        recording_url=recording_url,
-                        transcript_text=transcript_text[:3000] if transcript_text else None,
-                        summary=summary,
-                        duration=actual_duration or duration,
-                        public_page_url=public_page_url,
-                        host_name=host_name,
-                        start_time=start_time_str,
-                        end_time=end_time_str,
-                        participants=participants if participants else None,
-                        short_summary=short_summary or None,
-                        host_note=host_note or None,
-                        zoom_participants=zoom_participants if zoom_participants else None,
-                        actual_duration=actual_duration,
-                        project_name=project_name,
-                    )
-                    logger.info(f"Meeting {meeting_id}: recording card sent to Lark (with summary)")
-                except Exception as e:
-                    logger.error(f"Meeting {meeting_id}: failed to send Lark recording card: {e}")
-            elif self.lark and not summary:
-                logger.info(f"Meeting {meeting_id}: Lark card NOT sent — waiting for summary")
+            await self._process_recording(
+                meeting_id, topic, duration, recording_url, public_token, start_time_raw,
+                transcript_text, vtt_entries, zoom_summary_json,
+            )
 
             if not transcript_text:
                 logger.warning(
@@ -498,6 +405,163 @@ class ZoomWSListener:
         except Exception as e:
             logger.error(f"Error processing recording.completed: {e}", exc_info=True)
 
+    @staticmethod
+    def _clean_vtt_text(vtt_entries: list[dict]) -> str:
+        clean_lines = []
+        for e in vtt_entries:
+            try:
+                parts = e['start_time'].split(':')
+                h, m, s = int(parts[0]), int(parts[1]), int(parts[2].split('.')[0])
+                ts = f"{h}:{m:02d}:{s:02d}" if h > 0 else f"{m}:{s:02d}"
+            except (ValueError, IndexError):
+                ts = e['start_time']
+            prefix = f"[{ts}]"
+            if e.get("speaker"):
+                prefix += f" {e['speaker']}:"
+            clean_lines.append(f"{prefix} {e['text']}")
+        return "\n".join(clean_lines)
+
+    async def _process_recording(self, meeting_id: int, topic: str, duration: int, recording_url: str,
+                                 public_token: str, start_time_raw: str | None, transcript_text: str,
+                                 vtt_entries: list[dict], zoom_summary_json: dict | None):
+        """Save the recording, then summary / structured transcript / Lark card as a DAG.
+
+        Each result is written as soon as it exists; the Lark card waits only
+        for the summary and short summary, not for the structured transcript.
+        """
+        t0 = time.monotonic()
+
+        async def _save_recording():
+            await self.db.update_meeting_recording(
+                meeting_id=meeting_id,
+                recording_url=recording_url,
+                transcript_text=transcript_text[:50000] if transcript_text else None,
+                summary=None,
+                status="recorded",
+                topic=topic,
+                duration=duration,
+                start_time=start_time_raw,
+            )
+            await self.db.update_meeting_public_token(meeting_id, public_token)
+
+        # Generate summary from VTT transcript if available, otherwise from Zoom Summary overall_summary
+        async def _summary() -> str:
+            if transcript_text and self.generate_summary:
+                try:
+                    summary = await self.generate_summary(transcript_text)
+                    logger.info(f"Meeting {meeting_id}: summary generated from VTT — {len(summary)} chars")
+                    return summary
+                except Exception as e:
+                    logger.error(f"Meeting {meeting_id}: summary generation error: {e}")
+                    return ""
+            if zoom_summary_json and zoom_summary_json.get("overall_summary"):
+                summary = zoom_summary_json["overall_summary"]
+                logger.info(f"Meeting {meeting_id}: using Zoom overall_summary as summary — {len(summary)} chars")
+                return summary
+            return ""
+
+        # AI structured transcript from VTT; Zoom AI Summary (already structured) as fallback
+        async def _structured():
+            structured = None
+            if vtt_entries and self.generate_structured:
+                try:
+                    structured = await self.generate_structured(vtt_entries)
+                    if structured:
+                        logger.info(f"Meeting {meeting_id}: structured transcript generated from VTT (WS)")
+                except Exception as e:
+                    logger.error(f"Meeting {meeting_id}: structured transcript error (WS): {e}")
+            if not structured and zoom_summary_json:
+                structured = zoom_summary_json
+                logger.info(f"Meeting {meeting_id}: using Zoom AI Summary as structured_transcript")
+            return structured
+
+        async def _save_summary(_, summary):
+            if summary:
+                await self.db.update_meeting_summary(meeting_id, summary)
+
+        async def _save_structured(_, structured):
+            if structured:
+                await self.db.update_meeting_structured_transcript(meeting_id, structured)
+
+        async def _short_summary(summary):
+            return await self._generate_short_summary(summary) if self.lark and summary else ""
+
+        async def _card_context(_):
+            if not self.lark:
+                return None
+            db_meeting = await self.db.get_meeting_light(meeting_id)
+            host_telegram_id = db_meeting.get('host_telegram_id') if db_meeting else None
+            host_note, participants, actual, zoom_participants, project_name = await asyncio.gather(
+                self._get_host_note(host_telegram_id),
+                self._get_participants_with_notes(meeting_id),
+                self._get_actual_times(meeting_id),
+                self._get_zoom_participants(meeting_id),
+                self._get_meeting_project_name(meeting_id),
+            )
+            return db_meeting, host_note, participants, actual, zoom_participants, project_name
+
+        async def _lark_card(summary, short_summary, context, _):
+            # Only send Lark card if we have a summary
+            if not self.lark:
+                return
+            if not summary:
+                logger.info(f"Meeting {meeting_id}: Lark card NOT sent — waiting for summary")
+                return
+            db_meeting, host_note, participants, actual, zoom_participants, project_name = context
+            actual_start, actual_end, actual_duration = actual
+            if db_meeting and db_meeting.get("lark_message_id"):
+                try:
+                    await self.lark.delete_message(db_meeting["lark_message_id"])
+                    logger.info(f"Meeting {meeting_id}: old Lark card deleted")
+                except Exception as e:
+                    logger.error(f"Meeting {meeting_id}: failed to delete old Lark card: {e}")
+
+            if actual_duration:
+                await self.db.update_meeting_duration(meeting_id, actual_duration)
+
+            webapp_url = getattr(self.config, 'webapp_url', '') or ''
+            public_page_url = f"{webapp_url}/meeting/{public_token}" if webapp_url else None
+            host_name = db_meeting.get('host_name') if db_meeting else None
+            start_time_str = actual_start or (self._format_start_time(db_meeting.get('start_time')) if db_meeting else None)
+            end_time_str = actual_end or (self._format_end_time(db_meeting.get('start_time'), duration) if db_meeting and db_meeting.get('start_time') else None)
+
+            await self.lark.send_recording_card(
+                topic=topic,
+                recording_url=recording_url,
+                transcript_text=transcript_text[:3000] if transcript_text else None,
+                summary=summary,
+                duration=actual_duration or duration,
+                public_page_url=public_page_url,
+                host_name=host_name,
+                start_time=start_time_str,
+                end_time=end_time_str,
+                participants=participants if participants else None,
+                short_summary=short_summary or None,
+                host_note=host_note or None,
+                zoom_participants=zoom_participants if zoom_participants else None,
+                actual_duration=actual_duration,
+                project_name=project_name,
+            )
+            logger.info(
+                f"Meeting {meeting_id}: recording card sent to Lark (with summary) "
+                f"{time.monotonic() - t0:.0f}s after recording.completed processing began"
+            )
+
+        steps = {
+            'save_recording': ((), _save_recording),
+            'summary': ((), _summary),
+            'structured': ((), _structured),
+            'save_summary': (('save_recording', 'summary'), _save_summary),
+            'save_structured': (('save_recording', 'structured'), _save_structured),
+            'short_summary': (('summary',), _short_summary),
+            'card_context': (('save_recording',), _card_context),
+            'lark_card': (('summary', 'short_summary', 'card_context', 'save_summary'), _lark_card),
+        }
+        results = await run_dag(steps)
+        for name, err in root_failures(steps, results).items():
+            logger.error(f"Meeting {meeting_id}: recording step {name} failed: {err}")
+        logger.info(f"Meeting {meeting_id}: recording post-processing done in {time.monotonic() - t0:.0f}s")
+
     async def _handle_meeting_ended(self, data: dict):
         """Handle meeting.ended event: update Lark card and DB status."""
         try:
@@ -513,7 +577,7 @@ class ZoomWSListener:
             duration = payload.get("duration", 0)
             logger.info(f"Meeting {meeting_id}: meeting.ended (WS) — updating Lark card")
 
-            db_meeting = await self.db.get_zoom_meeting(meeting_id)
+            db_meeting = await self.db.get_meeting_light(meeting_id)
             await self.db.update_meeting_status(meeting_id, "ended")
 
             if self.lark and db_meeting:
@@ -546,16 +610,18 @@ class ZoomWSListener:
             logger.error(f"Error processing meeting.ended (WS): {e}", exc_info=True)
 
     async def _upload_video_to_s3(self, meeting_id: int):
-        """Download MP4 from Zoom and upload to S3 in the background."""
+        """Stream MP4 from Zoom to a temp file and upload it to S3 in the background."""
+        if not self.zoom or not self.s3:
+            return
+        workdir = tempfile.mkdtemp(prefix=f"ws_video_{meeting_id}_")
         try:
-            if not self.zoom or not self.s3:
-                return
-            video_result = await self.zoom.download_meeting_video(meeting_id)
+            video_result = await self.zoom.download_meeting_video_to_file(meeting_id, workdir)
             if not video_result:
                 logger.info(f"Meeting {meeting_id}: no video available for S3 upload (WS)")
                 return
-            video_bytes, fmt = video_result
-            url = self.s3.upload_video(meeting_id, video_bytes, fmt)
+            video_path, fmt = video_result
+            url = await asyncio.get_event_loop().run_in_executor(
+                None, lambda: self.s3.upload_video_file(meeting_id, video_path, fmt))
             if url:
                 await self.db.update_meeting_video_url(meeting_id, url)
                 logger.info(f"Meeting {meeting_id}: video uploaded to S3 via WS -> {url}")
@@ -563,18 +629,22 @@ class ZoomWSListener:
                 logger.error(f"Meeting {meeting_id}: S3 video upload returned None (WS)")
         except Exception as e:
             logger.error(f"Meeting {meeting_id}: _upload_video_to_s3 error (WS): {e}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
 
     async def _upload_audio_to_s3(self, meeting_id: int):
-        """Download audio (M4A/MP4) from Zoom and upload to S3 in the background."""
+        """Stream audio (M4A/MP4) from Zoom to a temp file and upload it to S3 in the background."""
+        if not self.zoom or not self.s3:
+            return
+        workdir = tempfile.mkdtemp(prefix=f"ws_audio_{meeting_id}_")
         try:
-            if not self.zoom or not self.s3:
-                return
-            audio_result = await self.zoom.download_meeting_audio(meeting_id)
+            audio_result = await self.zoom.download_meeting_audio_to_file(meeting_id, workdir)
             if not audio_result:
                 logger.info(f"Meeting {meeting_id}: no audio available for S3 upload (WS)")
                 return
-            audio_bytes, fmt = audio_result
-            url = self.s3.upload_audio(meeting_id, audio_bytes, fmt)
+            audio_path, fmt = audio_result
+            url = await asyncio.get_event_loop().run_in_executor(
+                None, lambda: self.s3.upload_audio_file(meeting_id, audio_path, fmt))
             if url:
                 await self.db.update_meeting_audio_url(meeting_id, url)
                 logger.info(f"Meeting {meeting_id}: audio uploaded to S3 via WS -> {url}")
@@ -582,6 +652,8 @@ class ZoomWSListener:
                 logger.error(f"Meeting {meeting_id}: S3 audio upload returned None (WS)")
         except Exception as e:
             logger.error(f"Meeting {meeting_id}: _upload_audio_to_s3 error (WS): {e}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
 
     POLL_DELAYS = [600, 600, 600]  # 10 min, 20 min, 30 min total
 
@@ -591,8 +663,8 @@ class ZoomWSListener:
         for attempt, delay in enumerate(self.POLL_DELAYS, 1):
             await asyncio.sleep(delay)
 
-            db_meeting = await self.db.get_zoom_meeting(meeting_id)
-            if db_meeting and db_meeting.get("transcript_text"):
+            db_meeting = await self.db.get_meeting_light(meeting_id)
+            if db_meeting and db_meeting.get("has_transcript"):
                 logger.info(f"Meeting {meeting_id}: transcript already in DB (poll attempt {attempt} — skipping)")
                 return
 
@@ -714,7 +786,7 @@ class ZoomWSListener:
             transcript_text = ""
             try:
                 token = await self.zoom.get_access_token()
-                async with aiohttp.ClientSession() as session:
+                async with pooled_session() as session:
                     async with session.get(
                         transcript_download_url,
                         headers={"Authorization": f"Bearer {token}"},
@@ -747,7 +819,7 @@ class ZoomWSListener:
             except Exception as e:
                 logger.error(f"Meeting {meeting_id}: failed to update transcript/summary in DB: {e}")
 
-            db_meeting = await self.db.get_zoom_meeting(meeting_id)
+            db_meeting = await self.db.get_meeting_light(meeting_id)
             if not db_meeting:
                 logger.warning(f"Meeting {meeting_id}: not found in DB for Lark update")
                 return
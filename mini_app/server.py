@@ -6,13 +6,18 @@ Serves the web cabinet (clients, projects, proposals, meetings) and Zoom webhook
 from aiohttp import web
 import aiohttp
 import asyncio
+import base64
+import glob
 import os
+import shutil
+import tempfile
 import sys
 import json
 import re
 import hashlib
 import hmac
 import logging
+import time
 import uuid
 from dotenv import load_dotenv
 
@@ -28,9 +33,18 @@ from app.lark_client import LarkClient
 from app.zoom_client import ZoomClient
 from app.zoom_ws_listener import ZoomWSListener
 from app.embeddings import embed_meeting_for_project, generate_single_embedding, reembed_all_project_meetings
-from app.s3_client import S3Client
+from app.s3_client import S3Client, S3MultipartWriter
 from app.kimai_client import KimaiClient
+from app.kimai_sync import KimaiSync, mirror_is_fresh, mirror_synced_at
 from app.proposal_calculator import ProposalCalculator
+from app.concurrency import gather_bounded, root_failures, run_dag
+from app.job_queue import JobKind, JobWorker
+from app.llm_cache import LLMCache
+from app.llm_stream import stream_chat_sse, wants_stream
+from app.s3_media import MediaCache, stream_media
+from app.doc_extract import TextExtractor, is_supported
+from app import http_client
+from app.http_client import pooled_session
 
 # Setup logging
 logging.basicConfig(
@@ -106,6 +120,7 @@ if not database_url:
 
 # Initialize database, config, and clients
 db = Database(database_url)
+llm_cache = LLMCache(db)
 config = Config()
 
 lark_client = None
@@ -117,12 +132,17 @@ if config.zoom_account_id and config.zoom_client_id:
     zoom_client = ZoomClient(config.zoom_account_id, config.zoom_client_id, config.zoom_client_secret)
 
 s3_client = S3Client()
+media_cache = MediaCache()
+text_extractor = TextExtractor()
 
 kimai_client = None
+kimai_sync = None
 if config.kimai_url and config.kimai_api_token:
     kimai_client = KimaiClient(config.kimai_url, config.kimai_api_token)
+    kimai_sync = KimaiSync(db, kimai_client)
 
 zoom_ws_listener = None
+job_worker = None
 
 routes = web.RouteTableDef()
 
@@ -140,7 +160,7 @@ async def send_telegram_message(telegram_id: int, text: str, reply_markup=None):
         if reply_markup:
             payload['reply_markup'] = reply_markup
         
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.post(url, json=payload) as response:
                 if response.status == 200:
                     logger.info(f"Message sent to user {telegram_id}")
@@ -448,7 +468,7 @@ async def proposal_create_api(request):
     if not openrouter_key:
         return web.json_response({'error': 'AI service not configured'}, status=500)
 
-    calculator = ProposalCalculator(openrouter_key)
+    calculator = ProposalCalculator(openrouter_key, llm_cache=llm_cache)
     try:
         estimation = await calculator.calculate_proposal(
             project_description=description,
@@ -649,16 +669,24 @@ async def proposal_regenerate_api(request):
     if not openrouter_key:
         return web.json_response({'error': 'AI service not configured'}, status=500)
 
-    calculator = ProposalCalculator(openrouter_key)
+    # Text extracted from the proposal's uploaded documents (TZ, briefs) goes in
+    # alongside the description, in the same form the bot uses for files.
+    documents = await db.get_proposal_documents_text(token)
+    full_description = "\n\n".join(
+        [description] + [f"[Файл: {d['original_name']}]\n{d['extracted_text']}" for d in documents]
+    )
+
+    calculator = ProposalCalculator(openrouter_key, llm_cache=llm_cache)
     try:
         estimation = await calculator.calculate_proposal(
-            project_description=description,
+            project_description=full_description,
             proposal_type=proposal_type,
             budget_constraint=budget,
             budget_currency=budget_currency,
             design_type=design_type,
             hourly_rate=hourly_rate,
             currency=currency,
+            regenerate=True,
         )
     except Exception as e:
         logger.error(f"Proposal regeneration failed: {e}", exc_info=True)
@@ -703,6 +731,42 @@ async def proposal_regenerate_api(request):
 
 # ========== Proposal Documents ==========
 
+async def _store_proposal_document(proposal_token: str, original_name: str, file_bytes: bytes,
+                                   content_type: str, uploaded_by: str) -> dict | None:
+    """Upload to S3 and extract the text (both off the event loop, concurrently), then record
+    the document. Returns the row without the text, or None if the upload failed."""
+    ext = original_name.rsplit('.', 1)[-1].lower() if '.' in original_name else ''
+    safe_name = f"{uuid.uuid4().hex[:12]}.{ext}" if ext else uuid.uuid4().hex[:12]
+
+    loop = asyncio.get_running_loop()
+    upload = loop.run_in_executor(
+        None, s3_client.upload_document, proposal_token, safe_name, file_bytes, content_type,
+    )
+    extracted_text = ''
+    if is_supported(original_name):
+        s3_url, extracted_text = await asyncio.gather(upload, text_extractor.extract(file_bytes, original_name))
+    else:
+        s3_url = await upload
+    if not s3_url:
+        return None
+
+    doc = await db.add_proposal_document(
+        proposal_token=proposal_token,
+        filename=safe_name,
+        original_name=original_name,
+        s3_url=s3_url,
+        s3_key=f"proposals/{proposal_token}/documents/{safe_name}",
+        file_size=len(file_bytes),
+        content_type=content_type,
+        uploaded_by=uploaded_by,
+        extracted_text=extracted_text or None,
+    )
+    doc.pop('extracted_text', None)
+    if doc.get('created_at'):
+        doc['created_at'] = doc['created_at'].isoformat()
+    return doc
+
+
 @routes.get('/api/proposal/{token}/documents')
 async def proposal_documents_list(request):
     """List documents for a proposal. Public (same as proposal view)."""
@@ -739,28 +803,10 @@ async def proposal_document_upload(request):
         if not file_bytes:
             continue
 
-        ext = original_name.rsplit('.', 1)[-1].lower() if '.' in original_name else ''
-        safe_name = f"{uuid.uuid4().hex[:12]}.{ext}" if ext else uuid.uuid4().hex[:12]
         content_type = part.headers.get('Content-Type', '') or 'application/octet-stream'
-
-        s3_url = s3_client.upload_document(token, safe_name, file_bytes, content_type)
-        if not s3_url:
-            continue
-
-        s3_key = f"proposals/{token}/documents/{safe_name}"
-        doc = await db.add_proposal_document(
-            proposal_token=token,
-            filename=safe_name,
-            original_name=original_name,
-            s3_url=s3_url,
-            s3_key=s3_key,
-            file_size=len(file_bytes),
-            content_type=content_type,
-            uploaded_by='admin',
-        )
-        if doc.get('created_at'):
-            doc['created_at'] = doc['created_at'].isoformat()
-        uploaded.append(doc)
+        doc = await _store_proposal_document(token, original_name, file_bytes, content_type, 'admin')
+        if doc:
+            uploaded.append(doc)
 
     return web.json_response({'ok': True, 'documents': uploaded})
 
@@ -783,8 +829,10 @@ async def proposal_document_update(request):
         tags=body.get('tags'),
         visible_to_client=body.get('visible_to_client'),
     )
-    if updated and updated.get('created_at'):
-        updated['created_at'] = updated['created_at'].isoformat()
+    if updated:
+        updated.pop('extracted_text', None)
+        if updated.get('created_at'):
+            updated['created_at'] = updated['created_at'].isoformat()
     return web.json_response({'ok': True, 'document': updated})
 
 
@@ -846,28 +894,10 @@ async def cabinet_proposal_document_upload(request):
         if not file_bytes:
             continue
 
-        ext = original_name.rsplit('.', 1)[-1].lower() if '.' in original_name else ''
-        safe_name = f"{uuid.uuid4().hex[:12]}.{ext}" if ext else uuid.uuid4().hex[:12]
         content_type = part.headers.get('Content-Type', '') or 'application/octet-stream'
-
-        s3_url = s3_client.upload_document(proposal_token, safe_name, file_bytes, content_type)
-        if not s3_url:
-            continue
-
-        s3_key = f"proposals/{proposal_token}/documents/{safe_name}"
-        doc = await db.add_proposal_document(
-            proposal_token=proposal_token,
-            filename=safe_name,
-            original_name=original_name,
-            s3_url=s3_url,
-            s3_key=s3_key,
-            file_size=len(file_bytes),
-            content_type=content_type,
-            uploaded_by='client',
-        )
-        if doc.get('created_at'):
-            doc['created_at'] = doc['created_at'].isoformat()
-        uploaded.append(doc)
+        doc = await _store_proposal_document(proposal_token, original_name, file_bytes, content_type, 'client')
+        if doc:
+            uploaded.append(doc)
 
     return web.json_response({'ok': True, 'documents': uploaded})
 
@@ -885,7 +915,25 @@ async def health(request):
     except Exception as e:
         logger.warning("health: db ping failed: %s", e)
     status = 'ok' if db_ok else 'degraded'
-    return web.json_response({'status': status, 'db': db_ok}, status=200 if db_ok else 503)
+    return web.json_response(
+        {
+            'status': status, 'db': db_ok,
+            'session_cache': db.session_cache.stats(),
+            'meeting_meta_cache': db.meeting_meta_cache.stats(),
+            'job_worker': job_worker.stats() if job_worker else None,
+            'sync': {phase: p.as_dict() for phase, p in sync_progress.items()},
+            'zoom_rate_limit_pauses': zoom_client.limiter.pauses if zoom_client else None,
+            'kimai_sync': kimai_sync.stats() if kimai_sync else None,
+            'llm_cache': llm_cache.stats(),
+            'media_cache': media_cache.stats(),
+            'doc_extract': text_extractor.stats(),
+            'tokens': {
+                'zoom': zoom_client.tokens.stats() if zoom_client else None,
+                'lark': lark_client.tokens.stats() if lark_client else None,
+            },
+        },
+        status=200 if db_ok else 503,
+    )
 
 
 # ========== Authentication ==========
@@ -948,7 +996,10 @@ async def auth_callback(request):
 
 @routes.get('/auth/logout')
 async def auth_logout(request):
-    """Clear session cookie and redirect to login."""
+    """Delete the session, clear the cookie and redirect to login."""
+    token = request.cookies.get('session_token')
+    if token:
+        await db.delete_web_session(token)
     resp = web.HTTPFound('/login')
     resp.del_cookie('session_token', path='/')
     return resp
@@ -1301,7 +1352,8 @@ async def auth_middleware(request, handler):
                 token_idx = 3 if path.startswith('/api/') else 2
                 if len(parts) > token_idx:
                     meeting_token = parts[token_idx]
-                    meeting = await db.get_meeting_by_public_token(meeting_token)
+                    meeting = await db.get_meeting_meta_by_token(meeting_token)
+                    request['meeting_meta'] = meeting
                     if not meeting or not meeting.get('is_public'):
                         if path.startswith('/api/'):
                             return web.json_response({'error': 'access denied'}, status=403)
@@ -1312,7 +1364,8 @@ async def auth_middleware(request, handler):
         token_idx = 3 if path.startswith('/api/') else 2
         if len(parts) > token_idx:
             meeting_token = parts[token_idx]
-            meeting = await db.get_meeting_by_public_token(meeting_token)
+            meeting = await db.get_meeting_meta_by_token(meeting_token)
+            request['meeting_meta'] = meeting
             if meeting and meeting.get('is_public'):
                 return await handler(request)
         # Not public — redirect or 401
@@ -1382,11 +1435,22 @@ def require_staff_session(request):
 
 # ========== Meeting Page ==========
 
+
+async def _meeting_meta(request, token: str) -> dict | None:
+    """Meeting access record (id, meeting_id, public_token, is_public, status, topic)
+    for handlers that don't need transcript/summary. Reuses the lookup done by
+    auth_middleware when there was one."""
+    meta = request.get('meeting_meta')
+    if meta is not None and meta.get('public_token') == token:
+        return meta
+    return await db.get_meeting_meta_by_token(token)
+
 @routes.get('/meeting/{token}')
 async def meeting_page(request):
     """Serve meeting detail page with Open Graph meta tags for social previews."""
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    # Light record: crawlers and every page view hit this, the transcript is not needed here.
+    meeting = await db.get_meeting_light_by_token(token)
 
     og_title = 'Детали встречи'
     og_description = 'Запись встречи на портале НейроСофт'
@@ -1403,7 +1467,10 @@ async def meeting_page(request):
             parts.append(f"{dur // 60} ч {dur % 60} мин" if dur >= 60 else f"{dur} мин")
         if host:
             parts.append(f"Организатор: {host}")
-        summary_raw = (meeting.get('summary') or '').replace('\n', ' ').strip()
+        summary = ''
+        if meeting.get('has_summary'):
+            summary = (await db.get_meeting_text_fields(meeting['meeting_id'], 'summary')).get('summary') or ''
+        summary_raw = summary.replace('\n', ' ').strip()
         import re as _re
         summary_clean = _re.sub(r'\[[\d:]+\]\s*', '', summary_raw)
         summary_clean = _re.sub(r'[•\-]\s*', '', summary_clean)
@@ -1473,18 +1540,34 @@ async def meeting_api(request):
         'join_url': meeting.get('join_url', ''),
         'video_s3_url': meeting.get('video_s3_url', ''),
         'audio_s3_url': meeting.get('audio_s3_url', ''),
+        'video_stream_url': f"/api/meeting/{token}/media/video" if meeting.get('video_s3_url') else '',
+        'audio_stream_url': f"/api/meeting/{token}/media/audio" if meeting.get('audio_s3_url') else '',
         'mindmap_json': meeting.get('mindmap_json', ''),
         'is_public': bool(meeting.get('is_public', False)),
         'public_url': f"{config.webapp_url}/meeting/{token}" if meeting.get('is_public') else None,
     })
 
 
+@routes.get('/api/meeting/{token}/media/{kind}')
+async def meeting_media(request):
+    """Stream the meeting video/audio from S3 (Range requests for seeking) via a short-lived presigned URL."""
+    token = request.match_info['token']
+    kind = request.match_info['kind']
+    if kind not in ('video', 'audio'):
+        return web.json_response({'error': 'not found'}, status=404)
+    meeting = await db.get_meeting_light_by_token(token)
+    url = meeting.get(f'{kind}_s3_url') if meeting else None
+    if not url:
+        return web.json_response({'error': 'not found'}, status=404)
+    return await stream_media(request, s3_client.signed_url(url))
+
+
 @routes.patch('/api/meeting/{token}/visibility')
 async def meeting_visibility_toggle(request):
     """Toggle meeting public/private visibility."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'not found'}, status=404)
 
@@ -1501,7 +1584,7 @@ async def delete_meeting(request):
     """Delete meeting from database, Zoom and S3."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'Meeting not found'}, status=404)
 
@@ -1537,7 +1620,7 @@ async def update_meeting_topic(request):
     """Rename meeting topic."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'Meeting not found'}, status=404)
     try:
@@ -1556,12 +1639,43 @@ async def update_meeting_topic(request):
         logger.error(f"Failed to rename meeting {meeting['meeting_id']}: {e}")
         return web.json_response({'error': 'Failed to update topic'}, status=500)
 
+_MAX_VIDEO_UPLOAD_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB
+
+
+_UPLOAD_READ_CHUNK_BYTES = 256 * 1024
+
+
+async def _stream_field_to_s3(field, writer: S3MultipartWriter, spool=None) -> str | None:
+    """Pipe a multipart field straight into an S3 multipart upload, optionally
+    teeing it into a local spool file. Memory stays at a few S3 parts.
+    Returns the public URL, or None for an empty field.
+    Raises ValueError if the field exceeds 2 GB; the S3 upload is aborted on any error."""
+    await writer.start()
+    try:
+        while True:
+            chunk = await field.read_chunk(_UPLOAD_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            if writer.bytes_written + len(chunk) > _MAX_VIDEO_UPLOAD_BYTES:
+                raise ValueError("upload exceeds size limit")
+            if spool is not None:
+                spool.write(chunk)
+            await writer.write(chunk)
+        if not writer.bytes_written:
+            await writer.abort()
+            return None
+        return await writer.complete()
+    except BaseException:
+        await writer.abort()
+        raise
+
+
 @routes.post('/api/meeting/{token}/upload-video')
 async def upload_meeting_video(request):
     """Upload a local video file, save it to S3 and link it to the meeting."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'Meeting not found'}, status=404)
 
@@ -1572,51 +1686,35 @@ async def upload_meeting_video(request):
     except Exception:
         return web.json_response({'error': 'Expected multipart/form-data'}, status=400)
 
-    file_bytes = None
-    fmt = 'mp4'
-
-    async for field in reader:
-        if field.name == 'video':
-            filename = field.filename or 'video.mp4'
-            ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else 'mp4'
-            fmt = ext if ext in ('mp4', 'mov', 'webm', 'avi') else 'mp4'
-            chunks = []
-            while True:
-                chunk = await field.read_chunk(65536)
-                if not chunk:
-                    break
-                chunks.append(chunk)
-            file_bytes = b''.join(chunks)
-            break
-
-    if not file_bytes:
-        return web.json_response({'error': 'No video field in request'}, status=400)
-
-    max_bytes = 2 * 1024 * 1024 * 1024  # 2 GB
-    if len(file_bytes) > max_bytes:
-        return web.json_response({'error': 'File too large (max 2 GB)'}, status=413)
-
+    url = None
     try:
-        url = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: s3_client.upload_video(meeting_id, file_bytes, fmt),
-        )
-        if not url:
-            return web.json_response({'error': 'S3 upload failed'}, status=500)
-        await db.update_meeting_video_url(meeting_id, url)
-        logger.info(f"Meeting {meeting_id}: video uploaded via web -> {url}")
-        return web.json_response({'status': 'ok', 'video_url': url})
+        async for field in reader:
+            if field.name == 'video':
+                filename = field.filename or 'video.mp4'
+                ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else 'mp4'
+                fmt = ext if ext in ('mp4', 'mov', 'webm', 'avi') else 'mp4'
+                url = await _stream_field_to_s3(field, s3_client.open_video_upload(meeting_id, fmt))
+                break
+    except ValueError:
+        return web.json_response({'error': 'File too large (max 2 GB)'}, status=413)
     except Exception as e:
         logger.error(f"Meeting {meeting_id}: upload-video error: {e}")
         return web.json_response({'error': str(e)}, status=500)
 
+    if not url:
+        return web.json_response({'error': 'No video field in request'}, status=400)
+
+    await db.update_meeting_video_url(meeting_id, url)
+    logger.info(f"Meeting {meeting_id}: video uploaded via web -> {url}")
+    return web.json_response({'status': 'ok', 'video_url': url})
+
 
 @routes.post('/api/meeting/{token}/fetch-zoom-video')
 async def fetch_zoom_video(request):
     """Trigger background download of meeting video from Zoom and upload to S3."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'Meeting not found'}, status=404)
 
@@ -1627,8 +1725,8 @@ async def fetch_zoom_video(request):
         return web.json_response({'status': 'no_zoom', 'message': 'S3 не настроен'})
 
     meeting_id = meeting.get('meeting_id')
-    asyncio.create_task(_upload_video_to_s3(meeting_id))
-    logger.info(f"Meeting {meeting_id}: manual fetch-zoom-video triggered")
+    await enqueue_s3_uploads(meeting_id, audio=False)
+    logger.info(f"Meeting {meeting_id}: manual fetch-zoom-video queued")
     return web.json_response({'status': 'started'})
 
 
@@ -1648,48 +1746,68 @@ async def project_upload_video(request):
     except Exception:
         return web.json_response({'error': 'Expected multipart/form-data'}, status=400)
 
-    file_bytes = None
+    meeting = None
+    video_path = None
+    video_url = None
     fmt = 'mp4'
     topic = ''
 
-    async for field in reader:
-        if field.name == 'topic':
-            topic = (await field.read(decode=True)).decode('utf-8', errors='replace').strip()
-        elif field.name == 'video':
-            filename = field.filename or 'video.mp4'
-            ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else 'mp4'
-            fmt = ext if ext in ('mp4', 'mov', 'webm', 'avi', 'mkv') else 'mp4'
-            if not topic:
-                topic = filename.rsplit('.', 1)[0][:200]
-            chunks = []
-            while True:
-                chunk = await field.read_chunk(65536)
-                if not chunk:
-                    break
-                chunks.append(chunk)
-            file_bytes = b''.join(chunks)
+    # The form sends `topic` before `video`; the meeting row is created when the
+    # video field starts so its S3 key is known and the body can stream to S3.
+    try:
+        async for field in reader:
+            if field.name == 'topic':
+                topic = (await field.read(decode=True)).decode('utf-8', errors='replace').strip()
+                if meeting and topic:
+                    await db.update_meeting_topic(meeting['meeting_id'], topic)
+            elif field.name == 'video' and not meeting:
+                filename = field.filename or 'video.mp4'
+                ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else 'mp4'
+                fmt = ext if ext in ('mp4', 'mov', 'webm', 'avi', 'mkv') else 'mp4'
+                if not topic:
+                    topic = filename.rsplit('.', 1)[0][:200]
+                meeting = await db.create_manual_meeting(
+                    topic=topic or 'Загруженное видео',
+                    host_telegram_id=session.get('telegram_id', 0),
+                    host_name=session.get('first_name') or session.get('username') or 'Unknown',
+                )
+                if not meeting:
+                    return web.json_response({'error': 'Failed to create meeting record'}, status=500)
+                with tempfile.NamedTemporaryFile(suffix=f".{fmt}", delete=False) as spool:
+                    video_path = spool.name
+                    video_url = await _stream_field_to_s3(
+                        field, s3_client.open_video_upload(meeting['meeting_id'], fmt), spool=spool,
+                    )
+    except Exception as e:
+        if video_path:
+            os.unlink(video_path)
+        if meeting:
+            await db.delete_meeting(meeting['meeting_id'])
+        if isinstance(e, ValueError):
+            return web.json_response({'error': 'File too large (max 2 GB)'}, status=413)
+        logger.error(f"Project {token}: upload-video error: {e}")
+        return web.json_response({'error': str(e)}, status=500)
 
-    if not file_bytes:
+    if not video_url:
+        if video_path:
+            os.unlink(video_path)
+        if meeting:
+            await db.delete_meeting(meeting['meeting_id'])
         return web.json_response({'error': 'No video field in request'}, status=400)
 
-    max_bytes = 2 * 1024 * 1024 * 1024
-    if len(file_bytes) > max_bytes:
-        return web.json_response({'error': 'File too large (max 2 GB)'}, status=413)
-
-    meeting = await db.create_manual_meeting(
-        topic=topic or 'Загруженное видео',
-        host_telegram_id=session.get('telegram_id', 0),
-        host_name=session.get('first_name') or session.get('username') or 'Unknown',
-    )
-    if not meeting:
-        return web.json_response({'error': 'Failed to create meeting record'}, status=500)
+    await db.update_meeting_video_url(meeting['meeting_id'], video_url)
+    logger.info(f"Manual meeting {meeting['meeting_id']}: video streamed to S3 -> {video_url}")
 
     try:
         await db.add_meeting_to_project(project['id'], meeting['id'])
     except Exception as e:
         logger.error(f"Failed to link uploaded meeting to project: {e}")
 
-    asyncio.create_task(_process_uploaded_video(meeting['meeting_id'], meeting['id'], file_bytes, fmt, project['id']))
+    await enqueue_job(
+        'process_uploaded_video', dedupe_key=f"process_uploaded_video:{meeting['meeting_id']}", max_attempts=2,
+        meeting_id=meeting['meeting_id'], db_id=meeting['id'], video_path=video_path, fmt=fmt,
+        project_id=project['id'],
+    )
 
     return web.json_response({
         'status': 'ok',
@@ -1700,67 +1818,65 @@ async def project_upload_video(request):
     })
 
 
-async def _process_uploaded_video(meeting_id: int, db_id: int, file_bytes: bytes, fmt: str, project_id: int):
-    """Background: upload video to S3, extract audio, transcribe, summarise, embed."""
-    import tempfile
-
+async def _process_uploaded_video(meeting_id: int, db_id: int, video_path: str, fmt: str, project_id: int):
+    """Job: extract audio, transcribe, summarise, embed.
+    The video itself is already in S3 (streamed by the upload endpoint).
+    Takes ownership of `video_path` (a spooled temp file) and removes it when done.
+    If the spool isn't on this host (another worker, or a retry), the video is
+    fetched back from S3."""
+    workdir = tempfile.mkdtemp(prefix=f"upload_{meeting_id}_")
     try:
-        if s3_client:
-            url = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: s3_client.upload_video(meeting_id, file_bytes, fmt))
-            if url:
-                await db.update_meeting_video_url(meeting_id, url)
-                logger.info(f"Manual meeting {meeting_id}: video uploaded to S3 -> {url}")
-    except Exception as e:
-        logger.error(f"Manual meeting {meeting_id}: S3 video upload error: {e}")
-
-    audio_bytes = None
+        if not os.path.exists(video_path):
+            video_path = os.path.join(workdir, f"video.{fmt}")
+            ok = await asyncio.get_event_loop().run_in_executor(
+                None, lambda: s3_client.download_video_file(meeting_id, video_path, fmt))
+            if not ok:
+                raise RuntimeError(f"video for meeting {meeting_id} is neither spooled nor in S3")
+        await _process_uploaded_video_files(meeting_id, db_id, video_path, fmt, project_id, workdir)
+    finally:
+        if os.path.exists(video_path):
+            os.unlink(video_path)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+async def _process_uploaded_video_files(meeting_id: int, db_id: int, video_path: str, fmt: str,
+                                        project_id: int, workdir: str):
+    audio_path = None
     audio_fmt = "mp3"
     try:
-        with tempfile.NamedTemporaryFile(suffix=f".{fmt}", delete=False) as src:
-            src.write(file_bytes)
-            src_path = src.name
-        dst_path = src_path.rsplit(".", 1)[0] + ".mp3"
-        rc, _, stderr = await _run_ffmpeg(
-            "-y", "-i", src_path, "-vn", "-b:a", "128k", "-f", "mp3", dst_path,
-            timeout=300,
-        )
-        os.unlink(src_path)
-        del file_bytes
-        if rc == 0:
-            with open(dst_path, "rb") as f:
-                audio_bytes = f.read()
-            os.unlink(dst_path)
-            logger.info(f"Manual meeting {meeting_id}: audio extracted ({len(audio_bytes)} bytes)")
+        dst_path = os.path.join(workdir, "audio.mp3")
+        ok = await _extract_audio_file(video_path, dst_path, timeout=300)
+        os.unlink(video_path)
+        if ok:
+            audio_path = dst_path
+            logger.info(f"Manual meeting {meeting_id}: audio extracted ({os.path.getsize(audio_path)} bytes)")
 
             if s3_client:
                 try:
                     audio_url = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda: s3_client.upload_audio(meeting_id, audio_bytes, audio_fmt))
+                        None, lambda: s3_client.upload_audio_file(meeting_id, audio_path, audio_fmt))
                     if audio_url:
                         await db.update_meeting_audio_url(meeting_id, audio_url)
                 except Exception as e:
                     logger.error(f"Manual meeting {meeting_id}: S3 audio upload error: {e}")
         else:
-            logger.error(f"Manual meeting {meeting_id}: ffmpeg audio extraction failed: {stderr.decode()[:500]}")
-            if os.path.exists(src_path):
-                os.unlink(src_path)
+            logger.error(f"Manual meeting {meeting_id}: ffmpeg audio extraction failed")
     except Exception as e:
         logger.error(f"Manual meeting {meeting_id}: audio extraction error: {e}")
 
     await db.update_meeting_status(meeting_id, 'recorded')
 
-    if audio_bytes:
+    if audio_path:
         await db.update_meeting_status(meeting_id, 'transcribing')
-        await _auto_transcribe_audio(meeting_id, provided_audio=audio_bytes, provided_audio_fmt=audio_fmt)
+        await _auto_transcribe_audio(meeting_id, provided_audio_path=audio_path, provided_audio_fmt=audio_fmt)
 
-    meeting_data = await db.get_zoom_meeting(meeting_id)
-    if meeting_data and meeting_data.get('transcript_text'):
+    meeting_data = await db.get_meeting_light(meeting_id)
+    if meeting_data and meeting_data.get('has_transcript'):
         await db.update_meeting_status(meeting_id, 'finished')
-    elif audio_bytes:
+    elif audio_path:
         await db.update_meeting_status(meeting_id, 'recorded')
         try:
-            dur_seconds = len(audio_bytes) / 16000 if audio_bytes else 0
+            dur_seconds = os.path.getsize(audio_path) / 16000
             dur_minutes = max(1, int(dur_seconds / 60)) if dur_seconds else 0
             if dur_minutes:
                 async with db.pool.acquire() as conn:
@@ -1842,8 +1958,17 @@ async def meeting_chat(request):
             messages.append({"role": h['role'], "content": h['content'][:2000]})
     messages.append({"role": "user", "content": question[:2000]})
 
+    max_tokens = 4000 if use_power_model else 2000
+    provider = {"provider": {"ignore": ["Google AI Studio"]}} if use_power_model else {}
+    model_used = 'power' if use_power_model else 'default'
+    if wants_stream(request, body):
+        return await stream_chat_sse(
+            request, api_key, model, messages, max_tokens,
+            done_extra={'model_used': model_used}, **provider,
+        )
+
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers={
@@ -1853,13 +1978,13 @@ async def meeting_chat(request):
                 json={
                     "model": model,
                     "messages": messages,
-                    "max_tokens": 4000 if use_power_model else 2000,
-                    **({"provider": {"ignore": ["Google AI Studio"]}} if use_power_model else {}),
+                    "max_tokens": max_tokens,
+                    **provider,
                 },
             ) as resp:
                 data = await resp.json()
                 answer = data["choices"][0]["message"]["content"].strip()
-                return web.json_response({'answer': answer, 'model_used': 'power' if use_power_model else 'default'})
+                return web.json_response({'answer': answer, 'model_used': model_used})
     except Exception as e:
         logger.error(f"Meeting chat error: {e}")
         return web.json_response({'answer': 'Произошла ошибка при обработке запроса.'})
@@ -1948,6 +2073,24 @@ async def brainstorm_thread_messages(request):
     } for m in messages])
 
 
+async def _save_brainstorm_exchange(token: str, telegram_id: int, thread_id: int,
+                                    question: str, answer: str) -> None:
+    """Persist a question/answer pair and auto-title a still-default thread."""
+    try:
+        await db.add_brainstorm_message(thread_id, 'user', question)
+        await db.add_brainstorm_message(thread_id, 'assistant', answer)
+        # Auto-title thread from first message if still default
+        threads = await db.get_brainstorm_threads(token, telegram_id)
+        thread = next((t for t in threads if t['id'] == thread_id), None)
+        if thread and thread['title'] == 'Новая тема':
+            short_title = question[:60].strip()
+            if len(question) > 60:
+                short_title += '…'
+            await db.rename_brainstorm_thread(thread_id, telegram_id, short_title)
+    except Exception as e:
+        logger.warning(f"Failed to save brainstorm messages: {e}")
+
+
 @routes.post('/api/meeting/{token}/brainstorm')
 async def meeting_brainstorm(request):
     """AI brainstorm chat — deep analysis of the full meeting transcript without timecodes."""
@@ -2013,8 +2156,22 @@ async def meeting_brainstorm(request):
             messages.append({"role": h['role'], "content": h['content'][:3000]})
     messages.append({"role": "user", "content": question[:3000]})
 
+    max_tokens = 6000 if use_power_model else 3000
+    provider = {"provider": {"ignore": ["Google AI Studio"]}} if use_power_model else {}
+    model_used = 'power' if use_power_model else 'default'
+
+    async def _persist(answer: str) -> None:
+        if thread_id and telegram_id:
+            await _save_brainstorm_exchange(token, telegram_id, thread_id, question, answer)
+
+    if wants_stream(request, body):
+        return await stream_chat_sse(
+            request, api_key, model, messages, max_tokens,
+            done_extra={'model_used': model_used}, on_complete=_persist, **provider,
+        )
+
     try:
-        async with aiohttp.ClientSession() as ai_sess:
+        async with pooled_session() as ai_sess:
             async with ai_sess.post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers={
@@ -2024,35 +2181,33 @@ async def meeting_brainstorm(request):
                 json={
                     "model": model,
                     "messages": messages,
-                    "max_tokens": 6000 if use_power_model else 3000,
-                    **({"provider": {"ignore": ["Google AI Studio"]}} if use_power_model else {}),
+                    "max_tokens": max_tokens,
+                    **provider,
                 },
             ) as resp:
                 data = await resp.json()
                 answer = data["choices"][0]["message"]["content"].strip()
 
-        # Persist to DB if thread_id provided
-        if thread_id and telegram_id:
-            try:
-                await db.add_brainstorm_message(thread_id, 'user', question)
-                await db.add_brainstorm_message(thread_id, 'assistant', answer)
-                # Auto-title thread from first message if still default
-                threads = await db.get_brainstorm_threads(token, telegram_id)
-                thread = next((t for t in threads if t['id'] == thread_id), None)
-                if thread and thread['title'] == 'Новая тема':
-                    short_title = question[:60].strip()
-                    if len(question) > 60:
-                        short_title += '…'
-                    await db.rename_brainstorm_thread(thread_id, telegram_id, short_title)
-            except Exception as e:
-                logger.warning(f"Failed to save brainstorm messages: {e}")
-
-        return web.json_response({'answer': answer, 'model_used': 'power' if use_power_model else 'default'})
+        await _persist(answer)
+        return web.json_response({'answer': answer, 'model_used': model_used})
     except Exception as e:
         logger.error(f"Meeting brainstorm error: {e}")
         return web.json_response({'answer': 'Произошла ошибка при обработке запроса.'})
 
 
+async def _regenerate_requested(request) -> bool:
+    """`regenerate` flag from the query string or JSON body: skip the LLM cache lookup."""
+    if request.query.get('regenerate') in ('1', 'true'):
+        return True
+    if request.can_read_body:
+        try:
+            body = await request.json()
+        except (json.JSONDecodeError, ValueError):
+            return False
+        return isinstance(body, dict) and bool(body.get('regenerate'))
+    return False
+
+
 @routes.post('/api/meeting/{token}/mindmap')
 async def meeting_mindmap(request):
     """Generate an AI-powered mind map (Markdown for Markmap) from meeting transcript/summary."""
@@ -2133,8 +2288,8 @@ async def meeting_mindmap(request):
         f"{meeting_context}"
     )
 
-    try:
-        async with aiohttp.ClientSession() as session:
+    async def _call() -> str | None:
+        async with pooled_session() as session:
             async with session.post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
@@ -2158,7 +2313,7 @@ async def meeting_mindmap(request):
                     # Fallback to default model if opus fails
                     fallback_model = config.openrouter_model or 'anthropic/claude-3-5-sonnet'
                     logger.info(f"Mindmap: retrying with fallback model {fallback_model}")
-                    async with aiohttp.ClientSession() as s2:
+                    async with pooled_session() as s2:
                         async with s2.post(
                             "https://openrouter.ai/api/v1/chat/completions",
                             headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
@@ -2174,20 +2329,27 @@ async def meeting_mindmap(request):
                             if not choices:
                                 raise ValueError(f"Fallback model also failed: {data}")
                 raw = choices[0]["message"]["content"].strip()
-                if '```' in raw:
-                    import re
-                    m = re.search(r'```(?:markdown|md)?\s*([\s\S]*?)```', raw)
-                    if m:
-                        raw = m.group(1).strip()
-                if not raw.startswith('#'):
-                    lines = raw.split('\n')
-                    for i, line in enumerate(lines):
-                        if line.strip().startswith('#'):
-                            raw = '\n'.join(lines[i:])
-                            break
-                meeting_id = meeting.get('meeting_id')
-                await db.update_meeting_mindmap(meeting_id, raw)
-                return web.json_response({'mindmap_json': raw})
+        if '```' in raw:
+            m = re.search(r'```(?:markdown|md)?\s*([\s\S]*?)```', raw)
+            if m:
+                raw = m.group(1).strip()
+        if not raw.startswith('#'):
+            lines = raw.split('\n')
+            for i, line in enumerate(lines):
+                if line.strip().startswith('#'):
+                    raw = '\n'.join(lines[i:])
+                    break
+        return raw
+
+    try:
+        raw = await llm_cache.get_or_call(
+            model, [{"role": "user", "content": prompt}], {'max_tokens': 8000}, _call,
+            bypass=await _regenerate_requested(request),
+        )
+        if not raw:
+            raise ValueError("empty mindmap")
+        await db.update_meeting_mindmap(meeting.get('meeting_id'), raw)
+        return web.json_response({'mindmap_json': raw})
     except Exception as e:
         logger.error(f"Mindmap generation error: {e}")
         return web.json_response({'error': 'Ошибка генерации карты'}, status=500)
@@ -2213,7 +2375,7 @@ def _serialize_task(t: dict) -> dict:
 async def meeting_tasks_list(request):
     """Return all tasks for a meeting."""
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'not found'}, status=404)
     tasks = await db.get_meeting_tasks(meeting['meeting_id'])
@@ -2225,7 +2387,7 @@ async def meeting_task_create(request):
     """Manually create a task."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'not found'}, status=404)
     body = await request.json()
@@ -2282,7 +2444,7 @@ async def meeting_task_enhance(request):
     context = '\n\n'.join(context_parts)
 
     try:
-        async with aiohttp.ClientSession() as ai_session:
+        async with pooled_session() as ai_session:
             async with ai_session.post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
@@ -2391,8 +2553,13 @@ async def meeting_tasks_generate(request):
         context_parts.append(f"## Полная транскрипция\n{transcript[:60000]}")
     context = '\n\n---\n\n'.join(context_parts)
 
-    try:
-        async with aiohttp.ClientSession() as session:
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": context},
+    ]
+
+    async def _call() -> str:
+        async with pooled_session() as session:
             async with session.post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers={
@@ -2401,17 +2568,20 @@ async def meeting_tasks_generate(request):
                 },
                 json={
                     "model": model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": context},
-                    ],
+                    "messages": messages,
                     "max_tokens": 8000,
                     "provider": {"ignore": ["Google AI Studio"]},
                 },
                 timeout=aiohttp.ClientTimeout(total=120),
             ) as resp:
                 data = await resp.json()
-                raw_text = data["choices"][0]["message"]["content"].strip()
+                return data["choices"][0]["message"]["content"].strip()
+
+    try:
+        raw_text = await llm_cache.get_or_call(
+            model, messages, {'max_tokens': 8000}, _call,
+            bypass=await _regenerate_requested(request),
+        ) or ''
     except Exception as e:
         logger.error(f"Task generation AI error: {e}")
         return web.json_response({'error': 'Ошибка генерации задач'}, status=500)
@@ -2457,7 +2627,7 @@ async def meeting_task_update(request):
     """Edit a task's title/description."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'not found'}, status=404)
     task_id = int(request.match_info['task_id'])
@@ -2476,7 +2646,7 @@ async def meeting_task_delete(request):
     """Delete a task."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'not found'}, status=404)
     task_id = int(request.match_info['task_id'])
@@ -2546,7 +2716,7 @@ async def meeting_task_expand(request):
         context += f"## Транскрипция\n{transcript[:40000]}"
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers={
@@ -2582,7 +2752,7 @@ async def meeting_task_send_lark(request):
     """Send a task to the Lark group as an interactive card."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'not found'}, status=404)
 
@@ -2640,6 +2810,25 @@ async def meeting_task_send_lark(request):
         return web.json_response({'error': 'Ошибка отправки в Lark'}, status=500)
 
 
+def _parse_ticket_json(raw: str) -> dict:
+    """Model answer -> {'title', 'description', 'tags'}; raises ValueError on bad JSON."""
+    raw = raw.strip()
+    # Extract JSON from possible markdown fences or surrounding text
+    json_match = re.search(r'\{[^{}]*\}', raw, re.DOTALL)
+    if json_match:
+        raw = json_match.group(0)
+    elif raw.startswith('```'):
+        lines = raw.split('\n')
+        raw = '\n'.join(lines[1:]).rsplit('```', 1)[0].strip()
+
+    result = json.loads(raw)
+    return {
+        'title': str(result.get('title', ''))[:120],
+        'description': str(result.get('description', ''))[:2000],
+        'tags': [str(t) for t in result.get('tags', []) if t][:6],
+    }
+
+
 @routes.post('/api/ticket-ai')
 async def ticket_ai_generate(request):
     """Use AI to generate a structured ticket title, description and tags from raw text."""
@@ -2661,6 +2850,16 @@ async def ticket_ai_generate(request):
     )
     user_prompt = f"Текст:\n{raw_text}"
 
+    if wants_stream(request, body):
+        async def _parsed(answer: str) -> dict:
+            return _parse_ticket_json(answer)
+
+        return await stream_chat_sse(
+            request, config.openrouter_api_key, config.openrouter_model or 'anthropic/claude-3-5-haiku',
+            [{'role': 'system', 'content': system_prompt}, {'role': 'user', 'content': user_prompt}],
+            400, on_complete=_parsed, temperature=0.4,
+        )
+
     headers = {
         'Authorization': f'Bearer {config.openrouter_api_key}',
         'Content-Type': 'application/json',
@@ -2678,11 +2877,12 @@ async def ticket_ai_generate(request):
     }
     try:
         timeout = aiohttp.ClientTimeout(total=30)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with pooled_session() as session:
             async with session.post(
                 'https://openrouter.ai/api/v1/chat/completions',
                 headers=headers,
                 json=payload,
+                timeout=timeout,
             ) as resp:
                 data = await resp.json(content_type=None)
 
@@ -2692,22 +2892,7 @@ async def ticket_ai_generate(request):
             return web.json_response({'error': 'AI не вернул ответ'}, status=502)
 
         raw = data['choices'][0]['message']['content'].strip()
-        # Extract JSON from possible markdown fences or surrounding text
-        import re as _re, json as _json
-        # Try to find {...} block
-        json_match = _re.search(r'\{[^{}]*\}', raw, _re.DOTALL)
-        if json_match:
-            raw = json_match.group(0)
-        elif raw.startswith('```'):
-            lines = raw.split('\n')
-            raw = '\n'.join(lines[1:]).rsplit('```', 1)[0].strip()
-
-        result = _json.loads(raw)
-        return web.json_response({
-            'title': str(result.get('title', ''))[:120],
-            'description': str(result.get('description', ''))[:2000],
-            'tags': [str(t) for t in result.get('tags', []) if t][:6],
-        })
+        return web.json_response(_parse_ticket_json(raw))
     except Exception as e:
         logger.error(f"ticket-ai error: {e}")
         return web.json_response({'error': 'Ошибка генерации'}, status=500)
@@ -2791,10 +2976,12 @@ async def meeting_transcribe(request):
         return web.json_response({'error': 'Транскрипция уже выполняется'}, status=409)
 
     logger.info(f"Manual transcribe request for meeting {meeting_id} (token={token})")
+    job_id = await enqueue_job('manual_transcribe', dedupe_key=f"transcribe:{meeting_id}", max_attempts=1,
+                               meeting_id=meeting_id, prev_status=cur_status)
+    if job_id is None:
+        return web.json_response({'error': 'Транскрипция уже выполняется'}, status=409)
     await db.update_meeting_status(meeting_id, 'transcribing')
 
-    asyncio.ensure_future(_run_manual_transcription(meeting_id, cur_status))
-
     return web.json_response({'status': 'accepted'}, status=202)
 
 
@@ -2864,8 +3051,8 @@ async def _run_manual_transcription(meeting_id, prev_status, instance_uuid=None)
             )
             await _auto_transcribe_audio(meeting_id, instance_uuid=instance_uuid)
 
-        refreshed = await db.get_zoom_meeting(meeting_id)
-        if not refreshed or not refreshed.get('transcript_text'):
+        refreshed = await db.get_meeting_light(meeting_id)
+        if not refreshed or not refreshed.get('has_transcript'):
             logger.error(f"Meeting {meeting_id}: manual transcription produced no transcript")
             await db.update_meeting_status(meeting_id, prev_status or 'recorded')
             return
@@ -2881,11 +3068,11 @@ async def _run_manual_transcription(meeting_id, prev_status, instance_uuid=None)
 async def meeting_status(request):
     """Lightweight endpoint for polling meeting processing status."""
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await db.get_meeting_light_by_token(token)
     if not meeting:
         return web.json_response({'error': 'not found'}, status=404)
-    has_transcript = bool(meeting.get('transcript_text') or meeting.get('structured_transcript'))
-    has_summary = bool(meeting.get('summary'))
+    has_transcript = meeting['has_transcript'] or meeting['has_structured_transcript']
+    has_summary = meeting['has_summary']
     return web.json_response({
         'status': meeting.get('status', ''),
         'has_transcript': has_transcript,
@@ -2900,7 +3087,7 @@ async def meeting_instances(request):
     When a meeting was stopped and restarted, each session is a separate instance."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'not found'}, status=404)
 
@@ -2942,7 +3129,7 @@ async def meeting_refetch_recording(request):
     Clears existing transcript/summary and re-downloads from the selected instance."""
     require_staff_session(request)
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'not found'}, status=404)
 
@@ -2982,7 +3169,8 @@ async def meeting_refetch_recording(request):
         logger.debug("clear structured_transcript for meeting %s failed: %s", meeting_id, e)
 
     # Kick off re-transcription in background using this specific instance
-    asyncio.ensure_future(_run_manual_transcription(meeting_id, 'recorded', instance_uuid=instance_uuid))
+    await enqueue_job('manual_transcribe', dedupe_key=f"transcribe:{meeting_id}", max_attempts=1,
+                      meeting_id=meeting_id, prev_status='recorded', instance_uuid=instance_uuid)
 
     return web.json_response({
         'status': 'accepted',
@@ -3012,7 +3200,7 @@ async def meeting_regenerate_structured(request):
 
     if vtt_entries:
         logger.info(f"Meeting {meeting_id}: regenerating structured transcript from {len(vtt_entries)} VTT entries")
-        structured = await generate_structured_transcript(vtt_entries)
+        structured = await generate_structured_transcript(vtt_entries, regenerate=True)
     else:
         # Transcript is plain text or JSON — feed it directly to GPT
         source_text = transcript_text or structured_existing
@@ -3037,7 +3225,7 @@ async def meeting_regenerate_structured(request):
         model = os.getenv('OPENROUTER_MODEL', 'gpt-4o')
         if not api_key:
             return web.json_response({'error': 'AI service unavailable'}, status=503)
-        structured = await _structured_transcript_single(api_key, model, source_text[:120000])
+        structured = await _structured_transcript_single(api_key, model, source_text[:120000], regenerate=True)
 
     if not structured:
         return web.json_response({'error': 'Не удалось сгенерировать структурированную транскрипцию'}, status=500)
@@ -3370,7 +3558,7 @@ async def check_client_bot_status(request):
         return web.json_response({'can_message': False, 'reason': 'no_bot_token'})
     try:
         url = f"https://api.telegram.org/bot{bot_token}/getChat"
-        async with aiohttp.ClientSession() as sess:
+        async with pooled_session() as sess:
             async with sess.get(url, params={'chat_id': int(telegram_id)}, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                 data = await resp.json()
                 if data.get('ok'):
@@ -3539,7 +3727,7 @@ async def send_client_message_api(request):
                     }]]
                 }
             url = f"https://api.telegram.org/bot{config.telegram_token}/sendMessage"
-            async with aiohttp.ClientSession() as sess:
+            async with pooled_session() as sess:
                 resp = await sess.post(url, json=payload)
                 data = await resp.json()
                 if data.get('ok'):
@@ -3997,7 +4185,7 @@ async def send_cabinet_message(request):
                 chat_link = f"{webapp_url}/client/{client_uuid}#chat" if webapp_url and client_uuid else ''
                 link_line = f'\n\n<a href="{chat_link}">💬 Открыть чат с клиентом</a>' if chat_link else ''
                 url = f"https://api.telegram.org/bot{config.telegram_token}/sendMessage"
-                async with aiohttp.ClientSession() as sess:
+                async with pooled_session() as sess:
                     await sess.post(url, json={
                         'chat_id': group_id,
                         'text': (
@@ -4306,7 +4494,7 @@ async def update_project(request):
     old_name = project.get('name', '')
     old_desc = project.get('description') or ''
     if name != old_name or (description or '') != old_desc:
-        asyncio.create_task(_reembed_project_safe(project['id']))
+        await enqueue_job('reembed_project', dedupe_key=f"reembed_project:{project['id']}", project_id=project['id'])
 
     return web.json_response({'status': 'ok'})
 
@@ -4374,7 +4562,8 @@ async def add_meeting_to_project(request):
         logger.error(f"Failed to add meeting to project: {e}")
         return web.json_response({'error': str(e)}, status=500)
 
-    asyncio.create_task(_embed_meeting_safe(project['id'], int(meeting_db_id)))
+    await enqueue_job('embed_meeting', dedupe_key=f"embed_meeting:{project['id']}:{int(meeting_db_id)}",
+                      project_id=project['id'], zoom_meeting_db_id=int(meeting_db_id))
     return web.json_response({'status': 'ok'})
 
 @routes.delete('/api/project/{token}/meetings/{meeting_db_id}')
@@ -4394,7 +4583,7 @@ async def remove_meeting_from_project(request):
 async def meeting_projects(request):
     """Get projects that a meeting belongs to."""
     token = request.match_info['token']
-    meeting = await db.get_meeting_by_public_token(token)
+    meeting = await _meeting_meta(request, token)
     if not meeting:
         return web.json_response({'error': 'not found'}, status=404)
     projects = await db.get_meeting_projects(meeting['id'])
@@ -4729,6 +4918,78 @@ async def update_project_kimai_link(request):
     return web.json_response({'ok': True})
 
 
+def _empty_kimai_finance() -> dict:
+    return {'hours': 0.0, 'cost': 0.0, 'monthly': {}, 'activity_breakdown': [], 'user_breakdown': []}
+
+
+async def _mirror_kimai_finance(kimai_project_id: int, date_from, date_to) -> dict:
+    """Kimai hours/cost of a project from the local mirror (one GROUPING SETS query)."""
+    result = _empty_kimai_finance()
+    for r in await db.get_kimai_project_finance(kimai_project_id, date_from, date_to):
+        if r['dim'] == 'total':
+            result['hours'], result['cost'] = r['hours'], r['cost']
+        elif r['dim'] == 'month':
+            result['monthly'][r['month']] = r['cost']
+        elif r['dim'] == 'activity' and r['activity_id']:
+            result['activity_breakdown'].append({
+                'name': r['activity_name'] or f"Activity {r['activity_id']}",
+                'hours': round(r['hours'], 2), 'cost': round(r['cost'], 2),
+            })
+        elif r['dim'] == 'user' and r['user_id']:
+            result['user_breakdown'].append({
+                'name': r['user_name'] or f"User {r['user_id']}",
+                'hours': round(r['hours'], 2), 'cost': round(r['cost'], 2),
+            })
+    return result
+
+
+async def _live_kimai_finance(kimai_project_id: int, date_from, date_to) -> dict:
+    """Same as _mirror_kimai_finance, read from the Kimai API when the mirror is unavailable."""
+    from datetime import date
+    # When no explicit date_from, go back 2 years to capture all historical Kimai data
+    default_begin = date.today().replace(year=date.today().year - 2)
+    begin = (date_from or default_begin).isoformat() + 'T00:00:00'
+    end = (date_to or date.today()).isoformat() + 'T23:59:59'
+    records = await kimai_client.get_project_timesheets(kimai_project_id, begin, end)
+    activities_map: dict[int, str] = {}
+    users_map: dict[int, str] = {}
+    try:
+        activities_map = {a['id']: a['name'] for a in await kimai_client.get_activities()}
+    except Exception as e:
+        logger.warning("Kimai get_activities failed (activity names will be missing): %s", e)
+    try:
+        users_map = {u['id']: u.get('alias') or u.get('username') or f"User {u['id']}"
+                     for u in await kimai_client.get_users()}
+    except Exception as e:
+        logger.warning("Kimai get_users failed (user names will be missing): %s", e)
+
+    result = _empty_kimai_finance()
+    by_activity: dict[int, dict] = {}
+    by_user: dict[int, dict] = {}
+    for r in records:
+        hours = (r.get('duration', 0) or 0) / 3600.0
+        cost = float(r.get('rate', 0) or 0)
+        result['hours'] += hours
+        result['cost'] += cost
+        month = (r.get('begin') or '')[:7]
+        if month:
+            result['monthly'][month] = result['monthly'].get(month, 0.0) + cost
+        for key, bucket in ((r.get('activity'), by_activity), (r.get('user'), by_user)):
+            if key:
+                entry = bucket.setdefault(key, {'hours': 0.0, 'cost': 0.0})
+                entry['hours'] += hours
+                entry['cost'] += cost
+    result['activity_breakdown'] = [
+        {'name': activities_map.get(aid, f'Activity {aid}'), 'hours': round(v['hours'], 2), 'cost': round(v['cost'], 2)}
+        for aid, v in by_activity.items()
+    ]
+    result['user_breakdown'] = [
+        {'name': users_map.get(uid, f'User {uid}'), 'hours': round(v['hours'], 2), 'cost': round(v['cost'], 2)}
+        for uid, v in by_user.items()
+    ]
+    return result
+
+
 @routes.get('/api/project/{token}/finance')
 async def project_finance_summary(request):
     """Return finance summary for a project. Admin only."""
@@ -4740,7 +5001,7 @@ async def project_finance_summary(request):
     if not project:
         return web.json_response({'error': 'not found'}, status=404)
 
-    from datetime import datetime, date, timedelta
+    from datetime import date
     date_from_str = request.rel_url.query.get('from')
     date_to_str = request.rel_url.query.get('to')
     date_from = date.fromisoformat(date_from_str) if date_from_str else None
@@ -4751,59 +5012,30 @@ async def project_finance_summary(request):
         created = created.date()
     days_in_work = (date.today() - created).days
 
-    kimai_hours = 0.0
-    kimai_cost = 0.0
-    kimai_records = []
-    by_activity: dict[int, dict] = {}
-    by_user: dict[int, dict] = {}
-    activities_map: dict[int, str] = {}
-    users_map: dict[int, str] = {}
     kimai_project_id = project.get('kimai_project_id')
-    if kimai_project_id and kimai_client:
-        # When no explicit date_from, go back 2 years to capture all historical Kimai data
-        default_begin = date.today().replace(year=date.today().year - 2)
-        begin = (date_from or default_begin).isoformat() + 'T00:00:00'
-        end = (date_to or date.today()).isoformat() + 'T23:59:59'
+    kimai = None
+    kimai_synced_at = None
+    kimai_error = None
+    if kimai_project_id and kimai_sync:
         try:
-            records = await kimai_client.get_project_timesheets(kimai_project_id, begin, end)
-            try:
-                acts = await kimai_client.get_activities()
-                activities_map = {a['id']: a['name'] for a in acts}
-            except Exception as e:
-                logger.warning("Kimai get_activities failed (activity names will be missing): %s", e)
-            try:
-                usrs = await kimai_client.get_users()
-                users_map = {u['id']: u.get('alias') or u.get('username') or f"User {u['id']}" for u in usrs}
-            except Exception as e:
-                logger.warning("Kimai get_users failed (user names will be missing): %s", e)
-            for r in records:
-                dur_sec = r.get('duration', 0) or 0
-                rate = r.get('rate', 0) or 0
-                hours = dur_sec / 3600.0
-                kimai_hours += hours
-                kimai_cost += float(rate)
-                rec_begin = r.get('begin', '')
-                rec_date = rec_begin[:10] if rec_begin else ''
-                act_id = r.get('activity', 0)
-                usr_id = r.get('user', 0)
-                kimai_records.append({
-                    'date': rec_date,
-                    'hours': round(hours, 2),
-                    'cost': float(rate),
-                    'user_id': usr_id,
-                    'activity_id': act_id,
-                    'description': r.get('description', ''),
-                })
-                if act_id:
-                    entry = by_activity.setdefault(act_id, {'hours': 0.0, 'cost': 0.0})
-                    entry['hours'] += hours
-                    entry['cost'] += float(rate)
-                if usr_id:
-                    entry = by_user.setdefault(usr_id, {'hours': 0.0, 'cost': 0.0})
-                    entry['hours'] += hours
-                    entry['cost'] += float(rate)
+            await kimai_sync.ensure_synced()
+            if await mirror_is_fresh(db):
+                kimai_synced_at = await mirror_synced_at(db)
+                kimai = await _mirror_kimai_finance(kimai_project_id, date_from, date_to)
+            else:
+                logger.warning(f"Kimai mirror is stale, reading project {token} finance live")
+        except Exception as e:
+            logger.error(f"Kimai mirror error for project {token}, falling back to live API: {e!r}")
+    if kimai_project_id and kimai is None and kimai_client:
+        try:
+            kimai = await _live_kimai_finance(kimai_project_id, date_from, date_to)
         except Exception as e:
-            logger.error(f"Kimai timesheets error for project {token}: {e}")
+            logger.error(f"Kimai timesheets error for project {token}: {e!r}")
+            kimai_error = str(e) or e.__class__.__name__
+    kimai = kimai or _empty_kimai_finance()
+    kimai_hours, kimai_cost = kimai['hours'], kimai['cost']
+    activity_breakdown = sorted(kimai['activity_breakdown'], key=lambda x: x['cost'], reverse=True)
+    user_breakdown = sorted(kimai['user_breakdown'], key=lambda x: x['cost'], reverse=True)
 
     expenses = await db.get_project_expenses(project['id'], date_from, date_to)
     custom_total = sum(float(ex.get('amount', 0)) for ex in expenses)
@@ -4814,11 +5046,9 @@ async def project_finance_summary(request):
     profit = income_total - total_expenses
 
     monthly: dict[str, dict] = {}
-    for r in kimai_records:
-        m = r['date'][:7]
-        if m:
-            monthly.setdefault(m, {'expenses': 0.0, 'income': 0.0})
-            monthly[m]['expenses'] += r['cost']
+    for m, cost in kimai['monthly'].items():
+        monthly.setdefault(m, {'expenses': 0.0, 'income': 0.0})
+        monthly[m]['expenses'] += cost
     for ex in expenses:
         d = ex.get('expense_date')
         m = d.isoformat()[:7] if d else ''
@@ -4834,15 +5064,6 @@ async def project_finance_summary(request):
 
     monthly_data = [{'month': k, **v} for k, v in sorted(monthly.items())]
 
-    activity_breakdown = [
-        {'name': activities_map.get(aid, f'Activity {aid}'), 'hours': round(v['hours'], 2), 'cost': round(v['cost'], 2)}
-        for aid, v in sorted(by_activity.items(), key=lambda x: x[1]['cost'], reverse=True)
-    ]
-    user_breakdown = [
-        {'name': users_map.get(uid, f'User {uid}'), 'hours': round(v['hours'], 2), 'cost': round(v['cost'], 2)}
-        for uid, v in sorted(by_user.items(), key=lambda x: x[1]['cost'], reverse=True)
-    ]
-
     return web.json_response({
         'days_in_work': days_in_work,
         'kimai_hours': round(kimai_hours, 2),
@@ -4852,6 +5073,8 @@ async def project_finance_summary(request):
         'income_total': round(income_total, 2),
         'profit': round(profit, 2),
         'kimai_project_id': kimai_project_id,
+        'kimai_synced_at': kimai_synced_at.isoformat() if kimai_synced_at else None,
+        'kimai_error': kimai_error,
         'monthly_data': monthly_data,
         'activity_breakdown': activity_breakdown,
         'user_breakdown': user_breakdown,
@@ -5130,8 +5353,17 @@ async def project_chat(request):
 
     sources_list = [{'topic': s['topic'], 'token': s['token']} for s in sources_map.values() if s.get('token')]
 
+    max_tokens = 4000 if use_power_model else 2000
+    provider = {"provider": {"ignore": ["Google AI Studio"]}} if use_power_model else {}
+    model_used = 'power' if use_power_model else 'default'
+    if wants_stream(request, body):
+        return await stream_chat_sse(
+            request, api_key, model, messages, max_tokens,
+            done_extra={'sources': sources_list, 'model_used': model_used}, **provider,
+        )
+
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers={
@@ -5141,13 +5373,13 @@ async def project_chat(request):
                 json={
                     "model": model,
                     "messages": messages,
-                    "max_tokens": 4000 if use_power_model else 2000,
-                    **({"provider": {"ignore": ["Google AI Studio"]}} if use_power_model else {}),
+                    "max_tokens": max_tokens,
+                    **provider,
                 },
             ) as resp:
                 data = await resp.json()
                 answer = data["choices"][0]["message"]["content"].strip()
-                return web.json_response({'answer': answer, 'sources': sources_list, 'model_used': 'power' if use_power_model else 'default'})
+                return web.json_response({'answer': answer, 'sources': sources_list, 'model_used': model_used})
     except Exception as e:
         logger.error(f"Project chat error: {e}")
         return web.json_response({'answer': 'Произошла ошибка при обработке запроса.', 'sources': []})
@@ -5185,7 +5417,7 @@ async def _openrouter_chat(api_key: str, model: str, messages: list[dict],
 
     for m in models_to_try:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     "https://openrouter.ai/api/v1/chat/completions",
                     headers={
@@ -5217,15 +5449,13 @@ async def _openrouter_chat(api_key: str, model: str, messages: list[dict],
     return None
 
 
-async def generate_summary(transcript: str) -> str:
+async def generate_summary(transcript: str, regenerate: bool = False) -> str:
     """Use OpenRouter to create a detailed meeting summary with timestamps."""
     api_key = os.getenv('OPENROUTER_API_KEY')
     model = os.getenv('OPENROUTER_MODEL', 'anthropic/claude-sonnet-4')
     if not api_key or not transcript:
         return ""
-    result = await _openrouter_chat(
-        api_key, model,
-        messages=[
+    messages = [
             {
                 "role": "system",
                 "content": (
@@ -5244,9 +5474,11 @@ async def generate_summary(transcript: str) -> str:
                 ),
             },
             {"role": "user", "content": f"Транскрипция встречи:\n\n{transcript[:60000]}"},
-        ],
-        max_tokens=2000,
-        temperature=0.3,
+    ]
+    result = await llm_cache.get_or_call(
+        model, messages, {'max_tokens': 2000, 'temperature': 0.3},
+        lambda: _openrouter_chat(api_key, model, messages, max_tokens=2000, temperature=0.3),
+        bypass=regenerate,
     )
     return result or ""
 
@@ -5257,34 +5489,39 @@ async def generate_short_summary(full_summary: str) -> str:
     model = os.getenv('OPENROUTER_MODEL', 'gpt-4o')
     if not api_key or not full_summary:
         return ""
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": (
-                                "Ты — ассистент. Сократи саммари встречи до 3 предложений на русском языке. "
-                                "Выдели только самое важное. Отвечай только текстом саммари, без вступлений."
-                            ),
-                        },
-                        {"role": "user", "content": f"Саммари встречи:\n\n{full_summary[:3000]}"},
-                    ],
-                    "max_tokens": 200,
-                },
-            ) as resp:
-                data = await resp.json()
-                return data["choices"][0]["message"]["content"].strip()
-    except Exception as e:
-        logger.error(f"Summary generation error: {e}")
-        return ""
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "Ты — ассистент. Сократи саммари встречи до 3 предложений на русском языке. "
+                "Выдели только самое важное. Отвечай только текстом саммари, без вступлений."
+            ),
+        },
+        {"role": "user", "content": f"Саммари встречи:\n\n{full_summary[:3000]}"},
+    ]
+
+    async def _call() -> str:
+        try:
+            async with pooled_session() as session:
+                async with session.post(
+                    "https://openrouter.ai/api/v1/chat/completions",
+                    headers={
+                        "Authorization": f"Bearer {api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    json={
+                        "model": model,
+                        "messages": messages,
+                        "max_tokens": 200,
+                    },
+                ) as resp:
+                    data = await resp.json()
+                    return data["choices"][0]["message"]["content"].strip()
+        except Exception as e:
+            logger.error(f"Summary generation error: {e}")
+            return ""
+
+    return await llm_cache.get_or_call(model, messages, {'max_tokens': 200}, _call) or ""
 
 
 def parse_vtt(vtt_text: str) -> list[dict]:
@@ -5421,7 +5658,7 @@ _STRUCTURED_TRANSCRIPT_SYSTEM_PROMPT = """\
 Чем больше деталей и конкретики — тем лучше."""
 
 
-async def generate_structured_transcript(vtt_entries: list[dict]) -> str | None:
+async def generate_structured_transcript(vtt_entries: list[dict], regenerate: bool = False) -> str | None:
     """Use GPT-4o to segment a parsed VTT transcript into topic chapters.
 
     Returns a JSON string matching the structured transcript schema,
@@ -5438,34 +5675,37 @@ async def generate_structured_transcript(vtt_entries: list[dict]) -> str | None:
 
     max_chars = 120_000
     if len(formatted) <= max_chars:
-        return await _structured_transcript_single(api_key, model, formatted)
+        return await _structured_transcript_single(api_key, model, formatted, regenerate)
     else:
-        return await _structured_transcript_chunked(api_key, model, vtt_entries, max_chars)
+        return await _structured_transcript_chunked(api_key, model, vtt_entries, max_chars, regenerate)
 
 
 async def _structured_transcript_single(
-    api_key: str, model: str, formatted_transcript: str
+    api_key: str, model: str, formatted_transcript: str, regenerate: bool = False
 ) -> str | None:
     """Single-pass structured transcript generation for transcripts that fit in context."""
-    raw = await _openrouter_chat(
-        api_key, model,
-        messages=[
-            {"role": "system", "content": _STRUCTURED_TRANSCRIPT_SYSTEM_PROMPT},
-            {"role": "user", "content": f"Транскрипция встречи:\n\n{formatted_transcript}"},
-        ],
-        max_tokens=8000,
-        temperature=0.2,
+    messages = [
+        {"role": "system", "content": _STRUCTURED_TRANSCRIPT_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Транскрипция встречи:\n\n{formatted_transcript}"},
+    ]
+
+    async def _call() -> str | None:
+        raw = await _openrouter_chat(api_key, model, messages, max_tokens=8000, temperature=0.2)
+        if not raw:
+            return None
+        try:
+            raw = re.sub(r"^```(?:json)?\s*", "", raw)
+            raw = re.sub(r"\s*```$", "", raw)
+            json.loads(raw)  # validate JSON
+            return raw
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.error(f"Structured transcript JSON parse error: {e}")
+            return None
+
+    # Only validated JSON reaches the cache; a failed attempt is retried for real.
+    return await llm_cache.get_or_call(
+        model, messages, {'max_tokens': 8000, 'temperature': 0.2}, _call, bypass=regenerate,
     )
-    if not raw:
-        return None
-    try:
-        raw = re.sub(r"^```(?:json)?\s*", "", raw)
-        raw = re.sub(r"\s*```$", "", raw)
-        json.loads(raw)  # validate JSON
-        return raw
-    except (json.JSONDecodeError, ValueError) as e:
-        logger.error(f"Structured transcript JSON parse error: {e}")
-        return None
 
 
 def _timecode_to_seconds(tc: str) -> float:
@@ -5477,13 +5717,18 @@ def _timecode_to_seconds(tc: str) -> float:
     return 0.0
 
 
+# Windows of one long transcript sent to OpenRouter at the same time.
+STRUCTURED_WINDOW_CONCURRENCY = int(os.getenv('STRUCTURED_WINDOW_CONCURRENCY') or 4)
+
+
 async def _structured_transcript_chunked(
-    api_key: str, model: str, vtt_entries: list[dict], max_chars: int
+    api_key: str, model: str, vtt_entries: list[dict], max_chars: int, regenerate: bool = False
 ) -> str | None:
     """Chunked processing for very long transcripts.
 
     Splits entries into ~15-minute overlapping windows, generates per-chunk
-    topics, then merges results.
+    topics (up to STRUCTURED_WINDOW_CONCURRENCY windows at once), then merges
+    results in window order.
     """
     chunk_duration_s = 900  # 15 minutes
     overlap_s = 60  # 1 minute overlap
@@ -5506,10 +5751,21 @@ async def _structured_transcript_chunked(
     if current_chunk:
         chunks.append(current_chunk)
 
-    all_items: list[dict] = []
-    for chunk in chunks:
+    async def _window(chunk: list[dict]) -> str | None:
         formatted = _format_vtt_for_llm(chunk)
-        result_json = await _structured_transcript_single(api_key, model, formatted[:max_chars])
+        return await _structured_transcript_single(api_key, model, formatted[:max_chars], regenerate)
+
+    t0 = time.monotonic()
+    # Results come back in window order, so the start_time dedup below keeps
+    # the same item it did when windows ran one after another.
+    window_results = await gather_bounded(chunks, _window, STRUCTURED_WINDOW_CONCURRENCY)
+    logger.info(
+        f"Structured transcript: {len(chunks)} windows in {time.monotonic() - t0:.1f}s "
+        f"(concurrency {STRUCTURED_WINDOW_CONCURRENCY})"
+    )
+
+    all_items: list[dict] = []
+    for result_json in window_results:
         if result_json:
             try:
                 parsed = json.loads(result_json)
@@ -5530,7 +5786,7 @@ async def _structured_transcript_chunked(
 
     deduped.sort(key=lambda x: _timecode_to_seconds(x.get("start_time", "00:00:00.000")))
 
-    overall = await _generate_overall_from_items(api_key, model, deduped)
+    overall = await _generate_overall_from_items(api_key, model, deduped, regenerate)
 
     result = {
         "overall_summary": overall or "",
@@ -5540,46 +5796,53 @@ async def _structured_transcript_chunked(
 
 
 async def _generate_overall_from_items(
-    api_key: str, model: str, items: list[dict]
+    api_key: str, model: str, items: list[dict], regenerate: bool = False
 ) -> str:
     """Generate an overall_summary from already-segmented items."""
     summaries = "\n".join(
         f"- {it.get('label', '')}: {it.get('summary', '')}" for it in items
     )
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": (
-                                "Ты — ассистент. Напиши общее описание встречи на русском "
-                                "(3-5 предложений) на основе списка обсуждённых тем. "
-                                "Отвечай только текстом описания."
-                            ),
-                        },
-                        {"role": "user", "content": f"Темы встречи:\n\n{summaries[:6000]}"},
-                    ],
-                    "max_tokens": 500,
-                    "temperature": 0.3,
-                },
-                timeout=aiohttp.ClientTimeout(total=60),
-            ) as resp:
-                data = await resp.json()
-                return data["choices"][0]["message"]["content"].strip()
-    except Exception as e:
-        logger.error(f"Overall summary generation error: {e}")
-        return ""
-
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "Ты — ассистент. Напиши общее описание встречи на русском "
+                "(3-5 предложений) на основе списка обсуждённых тем. "
+                "Отвечай только текстом описания."
+            ),
+        },
+        {"role": "user", "content": f"Темы встречи:\n\n{summaries[:6000]}"},
+    ]
 
-async def _send_telegram_notification(chat_id: str, text: str) -> bool:
+    async def _call() -> str:
+        try:
+            async with pooled_session() as session:
+                async with session.post(
+                    "https://openrouter.ai/api/v1/chat/completions",
+                    headers={
+                        "Authorization": f"Bearer {api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    json={
+                        "model": model,
+                        "messages": messages,
+                        "max_tokens": 500,
+                        "temperature": 0.3,
+                    },
+                    timeout=aiohttp.ClientTimeout(total=60),
+                ) as resp:
+                    data = await resp.json()
+                    return data["choices"][0]["message"]["content"].strip()
+        except Exception as e:
+            logger.error(f"Overall summary generation error: {e}")
+            return ""
+
+    return await llm_cache.get_or_call(
+        model, messages, {'max_tokens': 500, 'temperature': 0.3}, _call, bypass=regenerate,
+    ) or ""
+
+
+async def _send_telegram_notification(chat_id: str, text: str) -> bool:
     """Send an HTML message to a Telegram chat via Bot API (no library needed)."""
     token = config.telegram_token
     if not token or not chat_id:
@@ -5592,7 +5855,7 @@ async def _send_telegram_notification(chat_id: str, text: str) -> bool:
         "disable_web_page_preview": True,
     }
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=15)) as resp:
                 if resp.status != 200:
                     body = await resp.text()
@@ -5650,7 +5913,7 @@ async def zoom_webhook(request):
         start_time_str = format_start_time(start_time_dt)
         end_time_str = format_end_time(start_time_dt, duration) if start_time_dt else None
 
-        db_meeting = await db.get_zoom_meeting(meeting_id) if meeting_id else None
+        db_meeting = await db.get_meeting_light(meeting_id) if meeting_id else None
         host_name = None
         if db_meeting:
             host_name = db_meeting.get("host_name")
@@ -5737,7 +6000,7 @@ async def zoom_webhook(request):
             logger.info(f"Meeting {meeting_id}: downloading Zoom VTT transcript...")
             try:
                 token = await zoom_client.get_access_token()
-                async with aiohttp.ClientSession() as session:
+                async with pooled_session() as session:
                     async with session.get(
                         transcript_download_url,
                         headers={"Authorization": f"Bearer {token}"},
@@ -5755,7 +6018,7 @@ async def zoom_webhook(request):
             logger.info(f"Meeting {meeting_id}: no TRANSCRIPT, downloading Zoom SUMMARY instead...")
             try:
                 token = await zoom_client.get_access_token()
-                async with aiohttp.ClientSession() as session:
+                async with pooled_session() as session:
                     async with session.get(
                         summary_download_url,
                         headers={"Authorization": f"Bearer {token}"},
@@ -5796,8 +6059,7 @@ async def zoom_webhook(request):
             logger.error(f"Meeting {meeting_id}: failed to update recording in DB: {e}")
 
         # Download video and audio from Zoom and upload to S3
-        asyncio.create_task(_upload_video_to_s3(meeting_id))
-        asyncio.create_task(_upload_audio_to_s3(meeting_id))
+        await enqueue_s3_uploads(meeting_id)
 
         webapp_url = config.webapp_url or ''
         public_page_url = f"{webapp_url}/meeting/{public_token}" if webapp_url else None
@@ -5806,7 +6068,7 @@ async def zoom_webhook(request):
         if lark_client and summary:
             try:
                 # Get meeting details for Lark card
-                db_meeting = await db.get_zoom_meeting(meeting_id)
+                db_meeting = await db.get_meeting_light(meeting_id)
                 host_name = db_meeting.get('host_name') if db_meeting else None
                 start_time_str = format_start_time(db_meeting.get('start_time')) if db_meeting else None
                 end_time_str = format_end_time(db_meeting.get('start_time'), duration) if db_meeting and db_meeting.get('start_time') else None
@@ -5840,11 +6102,11 @@ async def zoom_webhook(request):
                 f"Meeting {meeting_id}: no TRANSCRIPT file from Zoom. "
                 "Starting audio-based auto-transcription and polling as fallback."
             )
-            asyncio.create_task(_poll_transcript_later(meeting_id, topic, duration, recording_url, public_token))
-            asyncio.create_task(_safe_auto_transcribe(meeting_id))
+            await _schedule_transcript_poll(meeting_id, topic, duration, recording_url, public_token)
+            await enqueue_transcribe(meeting_id)
 
         # Trigger embedding generation for any projects this meeting belongs to
-        asyncio.create_task(_embed_projects_for_meeting(meeting_id))
+        await enqueue_embed_projects(meeting_id)
 
         return web.json_response({"status": "ok"})
 
@@ -5875,7 +6137,7 @@ async def zoom_webhook(request):
         if zoom_client:
             try:
                 token = await zoom_client.get_access_token()
-                async with aiohttp.ClientSession() as session:
+                async with pooled_session() as session:
                     async with session.get(
                         transcript_download_url,
                         headers={"Authorization": f"Bearer {token}"},
@@ -5913,7 +6175,7 @@ async def zoom_webhook(request):
 
         # Only send Lark card if we have a summary
         if lark_client and summary:
-            db_meeting = await db.get_zoom_meeting(meeting_id)
+            db_meeting = await db.get_meeting_light(meeting_id)
             if db_meeting and db_meeting.get("lark_message_id"):
                 try:
                     await lark_client.delete_message(db_meeting["lark_message_id"])
@@ -5959,7 +6221,7 @@ async def zoom_webhook(request):
         elif lark_client and not summary:
             logger.info(f"Meeting {meeting_id}: Lark card NOT sent via transcript.completed — no summary yet")
 
-        asyncio.create_task(_embed_projects_for_meeting(meeting_id))
+        await enqueue_embed_projects(meeting_id)
 
         return web.json_response({"status": "ok"})
 
@@ -5986,7 +6248,7 @@ async def zoom_webhook(request):
             except Exception as e:
                 logger.warning(f"Meeting {meeting_id}: could not fetch actual duration: {e}")
 
-        db_meeting = await db.get_zoom_meeting(meeting_id)
+        db_meeting = await db.get_meeting_light(meeting_id)
 
         await db.update_meeting_status(meeting_id, "ended")
 
@@ -6107,21 +6369,12 @@ async def _gather_participant_names(meeting_id: int, db_meeting: dict | None) ->
     return names
 
 
-async def _safe_auto_transcribe(meeting_id: int):
-    """Wrapper for background auto-transcribe that catches all exceptions and logs them."""
-    try:
-        await _auto_transcribe_audio(meeting_id)
-    except Exception as e:
-        logger.error(f"Meeting {meeting_id}: background auto-transcribe crashed: {e}")
-        await _send_lark_recording_card_no_summary(meeting_id)
-
-
 async def _send_lark_recording_card_no_summary(meeting_id: int):
     """Send a Lark recording card without summary (used when transcription fails but recording exists)."""
     if not lark_client:
         return
     try:
-        db_meeting = await db.get_zoom_meeting(meeting_id)
+        db_meeting = await db.get_meeting_light(meeting_id)
         if not db_meeting:
             return
 
@@ -6163,16 +6416,228 @@ async def _send_lark_recording_card_no_summary(meeting_id: int):
         logger.error(f"Meeting {meeting_id}: failed to send Lark recording card (no summary): {e}")
 
 
-async def _auto_transcribe_audio(meeting_id: int, provided_audio: bytes = None, provided_audio_fmt: str = None, instance_uuid: str = None):
+_TRANSCRIBE_SEGMENT_SECONDS = 600
+_TRANSCRIBE_MAX_RETRIES = 3
+_TRANSCRIBE_RETRY_DELAYS = [5, 15, 30]
+# Max audio chunks sent to OpenRouter in parallel for one recording
+_TRANSCRIBE_CONCURRENCY = int(os.getenv('TRANSCRIBE_CONCURRENCY') or 4)
+
+
+def _read_file_b64(path: str) -> str:
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode("ascii")
+
+
+async def _transcribe_audio_chunk(meeting_id: int, api_key: str, participant_names: list[str],
+                                  fmt: str, chunk_path: str, *, idx: int = 0, total: int = 1,
+                                  offset_seconds: int = 0) -> str | None:
+    """Transcribe one on-disk audio chunk via OpenRouter with retry/backoff.
+    The chunk is read and base64-encoded only here, so at most `concurrency`
+    encoded segments are in memory at once.
+    Returns the chunk text, or None if every attempt failed."""
+    chunk_size = os.path.getsize(chunk_path)
+    b64 = await asyncio.get_event_loop().run_in_executor(None, _read_file_b64, chunk_path)
+    for attempt in range(_TRANSCRIBE_MAX_RETRIES):
+        attempt_suffix = f" (attempt {attempt+1}/{_TRANSCRIBE_MAX_RETRIES})" if attempt > 0 else ""
+        logger.info(f"Meeting {meeting_id}: transcribing chunk {idx+1}/{total} ({chunk_size} bytes, offset={offset_seconds}s){attempt_suffix}")
+        try:
+            async with pooled_session() as session:
+                async with session.post(
+                    "https://openrouter.ai/api/v1/chat/completions",
+                    headers={
+                        "Authorization": f"Bearer {api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    json={
+                        "model": "google/gemini-3-flash-preview",
+                        "provider": {
+                            "ignore": ["Google AI Studio"],
+                        },
+                        "messages": [
+                            {
+                                "role": "user",
+                                "content": [
+                                    {
+                                        "type": "text",
+                                        "text": _build_transcription_prompt(participant_names, offset_seconds=offset_seconds),
+                                    },
+                                    {
+                                        "type": "input_audio",
+                                        "input_audio": {"data": b64, "format": fmt},
+                                    },
+                                ],
+                            }
+                        ],
+                    },
+                    timeout=aiohttp.ClientTimeout(total=600),
+                ) as resp:
+                    data = await resp.json()
+                    if resp.status != 200 or "error" in data:
+                        logger.warning(f"Meeting {meeting_id}: OpenRouter error on chunk {idx+1}{attempt_suffix}: {str(data)[:500]}")
+                    elif "choices" in data:
+                        chunk_text = data["choices"][0]["message"]["content"].strip()
+                        logger.info(f"Meeting {meeting_id}: chunk {idx+1} transcribed — {len(chunk_text)} chars")
+                        return chunk_text
+                    elif "text" in data:
+                        chunk_text = data["text"].strip()
+                        logger.info(f"Meeting {meeting_id}: chunk {idx+1} transcribed — {len(chunk_text)} chars")
+                        return chunk_text
+                    else:
+                        logger.warning(f"Meeting {meeting_id}: unexpected OpenRouter response on chunk {idx+1}{attempt_suffix}: {str(data)[:300]}")
+        except asyncio.TimeoutError:
+            logger.warning(f"Meeting {meeting_id}: transcription timeout on chunk {idx+1}{attempt_suffix}")
+        except Exception as e:
+            logger.warning(f"Meeting {meeting_id}: transcription error on chunk {idx+1}{attempt_suffix}: {e}")
+        if attempt < _TRANSCRIBE_MAX_RETRIES - 1:
+            await asyncio.sleep(_TRANSCRIBE_RETRY_DELAYS[attempt])
+    return None
+
+
+_STREAM_CHUNK_BYTES = 1024 * 1024
+_MAX_TRANSCRIBE_CHUNK_BYTES = 9 * 1024 * 1024  # 9MB — ~10 min per chunk at 128kbps, avoids AI token truncation
+
+
+async def _download_url_to_file(url: str, dest_path: str, timeout: int = 300) -> int:
+    """Stream an HTTP(S) object (e.g. a public S3 URL) to disk chunk by chunk.
+    Returns the number of bytes written, or 0 on a non-200 response."""
+    size = 0
+    async with pooled_session() as session:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            if resp.status != 200:
+                logger.warning(f"Download of {url} failed (status {resp.status})")
+                return 0
+            with open(dest_path, "wb") as f:
+                async for chunk in resp.content.iter_chunked(_STREAM_CHUNK_BYTES):
+                    f.write(chunk)
+                    size += len(chunk)
+    return size
+
+
+async def _extract_audio_file(src_path: str, dst_path: str, timeout: int = 300) -> bool:
+    """ffmpeg file-to-file: drop the video stream and encode audio as 128k mp3."""
+    rc, _, stderr = await _run_ffmpeg(
+        "-y", "-i", src_path, "-vn", "-b:a", "128k", "-f", "mp3", dst_path,
+        timeout=timeout,
+    )
+    if rc != 0:
+        logger.error(f"ffmpeg audio extraction from {src_path} failed: {stderr.decode()[:500]}")
+        if os.path.exists(dst_path):
+            os.unlink(dst_path)
+        return False
+    return True
+
+
+async def _fetch_s3_media(url: str, dest_path: str, download) -> int:
+    """`download(path)` through the on-disk media cache, keyed by URL + ETag so a
+    re-uploaded object is never served stale. Uncached when the ETag is unknown."""
+    loop = asyncio.get_running_loop()
+    etag = await loop.run_in_executor(None, s3_client.object_etag, url)
+    if not etag:
+        return await download(dest_path)
+    return await media_cache.fetch(f"{url}#{etag}", dest_path, download)
+
+
+async def _acquire_meeting_audio(meeting_id: int, db_meeting: dict | None, workdir: str,
+                                 instance_uuid: str | None = None) -> tuple[str, str] | None:
+    """Put the meeting's audio on disk inside `workdir`: S3 audio, else audio
+    extracted from the S3 video, else the Zoom recording. Returns (path, fmt)."""
+    if db_meeting and db_meeting.get('audio_s3_url'):
+        try:
+            logger.info(f"Meeting {meeting_id}: downloading audio from S3")
+            audio_url = db_meeting['audio_s3_url']
+            audio_fmt = audio_url.rsplit('.', 1)[-1] or 'mp3'
+            path = os.path.join(workdir, f"s3_audio.{audio_fmt}")
+            size = await _fetch_s3_media(
+                audio_url, path,
+                lambda p: _download_url_to_file(s3_client.signed_url(audio_url), p, timeout=300),
+            )
+            if size:
+                logger.info(f"Meeting {meeting_id}: audio from S3 ({audio_fmt}, {size} bytes)")
+                return path, audio_fmt
+        except Exception as e:
+            logger.error(f"Meeting {meeting_id}: error downloading audio from S3: {e}")
+
+    if db_meeting and db_meeting.get('video_s3_url'):
+        try:
+            video_url = db_meeting['video_s3_url']
+            video_ext = video_url.rsplit('.', 1)[-1] or 'mp4'
+
+            async def extract_from_video(dest_path: str) -> int:
+                logger.info(f"Meeting {meeting_id}: downloading video from S3 to extract audio")
+                video_path = os.path.join(workdir, f"s3_video.{video_ext}")
+                size = await _download_url_to_file(s3_client.signed_url(video_url), video_path, timeout=600)
+                if not size:
+                    return 0
+                logger.info(f"Meeting {meeting_id}: video from S3 ({size} bytes), extracting audio")
+                ok = await _extract_audio_file(video_path, dest_path, timeout=300)
+                os.unlink(video_path)
+                return os.path.getsize(dest_path) if ok else 0
+
+            # Cached under the video's key: reprocessing skips both the download and ffmpeg.
+            audio_path = os.path.join(workdir, "extracted.mp3")
+            if await _fetch_s3_media(video_url, audio_path, extract_from_video):
+                logger.info(f"Meeting {meeting_id}: audio from S3 video ({os.path.getsize(audio_path)} bytes)")
+                return audio_path, "mp3"
+        except Exception as e:
+            logger.error(f"Meeting {meeting_id}: error extracting audio from S3 video: {e}")
+
+    if not zoom_client:
+        logger.warning(f"Meeting {meeting_id}: auto-transcribe skipped — no audio source available")
+        return None
+    logger.info(f"Meeting {meeting_id}: auto-transcribe starting (audio from Zoom{', instance=' + instance_uuid if instance_uuid else ''})")
+    audio_result = await zoom_client.download_meeting_audio_to_file(meeting_id, workdir, instance_uuid=instance_uuid)
+    if not audio_result:
+        logger.warning(f"Meeting {meeting_id}: auto-transcribe — no audio available from any source")
+        return None
+    logger.info(f"Meeting {meeting_id}: audio downloaded from Zoom ({audio_result[1]}, {os.path.getsize(audio_result[0])} bytes)")
+    return audio_result
+
+
+async def _split_audio_file(meeting_id: int, audio_path: str, audio_fmt: str, workdir: str) -> list[tuple[str, str]] | None:
+    """Convert to mp3 if needed and cut into segment files on disk.
+    Returns [(fmt, chunk_path), ...] in offset order, or None on ffmpeg failure."""
+    if audio_fmt not in ("mp3", "wav"):
+        logger.info(f"Meeting {meeting_id}: converting {audio_fmt} -> mp3 via ffmpeg")
+        dst_path = os.path.join(workdir, "converted.mp3")
+        rc, _, stderr = await _run_ffmpeg(
+            "-y", "-i", audio_path, "-b:a", "128k", "-f", "mp3", dst_path,
+            timeout=600,
+        )
+        if rc != 0:
+            logger.error(f"Meeting {meeting_id}: ffmpeg conversion failed: {stderr.decode()[:500]}")
+            return None
+        audio_path, audio_fmt = dst_path, "mp3"
+        logger.info(f"Meeting {meeting_id}: converted to mp3 — {os.path.getsize(audio_path)} bytes")
+
+    if os.path.getsize(audio_path) <= _MAX_TRANSCRIBE_CHUNK_BYTES:
+        return [(audio_fmt, audio_path)]
+
+    chunk_dir = os.path.join(workdir, "chunks")
+    os.makedirs(chunk_dir, exist_ok=True)
+    pattern = os.path.join(chunk_dir, "chunk_%03d.mp3")
+    rc, _, stderr = await _run_ffmpeg(
+        "-y", "-i", audio_path, "-f", "segment", "-segment_time", str(_TRANSCRIBE_SEGMENT_SECONDS),
+        "-b:a", "128k", pattern,
+        timeout=600,
+    )
+    if rc != 0:
+        logger.error(f"Meeting {meeting_id}: ffmpeg split failed: {stderr.decode()[:500]}")
+        return None
+    chunks = [("mp3", path) for path in sorted(glob.glob(os.path.join(chunk_dir, "chunk_*.mp3")))]
+    logger.info(f"Meeting {meeting_id}: split into {len(chunks)} chunks")
+    return chunks
+
+
+async def _auto_transcribe_audio(meeting_id: int, provided_audio_path: str = None, provided_audio_fmt: str = None, instance_uuid: str = None):
     """Background: transcribe audio via OpenRouter, save transcript/summary, send Lark card.
-    If provided_audio is given, uses it directly; otherwise downloads from Zoom.
-    If instance_uuid is provided, downloads from that specific Zoom instance."""
-    import base64
-    import tempfile
-    import glob as glob_module
-
-    db_meeting = await db.get_zoom_meeting(meeting_id)
-    if db_meeting and db_meeting.get("transcript_text"):
+    If provided_audio_path is given, uses that file (the caller owns it);
+    otherwise streams audio from S3/Zoom into a temp dir.
+    If instance_uuid is provided, downloads from that specific Zoom instance.
+
+    Audio only ever lives on disk; segments are read and base64-encoded one
+    at a time by the chunk transcriber, so memory is bounded by segment size."""
+    db_meeting = await db.get_meeting_light(meeting_id)
+    if db_meeting and db_meeting.get("has_transcript"):
         logger.info(f"Meeting {meeting_id}: auto-transcribe skipped — transcript already in DB")
         return
 
@@ -6184,254 +6649,135 @@ async def _auto_transcribe_audio(meeting_id: int, provided_audio: bytes = None,
     # Gather participant names for speaker identification
     participant_names = await _gather_participant_names(meeting_id, db_meeting)
 
-    if provided_audio:
-        audio_bytes = provided_audio
-        audio_fmt = provided_audio_fmt or "mp3"
-        logger.info(f"Meeting {meeting_id}: auto-transcribe starting (provided audio, {audio_fmt}, {len(audio_bytes)} bytes)")
-    else:
-        audio_bytes = None
-        audio_fmt = "mp3"
-
-        if db_meeting and db_meeting.get('audio_s3_url'):
-            try:
-                logger.info(f"Meeting {meeting_id}: downloading audio from S3")
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(db_meeting['audio_s3_url'], timeout=aiohttp.ClientTimeout(total=300)) as resp:
-                        if resp.status == 200:
-                            audio_bytes = await resp.read()
-                            audio_fmt = db_meeting['audio_s3_url'].rsplit('.', 1)[-1] or 'mp3'
-                            logger.info(f"Meeting {meeting_id}: audio from S3 ({audio_fmt}, {len(audio_bytes)} bytes)")
-                        else:
-                            logger.warning(f"Meeting {meeting_id}: S3 audio download failed (status {resp.status})")
-            except Exception as e:
-                logger.error(f"Meeting {meeting_id}: error downloading audio from S3: {e}")
-
-        if not audio_bytes and db_meeting and db_meeting.get('video_s3_url'):
-            try:
-                logger.info(f"Meeting {meeting_id}: downloading video from S3 to extract audio")
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(db_meeting['video_s3_url'], timeout=aiohttp.ClientTimeout(total=600)) as resp:
-                        if resp.status == 200:
-                            video_bytes = await resp.read()
-                            video_ext = db_meeting['video_s3_url'].rsplit('.', 1)[-1] or 'mp4'
-                            logger.info(f"Meeting {meeting_id}: video from S3 ({len(video_bytes)} bytes), extracting audio")
-                            with tempfile.NamedTemporaryFile(suffix=f".{video_ext}", delete=False) as src:
-                                src.write(video_bytes)
-                                src_path = src.name
-                            del video_bytes
-                            dst_path = src_path.rsplit(".", 1)[0] + ".mp3"
-                            rc, _, stderr = await _run_ffmpeg(
-                                "-y", "-i", src_path, "-vn", "-b:a", "128k", "-f", "mp3", dst_path,
-                                timeout=300,
-                            )
-                            os.unlink(src_path)
-                            if rc == 0:
-                                with open(dst_path, "rb") as f:
-                                    audio_bytes = f.read()
-                                os.unlink(dst_path)
-                                audio_fmt = "mp3"
-                                logger.info(f"Meeting {meeting_id}: audio extracted from video ({len(audio_bytes)} bytes)")
-                                if s3_client:
-                                    asyncio.create_task(_upload_audio_to_s3(meeting_id, audio_bytes, audio_fmt))
-                            else:
-                                logger.error(f"Meeting {meeting_id}: ffmpeg extraction failed: {stderr.decode()[:500]}")
-                                if os.path.exists(dst_path):
-                                    os.unlink(dst_path)
-                        else:
-                            logger.warning(f"Meeting {meeting_id}: S3 video download failed (status {resp.status})")
-            except Exception as e:
-                logger.error(f"Meeting {meeting_id}: error extracting audio from S3 video: {e}")
-
-        if not audio_bytes:
-            if not zoom_client:
-                logger.warning(f"Meeting {meeting_id}: auto-transcribe skipped — no audio source available")
-                return
-            logger.info(f"Meeting {meeting_id}: auto-transcribe starting (audio from Zoom{', instance=' + instance_uuid if instance_uuid else ''})")
-            audio_result = await zoom_client.download_meeting_audio(meeting_id, instance_uuid=instance_uuid)
-            if not audio_result:
-                logger.warning(f"Meeting {meeting_id}: auto-transcribe — no audio available from any source")
+    workdir = tempfile.mkdtemp(prefix=f"transcribe_{meeting_id}_")
+    s3_upload = None
+    try:
+        if provided_audio_path:
+            audio_path, audio_fmt = provided_audio_path, provided_audio_fmt or "mp3"
+            logger.info(f"Meeting {meeting_id}: auto-transcribe starting (provided audio, {audio_fmt}, {os.path.getsize(audio_path)} bytes)")
+        else:
+            acquired = await _acquire_meeting_audio(meeting_id, db_meeting, workdir, instance_uuid)
+            if not acquired:
                 return
-            audio_bytes, audio_fmt = audio_result
-            logger.info(f"Meeting {meeting_id}: audio downloaded from Zoom ({audio_fmt}, {len(audio_bytes)} bytes)")
+            audio_path, audio_fmt = acquired
 
-    if not db_meeting or not db_meeting.get('audio_s3_url'):
-        asyncio.create_task(_upload_audio_to_s3(meeting_id, audio_bytes, audio_fmt))
+        if s3_client and (not db_meeting or not db_meeting.get('audio_s3_url')):
+            s3_upload = asyncio.create_task(_upload_audio_to_s3(meeting_id, audio_path, audio_fmt))
 
-    # Convert to mp3 if needed
-    if audio_fmt not in ("mp3", "wav"):
         try:
-            logger.info(f"Meeting {meeting_id}: converting {audio_fmt} -> mp3 via ffmpeg")
-            with tempfile.NamedTemporaryFile(suffix=f".{audio_fmt}", delete=False) as src:
-                src.write(audio_bytes)
-                src_path = src.name
-            dst_path = src_path.rsplit(".", 1)[0] + ".mp3"
-            rc, _, stderr = await _run_ffmpeg(
-                "-y", "-i", src_path, "-b:a", "128k", "-f", "mp3", dst_path,
-                timeout=600,
-            )
-            os.unlink(src_path)
-            if rc != 0:
-                logger.error(f"Meeting {meeting_id}: ffmpeg conversion failed: {stderr.decode()[:500]}")
-                return
-            with open(dst_path, "rb") as f:
-                audio_bytes = f.read()
-            os.unlink(dst_path)
-            audio_fmt = "mp3"
-            logger.info(f"Meeting {meeting_id}: converted to mp3 — {len(audio_bytes)} bytes")
+            chunks = await _split_audio_file(meeting_id, audio_path, audio_fmt, workdir)
         except Exception as e:
-            logger.error(f"Meeting {meeting_id}: audio conversion error: {e}")
+            logger.error(f"Meeting {meeting_id}: failed to prepare audio chunks: {e}")
             return
-
-    MAX_CHUNK_BYTES = 9 * 1024 * 1024  # 9MB — ~10 min per chunk at 128kbps, avoids AI token truncation
-    chunks = []
-
-    if len(audio_bytes) > MAX_CHUNK_BYTES:
-        try:
-            with tempfile.NamedTemporaryFile(suffix=f".{audio_fmt}", delete=False) as src:
-                src.write(audio_bytes)
-                src_path = src.name
-            chunk_dir = tempfile.mkdtemp()
-            pattern = os.path.join(chunk_dir, "chunk_%03d.mp3")
-            rc, _, stderr = await _run_ffmpeg(
-                "-y", "-i", src_path, "-f", "segment", "-segment_time", "600",
-                "-b:a", "128k", pattern,
-                timeout=600,
-            )
-            os.unlink(src_path)
-            if rc != 0:
-                logger.error(f"Meeting {meeting_id}: ffmpeg split failed: {stderr.decode()[:500]}")
-                return
-            for chunk_file in sorted(glob_module.glob(os.path.join(chunk_dir, "chunk_*.mp3"))):
-                with open(chunk_file, "rb") as f:
-                    chunks.append(("mp3", f.read()))
-                os.unlink(chunk_file)
-            os.rmdir(chunk_dir)
-            logger.info(f"Meeting {meeting_id}: split into {len(chunks)} chunks")
-        except Exception as e:
-            logger.error(f"Meeting {meeting_id}: failed to split audio: {e}")
+        if not chunks:
             return
-    else:
-        chunks = [(audio_fmt, audio_bytes)]
-
-    MAX_RETRIES = 3
-    RETRY_DELAYS = [5, 15, 30]
 
-    SEGMENT_DURATION = 600
-
-    full_transcript = []
-    for idx, (fmt, chunk_bytes) in enumerate(chunks):
-        b64 = base64.b64encode(chunk_bytes).decode('utf-8')
-        chunk_text = None
-        chunk_offset_seconds = idx * SEGMENT_DURATION if len(chunks) > 1 else 0
-
-        for attempt in range(MAX_RETRIES):
-            attempt_suffix = f" (attempt {attempt+1}/{MAX_RETRIES})" if attempt > 0 else ""
-            logger.info(f"Meeting {meeting_id}: transcribing chunk {idx+1}/{len(chunks)} ({len(chunk_bytes)} bytes, offset={chunk_offset_seconds}s){attempt_suffix}")
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        "https://openrouter.ai/api/v1/chat/completions",
-                        headers={
-                            "Authorization": f"Bearer {api_key}",
-                            "Content-Type": "application/json",
-                        },
-                        json={
-                            "model": "google/gemini-3-flash-preview",
-                            "provider": {
-                                "ignore": ["Google AI Studio"],
-                            },
-                            "messages": [
-                                {
-                                    "role": "user",
-                                    "content": [
-                                        {
-                                            "type": "text",
-                                            "text": _build_transcription_prompt(participant_names, offset_seconds=chunk_offset_seconds),
-                                        },
-                                        {
-                                            "type": "input_audio",
-                                            "input_audio": {"data": b64, "format": fmt},
-                                        },
-                                    ],
-                                }
-                            ],
-                        },
-                        timeout=aiohttp.ClientTimeout(total=600),
-                    ) as resp:
-                        data = await resp.json()
-                        if resp.status != 200 or "error" in data:
-                            logger.warning(f"Meeting {meeting_id}: OpenRouter error on chunk {idx+1}{attempt_suffix}: {str(data)[:500]}")
-                            if attempt < MAX_RETRIES - 1:
-                                await asyncio.sleep(RETRY_DELAYS[attempt])
-                                continue
-                            break
-                        if "choices" in data:
-                            chunk_text = data["choices"][0]["message"]["content"].strip()
-                        elif "text" in data:
-                            chunk_text = data["text"].strip()
-                        else:
-                            logger.warning(f"Meeting {meeting_id}: unexpected OpenRouter response on chunk {idx+1}{attempt_suffix}: {str(data)[:300]}")
-                            if attempt < MAX_RETRIES - 1:
-                                await asyncio.sleep(RETRY_DELAYS[attempt])
-                                continue
-                            break
-                        logger.info(f"Meeting {meeting_id}: chunk {idx+1} transcribed — {len(chunk_text)} chars")
-                        break
-            except asyncio.TimeoutError:
-                logger.warning(f"Meeting {meeting_id}: transcription timeout on chunk {idx+1}{attempt_suffix}")
-                if attempt < MAX_RETRIES - 1:
-                    await asyncio.sleep(RETRY_DELAYS[attempt])
-                    continue
-                break
-            except Exception as e:
-                logger.warning(f"Meeting {meeting_id}: transcription error on chunk {idx+1}{attempt_suffix}: {e}")
-                if attempt < MAX_RETRIES - 1:
-                    await asyncio.sleep(RETRY_DELAYS[attempt])
-                    continue
-                break
+        await _transcribe_and_save(meeting_id, api_key, participant_names, chunks)
+    finally:
+        # The S3 upload reads from workdir, so let it finish before cleanup
+        if s3_upload:
+            await s3_upload
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+async def _transcribe_and_save(meeting_id: int, api_key: str, participant_names: list[str],
+                               chunks: list[tuple[str, str]]):
+    """Transcribe on-disk chunks, save transcript/summary/structured transcript, send Lark card."""
+    total_chunks = len(chunks)
+
+    async def _transcribe_indexed(item: tuple[int, tuple[str, str]]) -> str:
+        idx, (fmt, chunk_path) = item
+        offset_seconds = idx * _TRANSCRIBE_SEGMENT_SECONDS if total_chunks > 1 else 0
+        text = await _transcribe_audio_chunk(
+            meeting_id, api_key, participant_names, fmt, chunk_path,
+            idx=idx, total=total_chunks, offset_seconds=offset_seconds,
+        )
+        if text is None:
+            raise RuntimeError(f"chunk {idx+1} failed after {_TRANSCRIBE_MAX_RETRIES} attempts")
+        return text
 
-        if chunk_text is None:
-            logger.error(f"Meeting {meeting_id}: chunk {idx+1} failed after {MAX_RETRIES} attempts, aborting transcription")
-            await db.update_meeting_status(meeting_id, 'recorded')
-            await _send_lark_recording_card_no_summary(meeting_id)
-            return
-        full_transcript.append(chunk_text)
+    logger.info(f"Meeting {meeting_id}: transcribing {total_chunks} chunk(s), concurrency={_TRANSCRIBE_CONCURRENCY}")
+    try:
+        full_transcript = await gather_bounded(
+            list(enumerate(chunks)), _transcribe_indexed, limit=_TRANSCRIBE_CONCURRENCY,
+        )
+    except Exception as e:
+        logger.error(f"Meeting {meeting_id}: {e}, aborting transcription")
+        await db.update_meeting_status(meeting_id, 'recorded')
+        await _send_lark_recording_card_no_summary(meeting_id)
+        return
 
     transcript_text = "\n\n".join(full_transcript)
     logger.info(f"Meeting {meeting_id}: auto-transcription complete — {len(transcript_text)} chars")
 
     # Re-check: another path might have saved transcript while we were transcribing
-    fresh = await db.get_zoom_meeting(meeting_id)
-    if fresh and fresh.get("transcript_text"):
+    fresh = await db.get_meeting_light(meeting_id)
+    if fresh and fresh.get("has_transcript"):
         logger.info(f"Meeting {meeting_id}: auto-transcribe — transcript arrived via other path, skipping save")
         return
 
-    summary = await generate_summary(transcript_text)
+    await _post_transcription_stage(meeting_id, api_key, transcript_text)
 
-    structured_transcript_json = None
-    vtt_entries = parse_vtt(transcript_text)
-    if vtt_entries:
-        structured_transcript_json = await generate_structured_transcript(vtt_entries)
-    else:
-        model = os.getenv('OPENROUTER_MODEL', 'gpt-4o')
-        if transcript_text:
-            structured_transcript_json = await _structured_transcript_single(api_key, model, transcript_text[:200000])
 
-    try:
+async def _post_transcription_stage(meeting_id: int, api_key: str, transcript_text: str):
+    """Summary, structured transcript, short summary and the Lark card as a DAG.
+
+    The transcript is saved first; every other result is written as soon as
+    it exists, and the Lark card goes out once the summary and short summary
+    are ready — it does not wait for the (much slower) structured transcript.
+    """
+    t0 = time.monotonic()
+
+    async def _save_transcript():
         await db.update_meeting_transcript_and_summary(
             meeting_id=meeting_id,
             transcript_text=transcript_text[:500000],
-            summary=summary or None,
+            summary=None,
         )
-        if structured_transcript_json:
-            await db.update_meeting_structured_transcript(meeting_id, structured_transcript_json)
-        logger.info(f"Meeting {meeting_id}: auto-transcribe — transcript + summary saved")
-    except Exception as e:
-        logger.error(f"Meeting {meeting_id}: auto-transcribe — failed to save to DB: {e}")
-        return
 
-    if lark_client and summary:
-        db_meeting = await db.get_zoom_meeting(meeting_id)
+    # The two LLM steps degrade to "no result" instead of failing, so the
+    # saves, the card and embedding still run on whatever is available.
+    async def _summary():
+        try:
+            return await generate_summary(transcript_text)
+        except Exception as e:
+            logger.error(f"Meeting {meeting_id}: summary generation failed: {e}")
+            return ""
+
+    async def _structured():
+        try:
+            vtt_entries = parse_vtt(transcript_text)
+            if vtt_entries:
+                return await generate_structured_transcript(vtt_entries)
+            model = os.getenv('OPENROUTER_MODEL', 'gpt-4o')
+            if transcript_text:
+                return await _structured_transcript_single(api_key, model, transcript_text[:200000])
+        except Exception as e:
+            logger.error(f"Meeting {meeting_id}: structured transcript generation failed: {e}")
+        return None
+
+    async def _save_summary(_, summary):
+        if summary:
+            await db.update_meeting_summary(meeting_id, summary)
+
+    async def _save_structured(_, structured_json):
+        if structured_json:
+            await db.update_meeting_structured_transcript(meeting_id, structured_json)
+
+    async def _short_summary(summary):
+        return await generate_short_summary(summary) if summary and lark_client else ""
+
+    async def _card_context(_):
+        if not lark_client:
+            return None
+        db_meeting = await db.get_meeting_light(meeting_id)
+        participants = await get_participants_with_notes(meeting_id)
+        return db_meeting, participants
+
+    async def _lark_card(summary, short_summary, context, _):
+        if not lark_client or not summary:
+            return
+        db_meeting, participants = context
         if db_meeting and db_meeting.get("lark_message_id"):
             try:
                 await lark_client.delete_message(db_meeting["lark_message_id"])
@@ -6447,44 +6793,61 @@ async def _auto_transcribe_audio(meeting_id: int, provided_audio: bytes = None,
         host_name = db_meeting.get('host_name') if db_meeting else None
         start_time_str = format_start_time(db_meeting.get('start_time')) if db_meeting else None
         end_time_str = format_end_time(db_meeting.get('start_time'), duration) if db_meeting and db_meeting.get('start_time') else None
-        participants = await get_participants_with_notes(meeting_id)
-        short_summary = await generate_short_summary(summary)
 
-        try:
-            result = await lark_client.send_recording_card(
-                topic=topic,
-                recording_url=recording_url,
-                transcript_text=transcript_text[:3000],
-                summary=summary,
-                duration=duration,
-                public_page_url=public_page_url,
-                host_name=host_name,
-                start_time=start_time_str,
-                end_time=end_time_str,
-                participants=participants if participants else None,
-                short_summary=short_summary or None,
-            )
-            new_msg_id = result.get("data", {}).get("message_id")
-            if new_msg_id:
-                await db.update_meeting_lark_message_id(meeting_id, new_msg_id)
-            logger.info(f"Meeting {meeting_id}: Lark recording card sent after auto-transcription")
-        except Exception as e:
-            logger.error(f"Meeting {meeting_id}: failed to send Lark card after auto-transcription: {e}")
+        result = await lark_client.send_recording_card(
+            topic=topic,
+            recording_url=recording_url,
+            transcript_text=transcript_text[:3000],
+            summary=summary,
+            duration=duration,
+            public_page_url=public_page_url,
+            host_name=host_name,
+            start_time=start_time_str,
+            end_time=end_time_str,
+            participants=participants if participants else None,
+            short_summary=short_summary or None,
+        )
+        new_msg_id = result.get("data", {}).get("message_id")
+        if new_msg_id:
+            await db.update_meeting_lark_message_id(meeting_id, new_msg_id)
+        logger.info(
+            f"Meeting {meeting_id}: Lark recording card sent after auto-transcription "
+            f"({time.monotonic() - t0:.0f}s after transcript)"
+        )
 
-    asyncio.create_task(_embed_projects_for_meeting(meeting_id))
+    async def _embed(*_):
+        await enqueue_embed_projects(meeting_id)
+
+    steps = {
+        'save_transcript': ((), _save_transcript),
+        'summary': ((), _summary),
+        'structured': ((), _structured),
+        'save_summary': (('save_transcript', 'summary'), _save_summary),
+        'save_structured': (('save_transcript', 'structured'), _save_structured),
+        'short_summary': (('summary',), _short_summary),
+        'card_context': (('save_transcript',), _card_context),
+        'lark_card': (('summary', 'short_summary', 'card_context', 'save_summary'), _lark_card),
+        'embed': (('save_summary',), _embed),
+    }
+    results = await run_dag(steps)
+    for name, err in root_failures(steps, results).items():
+        logger.error(f"Meeting {meeting_id}: post-transcription step {name} failed: {err}")
+    logger.info(f"Meeting {meeting_id}: post-transcription stage done in {time.monotonic() - t0:.0f}s")
 
 
 async def _upload_video_to_s3(meeting_id: int):
-    """Download MP4 from Zoom and upload to S3 in the background."""
+    """Stream MP4 from Zoom to a temp file and upload it to S3 in the background."""
+    if not zoom_client or not s3_client:
+        return
+    workdir = tempfile.mkdtemp(prefix=f"video_{meeting_id}_")
     try:
-        if not zoom_client or not s3_client:
-            return
-        video_result = await zoom_client.download_meeting_video(meeting_id)
+        video_result = await zoom_client.download_meeting_video_to_file(meeting_id, workdir)
         if not video_result:
             logger.info(f"Meeting {meeting_id}: no video available for S3 upload")
             return
-        video_bytes, fmt = video_result
-        url = s3_client.upload_video(meeting_id, video_bytes, fmt)
+        video_path, fmt = video_result
+        url = await asyncio.get_event_loop().run_in_executor(
+            None, lambda: s3_client.upload_video_file(meeting_id, video_path, fmt))
         if url:
             await db.update_meeting_video_url(meeting_id, url)
             logger.info(f"Meeting {meeting_id}: video uploaded to S3 -> {url}")
@@ -6492,22 +6855,27 @@ async def _upload_video_to_s3(meeting_id: int):
             logger.error(f"Meeting {meeting_id}: S3 upload returned None")
     except Exception as e:
         logger.error(f"Meeting {meeting_id}: _upload_video_to_s3 error: {e}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
 
 
-async def _upload_audio_to_s3(meeting_id: int, audio_bytes: bytes | None = None, audio_fmt: str | None = None):
-    """Download audio from Zoom (or use provided bytes) and upload to S3."""
+async def _upload_audio_to_s3(meeting_id: int, audio_path: str | None = None, audio_fmt: str | None = None):
+    """Upload an on-disk audio file to S3, or stream it from Zoom to a temp file first."""
+    if not s3_client:
+        return
+    workdir = None
     try:
-        if not s3_client:
-            return
-        if audio_bytes is None:
+        if audio_path is None:
             if not zoom_client:
                 return
-            audio_result = await zoom_client.download_meeting_audio(meeting_id)
+            workdir = tempfile.mkdtemp(prefix=f"audio_{meeting_id}_")
+            audio_result = await zoom_client.download_meeting_audio_to_file(meeting_id, workdir)
             if not audio_result:
                 logger.info(f"Meeting {meeting_id}: no audio available for S3 upload")
                 return
-            audio_bytes, audio_fmt = audio_result
-        url = s3_client.upload_audio(meeting_id, audio_bytes, audio_fmt or "m4a")
+            audio_path, audio_fmt = audio_result
+        url = await asyncio.get_event_loop().run_in_executor(
+            None, lambda: s3_client.upload_audio_file(meeting_id, audio_path, audio_fmt or "m4a"))
         if url:
             await db.update_meeting_audio_url(meeting_id, url)
             logger.info(f"Meeting {meeting_id}: audio uploaded to S3 -> {url}")
@@ -6515,12 +6883,15 @@ async def _upload_audio_to_s3(meeting_id: int, audio_bytes: bytes | None = None,
             logger.error(f"Meeting {meeting_id}: S3 audio upload returned None")
     except Exception as e:
         logger.error(f"Meeting {meeting_id}: _upload_audio_to_s3 error: {e}")
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
 
 
 async def _embed_projects_for_meeting(meeting_id: int):
     """Re-generate embeddings for every project that contains this meeting."""
     try:
-        db_meeting = await db.get_zoom_meeting(meeting_id)
+        db_meeting = await db.get_meeting_light(meeting_id)
         if not db_meeting:
             return
         projects = await db.get_meeting_projects(db_meeting['id'])
@@ -6532,107 +6903,281 @@ async def _embed_projects_for_meeting(meeting_id: int):
 
 POLL_DELAYS = [600, 600, 600]  # 10 min, 20 min, 30 min total
 
-async def _poll_transcript_later(meeting_id: int, topic: str, duration: int,
-                                 recording_url: str, public_token: str):
-    """Background: poll Zoom API for transcript at increasing intervals."""
+
+async def _schedule_transcript_poll(meeting_id: int, topic: str, duration: int,
+                                    recording_url: str, public_token: str, attempt: int = 1):
+    """Queue poll attempt `attempt` to run after its POLL_DELAYS delay."""
+    await enqueue_job(
+        'poll_transcript',
+        dedupe_key=f"poll_transcript:{meeting_id}:{attempt}",
+        delay_seconds=POLL_DELAYS[attempt - 1],
+        meeting_id=meeting_id, topic=topic, duration=duration,
+        recording_url=recording_url, public_token=public_token, attempt=attempt,
+    )
+
+
+async def _poll_transcript_attempt(meeting_id: int, topic: str, duration: int,
+                                   recording_url: str, public_token: str, attempt: int = 1):
+    """Job: one poll of the Zoom API for a transcript; queues the next attempt if none yet."""
     if not zoom_client:
         return
 
-    for attempt, delay in enumerate(POLL_DELAYS, 1):
-        await asyncio.sleep(delay)
+    async def _next_attempt():
+        if attempt < len(POLL_DELAYS):
+            await _schedule_transcript_poll(meeting_id, topic, duration, recording_url, public_token, attempt + 1)
+        else:
+            logger.warning(f"Meeting {meeting_id}: transcript not available after {len(POLL_DELAYS)} poll attempts")
 
-        # Check if transcript already arrived via webhook/WS
-        db_meeting = await db.get_zoom_meeting(meeting_id)
-        if db_meeting and db_meeting.get("transcript_text"):
-            logger.info(f"Meeting {meeting_id}: transcript already in DB (poll attempt {attempt} — skipping)")
-            return
+    # Check if transcript already arrived via webhook/WS
+    db_meeting = await db.get_meeting_light(meeting_id)
+    if db_meeting and db_meeting.get("has_transcript"):
+        logger.info(f"Meeting {meeting_id}: transcript already in DB (poll attempt {attempt} — skipping)")
+        return
 
-        logger.info(f"Meeting {meeting_id}: polling Zoom API for transcript (attempt {attempt}/{len(POLL_DELAYS)})")
+    logger.info(f"Meeting {meeting_id}: polling Zoom API for transcript (attempt {attempt}/{len(POLL_DELAYS)})")
 
-        try:
-            transcript_text = await zoom_client.download_meeting_transcript(meeting_id)
-        except Exception as e:
-            logger.error(f"Meeting {meeting_id}: poll attempt {attempt} failed: {e}")
-            continue
+    try:
+        transcript_text = await zoom_client.download_meeting_transcript(meeting_id)
+    except Exception as e:
+        logger.error(f"Meeting {meeting_id}: poll attempt {attempt} failed: {e}")
+        await _next_attempt()
+        return
 
-        if not transcript_text:
-            continue
+    if not transcript_text:
+        await _next_attempt()
+        return
 
-        summary = await generate_summary(transcript_text)
+    summary = await generate_summary(transcript_text)
 
-        structured_transcript_json = None
-        vtt_entries = parse_vtt(transcript_text)
-        if vtt_entries:
-            logger.info(f"Meeting {meeting_id}: parsed {len(vtt_entries)} VTT entries (poll attempt {attempt})")
-            structured_transcript_json = await generate_structured_transcript(vtt_entries)
+    structured_transcript_json = None
+    vtt_entries = parse_vtt(transcript_text)
+    if vtt_entries:
+        logger.info(f"Meeting {meeting_id}: parsed {len(vtt_entries)} VTT entries (poll attempt {attempt})")
+        structured_transcript_json = await generate_structured_transcript(vtt_entries)
+
+    try:
+        await db.update_meeting_transcript_and_summary(
+            meeting_id=meeting_id,
+            transcript_text=transcript_text[:500000],
+            summary=summary or None,
+        )
+        if structured_transcript_json:
+            await db.update_meeting_structured_transcript(meeting_id, structured_transcript_json)
+        logger.info(f"Meeting {meeting_id}: transcript + summary saved via API poll (attempt {attempt})")
+    except Exception as e:
+        logger.error(f"Meeting {meeting_id}: failed to save polled transcript: {e}")
+        await _next_attempt()
+        return
+
+    # Only send Lark card if we have a summary
+    if lark_client and summary:
+        if db_meeting and db_meeting.get("lark_message_id"):
+            try:
+                await lark_client.delete_message(db_meeting["lark_message_id"])
+            except Exception:
+                pass
+
+        webapp_url = config.webapp_url or ''
+        pt = public_token or (db_meeting or {}).get("public_token", "")
+        page_url = f"{webapp_url}/meeting/{pt}" if webapp_url and pt else None
+
+        # Get meeting details for Lark card
+        host_name = db_meeting.get('host_name') if db_meeting else None
+        start_time_str = format_start_time(db_meeting.get('start_time')) if db_meeting else None
+        end_time_str = format_end_time(db_meeting.get('start_time'), duration) if db_meeting and db_meeting.get('start_time') else None
+        participants = await get_participants_with_notes(meeting_id)
+        
+        # Generate short summary (3 sentences) for Lark card
+        short_summary = await generate_short_summary(summary)
 
         try:
-            await db.update_meeting_transcript_and_summary(
-                meeting_id=meeting_id,
-                transcript_text=transcript_text[:500000],
-                summary=summary or None,
+            result = await lark_client.send_recording_card(
+                topic=topic,
+                recording_url=recording_url,
+                transcript_text=transcript_text[:3000],
+                summary=summary,
+                duration=duration,
+                public_page_url=page_url,
+                host_name=host_name,
+                start_time=start_time_str,
+                end_time=end_time_str,
+                participants=participants if participants else None,
+                short_summary=short_summary or None,
             )
-            if structured_transcript_json:
-                await db.update_meeting_structured_transcript(meeting_id, structured_transcript_json)
-            logger.info(f"Meeting {meeting_id}: transcript + summary saved via API poll (attempt {attempt})")
+            new_msg_id = result.get("data", {}).get("message_id")
+            if new_msg_id:
+                await db.update_meeting_lark_message_id(meeting_id, new_msg_id)
+            logger.info(f"Meeting {meeting_id}: Lark card sent after poll (with summary)")
         except Exception as e:
-            logger.error(f"Meeting {meeting_id}: failed to save polled transcript: {e}")
-            continue
+            logger.error(f"Meeting {meeting_id}: failed to update Lark card after poll: {e}")
+    elif lark_client and not summary:
+        logger.info(f"Meeting {meeting_id}: Lark card NOT sent after poll — no summary yet")
+
+    await enqueue_embed_projects(meeting_id)
+
+
+# ========== Background jobs ==========
+# Heavy pipelines run from the durable queue in app/job_queue.py, either in this
+# process (RUN_JOB_WORKER=1, the default) or in `python worker.py` containers.
+
+# Worker slots per job kind.
+JOB_CONCURRENCY = {
+    'transcribe': int(os.getenv('JOB_CONCURRENCY_TRANSCRIBE') or 2),
+    'manual_transcribe': 1,
+    'process_uploaded_video': 1,
+    'upload_video_s3': 3,
+    'upload_audio_s3': 3,
+    'embed_meeting_projects': 2,
+    'embed_meeting': 2,
+    'reembed_project': 1,
+    'poll_transcript': 4,
+}
 
-        # Only send Lark card if we have a summary
-        if lark_client and summary:
-            if db_meeting and db_meeting.get("lark_message_id"):
-                try:
-                    await lark_client.delete_message(db_meeting["lark_message_id"])
-                except Exception:
-                    pass
 
-            webapp_url = config.webapp_url or ''
-            pt = public_token or (db_meeting or {}).get("public_token", "")
-            page_url = f"{webapp_url}/meeting/{pt}" if webapp_url and pt else None
+async def enqueue_job(kind: str, *, dedupe_key: str | None = None, max_attempts: int = 3,
+                      delay_seconds: float = 0, **payload) -> int | None:
+    """Queue a background job (payload must be JSON-serialisable).
+    Returns None if an equivalent job is already pending or the queue is unavailable."""
+    try:
+        return await db.enqueue_job(kind, payload, dedupe_key=dedupe_key,
+                                    max_attempts=max_attempts, delay_seconds=delay_seconds)
+    except Exception as e:
+        logger.error(f"Failed to enqueue {kind} job {payload}: {e}")
+        return None
 
-            # Get meeting details for Lark card
-            host_name = db_meeting.get('host_name') if db_meeting else None
-            start_time_str = format_start_time(db_meeting.get('start_time')) if db_meeting else None
-            end_time_str = format_end_time(db_meeting.get('start_time'), duration) if db_meeting and db_meeting.get('start_time') else None
-            participants = await get_participants_with_notes(meeting_id)
-            
-            # Generate short summary (3 sentences) for Lark card
-            short_summary = await generate_short_summary(summary)
 
-            try:
-                result = await lark_client.send_recording_card(
-                    topic=topic,
-                    recording_url=recording_url,
-                    transcript_text=transcript_text[:3000],
-                    summary=summary,
-                    duration=duration,
-                    public_page_url=page_url,
-                    host_name=host_name,
-                    start_time=start_time_str,
-                    end_time=end_time_str,
-                    participants=participants if participants else None,
-                    short_summary=short_summary or None,
-                )
-                new_msg_id = result.get("data", {}).get("message_id")
-                if new_msg_id:
-                    await db.update_meeting_lark_message_id(meeting_id, new_msg_id)
-                logger.info(f"Meeting {meeting_id}: Lark card sent after poll (with summary)")
-            except Exception as e:
-                logger.error(f"Meeting {meeting_id}: failed to update Lark card after poll: {e}")
-        elif lark_client and not summary:
-            logger.info(f"Meeting {meeting_id}: Lark card NOT sent after poll — no summary yet")
+async def enqueue_transcribe(meeting_id: int):
+    await enqueue_job('transcribe', dedupe_key=f"transcribe:{meeting_id}", max_attempts=2, meeting_id=meeting_id)
 
-        asyncio.create_task(_embed_projects_for_meeting(meeting_id))
-        return
 
-    logger.warning(f"Meeting {meeting_id}: transcript not available after {len(POLL_DELAYS)} poll attempts")
+async def enqueue_s3_uploads(meeting_id: int, video: bool = True, audio: bool = True):
+    if video:
+        await enqueue_job('upload_video_s3', dedupe_key=f"upload_video_s3:{meeting_id}", meeting_id=meeting_id)
+    if audio:
+        await enqueue_job('upload_audio_s3', dedupe_key=f"upload_audio_s3:{meeting_id}", meeting_id=meeting_id)
+
+
+async def enqueue_embed_projects(meeting_id: int):
+    await enqueue_job('embed_meeting_projects', dedupe_key=f"embed_meeting_projects:{meeting_id}",
+                      meeting_id=meeting_id)
+
+
+async def _transcribe_job_gave_up(meeting_id: int, **_):
+    await _send_lark_recording_card_no_summary(meeting_id)
+
+
+def build_job_worker() -> JobWorker:
+    handlers = {
+        'transcribe': (
+            lambda meeting_id, instance_uuid=None: _auto_transcribe_audio(meeting_id, instance_uuid=instance_uuid),
+            _transcribe_job_gave_up,
+        ),
+        'manual_transcribe': (_run_manual_transcription, None),
+        'process_uploaded_video': (_process_uploaded_video, None),
+        'upload_video_s3': (_upload_video_to_s3, None),
+        'upload_audio_s3': (lambda meeting_id: _upload_audio_to_s3(meeting_id), None),
+        'embed_meeting_projects': (_embed_projects_for_meeting, None),
+        'embed_meeting': (_embed_meeting_safe, None),
+        'reembed_project': (_reembed_project_safe, None),
+        'poll_transcript': (_poll_transcript_attempt, None),
+    }
+    kinds = [
+        JobKind(name, handler, concurrency=JOB_CONCURRENCY[name], on_give_up=give_up)
+        for name, (handler, give_up) in handlers.items()
+    ]
+    return JobWorker(db, kinds)
 
 
 # ========== Startup Sync: catch up on missed recordings ==========
 
+# Meetings checked against Zoom in parallel during startup sync / reconciliation.
+# Zoom calls are additionally throttled by zoom_client.limiter (ZOOM_API_RATE).
+SYNC_CONCURRENCY = int(os.getenv('SYNC_CONCURRENCY') or 4)
+# One stuck meeting (hung download, slow LLM) must not hold a worker slot forever.
+SYNC_MEETING_TIMEOUT = 900
+
+# meeting_ids currently being synced — startup sync and the reconciliation loop
+# can both pick up an overdue meeting; the second one skips it.
+_meetings_in_sync: set = set()
+# Last run of each sync phase, exposed in /api/health.
+sync_progress: dict = {}
+
+
+class SyncProgress:
+    """Counters for one batch of meetings; logs every ~10% and at the end."""
+
+    def __init__(self, phase: str, total: int):
+        self.phase = phase
+        self.total = total
+        self.ok = 0
+        self.failed = 0
+        self.skipped = 0
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self._log_every = max(1, total // 10)
+
+    @property
+    def done(self) -> int:
+        return self.ok + self.failed + self.skipped
+
+    def record(self, outcome: str) -> None:
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        if self.done % self._log_every == 0 and self.done < self.total:
+            logger.info(f"{self.phase}: {self.done}/{self.total} meetings ({self.failed} failed, {self.elapsed:.0f}s)")
+
+    def finish(self) -> None:
+        self.finished_at = time.monotonic()
+        rate = self.done / self.elapsed if self.elapsed else 0.0
+        logger.info(
+            f"{self.phase}: {self.done}/{self.total} meetings in {self.elapsed:.1f}s "
+            f"({rate:.2f}/s, {self.ok} ok, {self.failed} failed, {self.skipped} skipped, "
+            f"{SYNC_CONCURRENCY} in parallel)"
+        )
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def as_dict(self) -> dict:
+        return {
+            'total': self.total, 'ok': self.ok, 'failed': self.failed, 'skipped': self.skipped,
+            'running': self.finished_at is None, 'elapsed_s': round(self.elapsed, 1),
+        }
+
+
+async def _sync_meetings_bounded(phase: str, meetings: list, fn) -> SyncProgress:
+    """Run `fn(meeting)` for every meeting, SYNC_CONCURRENCY at a time.
+    Each meeting is isolated: an error or timeout is logged and counted, never
+    propagated to its siblings."""
+    progress = SyncProgress(phase, len(meetings))
+    sync_progress[phase] = progress
+
+    async def _one(meeting):
+        mid = meeting['meeting_id']
+        if mid in _meetings_in_sync:
+            progress.record('skipped')
+            return
+        _meetings_in_sync.add(mid)
+        try:
+            await asyncio.wait_for(fn(meeting), timeout=SYNC_MEETING_TIMEOUT)
+            progress.record('ok')
+        except asyncio.TimeoutError:
+            logger.error(f"{phase}: meeting {mid} timed out after {SYNC_MEETING_TIMEOUT}s")
+            progress.record('failed')
+        except Exception as e:
+            logger.error(f"{phase}: error processing meeting {mid}: {e}", exc_info=True)
+            progress.record('failed')
+        finally:
+            _meetings_in_sync.discard(mid)
+
+    await gather_bounded(meetings, _one, SYNC_CONCURRENCY)
+    progress.finish()
+    return progress
+
+
 async def _sync_single_meeting(meeting: dict):
-    """Check a single 'scheduled' meeting via Zoom API; update if it has ended and has recordings."""
+    """Check a single 'scheduled' meeting via Zoom API; update if it has ended and has recordings.
+    `meeting` is a light record (has_transcript/has_summary flags, no text columns)."""
     mid = meeting['meeting_id']
 
     try:
@@ -6675,8 +7220,8 @@ async def _sync_single_meeting(meeting: dict):
     logger.info(f"Startup sync: meeting {mid} has recordings, processing...")
 
     # Check if meeting already has transcript/summary
-    has_existing_transcript = meeting.get('transcript_text') and len(meeting.get('transcript_text', '')) > 0
-    has_existing_summary = meeting.get('summary') and len(meeting.get('summary', '')) > 0
+    has_existing_transcript = meeting.get('has_transcript')
+    has_existing_summary = meeting.get('has_summary')
     
     transcript_text = ""
     
@@ -6684,7 +7229,7 @@ async def _sync_single_meeting(meeting: dict):
     if transcript_download_url and not has_existing_transcript:
         try:
             token = await zoom_client.get_access_token()
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(
                     transcript_download_url,
                     headers={"Authorization": f"Bearer {token}"},
@@ -6700,7 +7245,7 @@ async def _sync_single_meeting(meeting: dict):
         logger.info(f"Startup sync: meeting {mid} no TRANSCRIPT, downloading Zoom SUMMARY...")
         try:
             token = await zoom_client.get_access_token()
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(
                     summary_download_url,
                     headers={"Authorization": f"Bearer {token}"},
@@ -6721,16 +7266,13 @@ async def _sync_single_meeting(meeting: dict):
             return
         elif meeting.get('lark_message_id') and needs_s3:
             logger.info(f"Startup sync: meeting {mid} has all data but missing S3 video — uploading")
-            if not has_s3_video:
-                asyncio.create_task(_upload_video_to_s3(mid))
-            if not has_s3_audio:
-                asyncio.create_task(_upload_audio_to_s3(mid))
+            await enqueue_s3_uploads(mid, video=not has_s3_video, audio=not has_s3_audio)
             return
         else:
             logger.info(f"Startup sync: meeting {mid} has transcript/summary but no Lark card — will send")
             # Use existing data to build the Lark card
             transcript_text = None  # signal to skip DB update
-            summary = meeting.get('summary', '')
+            summary = (await db.get_meeting_text_fields(mid, 'summary')).get('summary') or ''
 
     # transcript_text can be: non-empty string (new data), empty string (nothing downloaded), or None (skip DB update)
     # summary may already be set above (from existing DB data) if transcript_text is None
@@ -6836,13 +7378,10 @@ async def _sync_single_meeting(meeting: dict):
     elif lark_client and not summary:
         logger.info(f"Startup sync: meeting {mid} Lark card NOT sent — no summary yet")
 
-    asyncio.create_task(_embed_projects_for_meeting(mid))
+    await enqueue_embed_projects(mid)
 
     # Upload video and audio to S3 if not already done
-    if not meeting.get('video_s3_url'):
-        asyncio.create_task(_upload_video_to_s3(mid))
-    if not meeting.get('audio_s3_url'):
-        asyncio.create_task(_upload_audio_to_s3(mid))
+    await enqueue_s3_uploads(mid, video=not meeting.get('video_s3_url'), audio=not meeting.get('audio_s3_url'))
 
     logger.info(f"Startup sync: meeting {mid} fully processed")
 
@@ -6864,59 +7403,57 @@ async def _reconcile_overdue_meetings():
         return
 
     logger.info(f"Reconciliation: found {len(overdue)} overdue scheduled meetings to check")
+    await _sync_meetings_bounded("Reconciliation", overdue, _reconcile_single_meeting)
 
-    for meeting in overdue:
-        mid = meeting['meeting_id']
-        try:
-            # First check if there are already recordings (highest priority)
-            recordings = await zoom_client.get_meeting_recordings(mid)
-            if recordings and recordings.get("recording_files"):
-                logger.info(f"Reconciliation: meeting {mid} has recordings — running full sync")
-                await _sync_single_meeting(meeting)
-                continue
 
-            # No recordings yet — check if meeting actually ended via past_meetings API
-            past = await zoom_client.get_past_meeting(mid)
-            if not past:
-                logger.info(f"Reconciliation: meeting {mid} not found in past meetings — skipping")
-                continue
+async def _reconcile_single_meeting(meeting: dict):
+    mid = meeting['meeting_id']
+    # First check if there are already recordings (highest priority)
+    recordings = await zoom_client.get_meeting_recordings(mid)
+    if recordings and recordings.get("recording_files"):
+        logger.info(f"Reconciliation: meeting {mid} has recordings — running full sync")
+        await _sync_single_meeting(meeting)
+        return
 
-            logger.info(f"Reconciliation: meeting {mid} confirmed ended via Zoom past API — updating")
+    # No recordings yet — check if meeting actually ended via past_meetings API
+    past = await zoom_client.get_past_meeting(mid)
+    if not past:
+        logger.info(f"Reconciliation: meeting {mid} not found in past meetings — skipping")
+        return
 
-            await db.update_meeting_status(mid, "ended")
+    logger.info(f"Reconciliation: meeting {mid} confirmed ended via Zoom past API — updating")
 
-            # Send Lark "ended" card if lark_client is configured
-            if lark_client:
-                old_lark_id = meeting.get('lark_message_id')
-                if old_lark_id:
-                    try:
-                        await lark_client.delete_message(old_lark_id)
-                    except Exception:
-                        pass
+    await db.update_meeting_status(mid, "ended")
 
-                topic = meeting.get('topic', 'Встреча')
-                host_name = meeting.get('host_name')
-                start_time_str = format_start_time(meeting.get('start_time'))
-                duration = meeting.get('duration', 0)
-                participants = await get_participants_with_notes(mid)
+    # Send Lark "ended" card if lark_client is configured
+    if lark_client:
+        old_lark_id = meeting.get('lark_message_id')
+        if old_lark_id:
+            try:
+                await lark_client.delete_message(old_lark_id)
+            except Exception:
+                pass
 
-                try:
-                    result = await lark_client.send_meeting_ended_card(
-                        topic=topic,
-                        host_name=host_name,
-                        start_time=start_time_str,
-                        duration=duration,
-                        participants=participants if participants else None,
-                    )
-                    new_msg_id = result.get("data", {}).get("message_id")
-                    if new_msg_id:
-                        await db.update_meeting_lark_message_id(mid, new_msg_id)
-                    logger.info(f"Reconciliation: meeting {mid} Lark 'ended' card sent")
-                except Exception as e:
-                    logger.error(f"Reconciliation: meeting {mid} failed to send Lark ended card: {e}")
+        topic = meeting.get('topic', 'Встреча')
+        host_name = meeting.get('host_name')
+        start_time_str = format_start_time(meeting.get('start_time'))
+        duration = meeting.get('duration', 0)
+        participants = await get_participants_with_notes(mid)
 
+        try:
+            result = await lark_client.send_meeting_ended_card(
+                topic=topic,
+                host_name=host_name,
+                start_time=start_time_str,
+                duration=duration,
+                participants=participants if participants else None,
+            )
+            new_msg_id = result.get("data", {}).get("message_id")
+            if new_msg_id:
+                await db.update_meeting_lark_message_id(mid, new_msg_id)
+            logger.info(f"Reconciliation: meeting {mid} Lark 'ended' card sent")
         except Exception as e:
-            logger.error(f"Reconciliation: error processing meeting {mid}: {e}", exc_info=True)
+            logger.error(f"Reconciliation: meeting {mid} failed to send Lark ended card: {e}")
 
 
 async def _periodic_meeting_reconciliation_loop():
@@ -6944,11 +7481,7 @@ async def sync_meetings_on_startup():
     scheduled = await db.get_scheduled_meetings()
     if scheduled:
         logger.info(f"Startup sync: checking {len(scheduled)} scheduled meetings...")
-        for m in scheduled:
-            try:
-                await _sync_single_meeting(m)
-            except Exception as e:
-                logger.error(f"Startup sync: error processing meeting {m['meeting_id']}: {e}", exc_info=True)
+        await _sync_meetings_bounded("Startup sync (scheduled)", scheduled, _sync_single_meeting)
     else:
         logger.info("Startup sync: no scheduled meetings to check")
 
@@ -6959,6 +7492,8 @@ async def sync_meetings_on_startup():
             "FROM zoom_meetings WHERE status = 'transcribing'"
         )
     for row in stuck:
+        if await db.has_active_job(f"transcribe:{row['meeting_id']}"):
+            continue  # still queued/running in the job queue
         if row['has_transcript']:
             await db.update_meeting_status(row['meeting_id'], 'finished')
             logger.info(f"Startup sync: meeting {row['meeting_id']} had transcript but was stuck 'transcribing' — set to 'finished'")
@@ -6970,11 +7505,7 @@ async def sync_meetings_on_startup():
     needing_transcript = await db.get_meetings_needing_transcript()
     if needing_transcript:
         logger.info(f"Startup sync: checking {len(needing_transcript)} meetings needing transcript...")
-        for m in needing_transcript:
-            try:
-                await _sync_single_meeting(m)
-            except Exception as e:
-                logger.error(f"Startup sync: error processing meeting {m['meeting_id']}: {e}", exc_info=True)
+        await _sync_meetings_bounded("Startup sync (needing transcript)", needing_transcript, _sync_single_meeting)
     else:
         logger.info("Startup sync: no meetings needing transcript")
 
@@ -6995,7 +7526,9 @@ async def _fix_meeting_durations():
             return
         logger.info(f"Duration fix: checking {len(rows)} meetings")
         updated = 0
-        for row in rows:
+
+        async def _fix_one(row):
+            nonlocal updated
             mid = row['meeting_id']
             try:
                 past = await zoom_client.get_past_meeting(mid)
@@ -7004,7 +7537,9 @@ async def _fix_meeting_durations():
                     updated += 1
             except Exception as e:
                 logger.warning("duration fix for meeting %s failed: %s", mid, e)
-            await asyncio.sleep(0.3)
+
+        # Pace is set by zoom_client.limiter, not by a per-call sleep.
+        await gather_bounded(rows, _fix_one, SYNC_CONCURRENCY)
         logger.info(f"Duration fix: updated {updated}/{len(rows)} meetings")
     except Exception as e:
         logger.error(f"Duration fix failed: {e}")
@@ -7016,6 +7551,7 @@ async def init_db(app):
     """Initialize database connection on startup"""
     logger.info("Connecting to database...")
     await db.connect()
+    await db.start_cache_listener()
     logger.info("Database connected successfully")
 
 async def start_zoom_ws(app):
@@ -7031,25 +7567,47 @@ async def start_zoom_ws(app):
             generate_structured_fn=generate_structured_transcript,
             parse_vtt_fn=parse_vtt,
             s3_client=s3_client,
-            auto_transcribe_fn=_auto_transcribe_audio,
+            auto_transcribe_fn=enqueue_transcribe,
+            generate_short_summary_fn=generate_short_summary,
         )
         await zoom_ws_listener.start()
         logger.info("Zoom WebSocket listener started")
     else:
         logger.info("Zoom WebSocket listener not configured — skipped")
 
+async def start_job_worker(app):
+    """Run the background job worker in this process unless RUN_JOB_WORKER=0
+    (then `python worker.py` containers do the work)."""
+    global job_worker
+    if os.getenv('RUN_JOB_WORKER', '1').strip().lower() in ('0', 'false', 'no'):
+        logger.info("In-process job worker disabled (RUN_JOB_WORKER=0)")
+        return
+    job_worker = build_job_worker()
+    await job_worker.start()
+
 async def startup_sync(app):
     """Run meeting sync after all services are ready and start periodic reconciliation."""
     asyncio.create_task(sync_meetings_on_startup())
     asyncio.create_task(_periodic_meeting_reconciliation_loop())
     logger.info("Periodic meeting reconciliation loop started")
+    if kimai_sync:
+        asyncio.create_task(kimai_sync.run_forever())
+        logger.info(f"Kimai mirror sync started (every {kimai_sync.interval}s)")
+
+async def close_text_extractor(app):
+    """Stop the document text extraction worker processes."""
+    text_extractor.close()
+
 
 async def close_db(app):
     """Close database connection on shutdown"""
-    global zoom_ws_listener
+    global zoom_ws_listener, job_worker
     if zoom_ws_listener:
         await zoom_ws_listener.stop()
         logger.info("Zoom WebSocket listener stopped")
+    if job_worker:
+        await job_worker.stop()
+        job_worker = None
     logger.info("Closing database connection...")
     await db.disconnect()
     logger.info("Database connection closed")
@@ -7065,6 +7623,7 @@ def create_app():
     app['zoom_client'] = zoom_client
     app['s3_client'] = s3_client
     app['kimai_client'] = kimai_client
+    app['kimai_sync'] = kimai_sync
 
     app.add_routes(routes)
     app.router.add_static('/img/', './static/img/', name='static_img')
@@ -7072,10 +7631,14 @@ def create_app():
     app.router.add_static('/js/', './static/js/', name='static_js')
 
     # Setup startup/cleanup hooks
+    app.on_startup.append(http_client.start)
     app.on_startup.append(init_db)
     app.on_startup.append(start_zoom_ws)
+    app.on_startup.append(start_job_worker)
     app.on_startup.append(startup_sync)
     app.on_cleanup.append(close_db)
+    app.on_cleanup.append(close_text_extractor)
+    app.on_cleanup.append(http_client.close)
 
     # Enable CORS for Telegram
     from aiohttp_cors import setup as cors_setup, ResourceOptions
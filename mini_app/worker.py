@@ -0,0 +1,40 @@
+"""
+Background job worker.
+Runs the durable job queue (transcription, S3 uploads, embeddings, …) outside the
+web process: `python worker.py`, from the same image/directory as server.py.
+Scale by running more containers; jobs are claimed with SKIP LOCKED.
+"""
+
+import asyncio
+import logging
+import signal
+
+import server
+from app import http_client
+
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    await http_client.start()
+    await server.db.connect()
+    worker = server.build_job_worker()
+    server.job_worker = worker
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await worker.start()
+    logger.info("Job worker running — waiting for jobs")
+    try:
+        await stop.wait()
+    finally:
+        await worker.stop()
+        await server.db.disconnect()
+        await http_client.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -8,7 +8,8 @@ import asyncio
 import sys
 from database import Database
 from config import Config
-import aiohttp
+from broadcaster import Broadcaster
+import http_client
 import logging
 
 logging.basicConfig(
@@ -18,86 +19,47 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def send_message(session, bot_token: str, chat_id: int, text: str) -> bool:
-    """Send message to user"""
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    data = {
-        'chat_id': chat_id,
-        'text': text,
-        'parse_mode': 'Markdown'
-    }
-    
-    try:
-        async with session.post(url, json=data) as response:
-            result = await response.json()
-            if result.get('ok'):
-                return True
-            else:
-                # Check if user blocked the bot
-                error_description = result.get('description', '')
-                if 'blocked' in error_description.lower() or 'user is deactivated' in error_description.lower():
-                    logger.warning(f"User {chat_id} has blocked the bot")
-                    return False
-                else:
-                    logger.error(f"Failed to send message to {chat_id}: {error_description}")
-                    return False
-    except Exception as e:
-        logger.error(f"Error sending message to {chat_id}: {e}")
-        return False
+def log_progress(counts: dict, total: int):
+    done = sum(counts.values())
+    logger.info(f"[{done}/{total}] ✅ {counts['sent']}  🚫 {counts['blocked']}  ❌ {counts['failed']}")
 
 
-async def broadcast_message(message_text: str):
-    """Broadcast message to all users"""
+async def broadcast_message(message_text: str = None, resume_id: int = None):
+    """Broadcast message to all users, or resume an unfinished broadcast"""
     config = Config()
     db = Database(config.database_url)
     
     try:
-        # Connect to database
         await db.connect()
         
-        # Get all active users
-        users = await db.get_all_users(exclude_blocked=True)
-        total_users = len(users)
-        
-        logger.info(f"Starting broadcast to {total_users} users...")
-        
-        # Statistics
-        sent = 0
-        failed = 0
-        blocked = 0
+        if message_text is not None:
+            broadcast_id = await db.create_broadcast(message_text, parse_mode='Markdown')
+            logger.info(f"Broadcast {broadcast_id} created")
+        else:
+            broadcast = await db.get_broadcast(resume_id) if resume_id else await db.get_latest_unfinished_broadcast()
+            if not broadcast:
+                logger.info("Nothing to resume")
+                return
+            broadcast_id = broadcast['id']
+            logger.info(f"Resuming broadcast {broadcast_id}")
         
-        async with aiohttp.ClientSession() as session:
-            for i, user in enumerate(users, 1):
-                telegram_id = user['telegram_id']
-                first_name = user['first_name'] or 'User'
-                
-                logger.info(f"[{i}/{total_users}] Sending to {first_name} (ID: {telegram_id})")
-                
-                success = await send_message(session, config.telegram_token, telegram_id, message_text)
-                
-                if success:
-                    sent += 1
-                else:
-                    failed += 1
-                    # Mark user as blocked
-                    await db.mark_user_blocked(telegram_id)
-                    blocked += 1
-                
-                # Sleep to avoid rate limits (30 messages per second)
-                await asyncio.sleep(0.05)
+        stats = await Broadcaster(db, config.telegram_token).run(broadcast_id, progress=log_progress)
         
         # Print statistics
         logger.info("=" * 50)
-        logger.info("Broadcast completed!")
-        logger.info(f"Total users: {total_users}")
-        logger.info(f"✅ Successfully sent: {sent}")
-        logger.info(f"❌ Failed: {failed}")
-        logger.info(f"🚫 Blocked: {blocked}")
+        logger.info(f"Broadcast {broadcast_id} completed!")
+        logger.info(f"Total recipients: {sum(stats.values())}")
+        logger.info(f"✅ Successfully sent: {stats.get('sent', 0)}")
+        logger.info(f"❌ Failed: {stats.get('failed', 0)}")
+        logger.info(f"🚫 Blocked: {stats.get('blocked', 0)}")
+        if stats.get('pending'):
+            logger.info(f"⏳ Pending: {stats['pending']} (run with --resume {broadcast_id})")
         logger.info("=" * 50)
         
     except Exception as e:
         logger.error(f"Broadcast failed: {e}")
     finally:
+        await http_client.close()
         await db.disconnect()
 
 
@@ -130,10 +92,14 @@ def main():
         print("Usage:")
         print("  Broadcast message: python broadcast.py \"Your message here\"")
         print("  Get statistics:    python broadcast.py --stats")
+        print("  Resume broadcast:  python broadcast.py --resume [broadcast_id]")
         sys.exit(1)
     
     if sys.argv[1] == '--stats':
         asyncio.run(get_stats())
+    elif sys.argv[1] == '--resume':
+        resume_id = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        asyncio.run(broadcast_message(resume_id=resume_id))
     else:
         message = ' '.join(sys.argv[1:])
         
@@ -0,0 +1,104 @@
+"""Tests for the broadcast engine: response classification, retries, batched accounting."""
+import pytest
+
+from app.broadcaster import Broadcaster, classify_response
+
+
+def test_classify_response():
+    assert classify_response(200, {"ok": True}) == ("sent", None)
+    assert classify_response(429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 7}}) == ("retry", 7.0)
+    assert classify_response(502, None) == ("retry", None)
+    assert classify_response(403, {"ok": False, "error_code": 403,
+                                   "description": "Forbidden: bot was blocked by the user"})[0] == "blocked"
+    assert classify_response(400, {"ok": False, "error_code": 400,
+                                   "description": "Bad Request: chat not found"})[0] == "blocked"
+    assert classify_response(400, {"ok": False, "error_code": 400,
+                                   "description": "Bad Request: can't parse entities"})[0] == "failed"
+
+
+class FakeDB:
+    def __init__(self, recipients):
+        self.status = {tid: "pending" for tid in recipients}
+        self.batches = []
+        self.finished = False
+
+    async def get_broadcast(self, broadcast_id):
+        return {"id": broadcast_id, "text": "hi", "parse_mode": None}
+
+    async def get_pending_broadcast_recipients(self, broadcast_id):
+        return [tid for tid, s in self.status.items() if s == "pending"]
+
+    async def record_broadcast_deliveries(self, broadcast_id, results):
+        self.batches.append(results)
+        for tid, status, _, _ in results:
+            self.status[tid] = status
+
+    async def get_broadcast_stats(self, broadcast_id):
+        stats = {}
+        for s in self.status.values():
+            stats[s] = stats.get(s, 0) + 1
+        return stats
+
+    async def finish_broadcast(self, broadcast_id):
+        self.finished = True
+
+
+@pytest.mark.asyncio
+async def test_run_retries_429_and_records_outcomes(monkeypatch):
+    db = FakeDB([1, 2, 3])
+    b = Broadcaster(db, "token", rate=1000, concurrency=3, flush_interval=60)
+    calls = []
+
+    async def fake_send(chat_id, text, parse_mode):
+        calls.append(chat_id)
+        if chat_id == 1 and calls.count(1) == 1:
+            return 429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 0.01}}
+        if chat_id == 2:
+            return 403, {"ok": False, "error_code": 403, "description": "Forbidden: bot was blocked by the user"}
+        return 200, {"ok": True}
+
+    monkeypatch.setattr(b, "_send", fake_send)
+    stats = await b.run(7)
+
+    assert stats == {"sent": 2, "blocked": 1}
+    assert calls.count(1) == 2 and b.limiter.pauses == 1
+    # Everything lands in one batched write at the end.
+    assert len(db.batches) == 1 and len(db.batches[0]) == 3
+    assert db.finished
+
+
+@pytest.mark.asyncio
+async def test_resume_sends_only_pending(monkeypatch):
+    db = FakeDB([1, 2])
+    db.status[1] = "sent"
+    b = Broadcaster(db, "token", rate=1000)
+    sent_to = []
+
+    async def fake_send(chat_id, text, parse_mode):
+        sent_to.append(chat_id)
+        return 200, {"ok": True}
+
+    monkeypatch.setattr(b, "_send", fake_send)
+    await b.run(7)
+
+    assert sent_to == [2]
+
+
+@pytest.mark.asyncio
+async def test_no_backoff_after_last_attempt(monkeypatch):
+    db = FakeDB([1])
+    b = Broadcaster(db, "token", rate=1000, max_attempts=2)
+    sleeps = []
+
+    async def fake_send(chat_id, text, parse_mode):
+        return 502, None
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(b, "_send", fake_send)
+    monkeypatch.setattr("app.broadcaster.asyncio.sleep", fake_sleep)
+    await b._deliver(1, "hi", None)
+
+    assert sleeps == [2]  # backoff between attempts 1 and 2 only
+    assert b._pending == [(1, "failed", 2, "HTTP 502")]
@@ -0,0 +1,177 @@
+"""Tests for app.concurrency.gather_bounded, RateLimiter, run_dag and IsolatedProcessPool."""
+import asyncio
+import time
+
+import pytest
+
+from app.concurrency import IsolatedProcessPool, RateLimiter, gather_bounded, root_failures, run_dag
+
+
+@pytest.mark.asyncio
+async def test_preserves_input_order():
+    async def slow_echo(x):
+        await asyncio.sleep(0.01 * (5 - x))
+        return x * 10
+
+    assert await gather_bounded(range(5), slow_echo, limit=5) == [0, 10, 20, 30, 40]
+
+
+@pytest.mark.asyncio
+async def test_respects_limit():
+    in_flight = 0
+    peak = 0
+
+    async def work(_):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    await gather_bounded(range(10), work, limit=3)
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_empty_input():
+    async def never(_):
+        raise AssertionError("should not be called")
+
+    assert await gather_bounded([], never, limit=2) == []
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_siblings():
+    finished = []
+
+    async def work(x):
+        if x == 0:
+            raise RuntimeError("chunk 0 failed")
+        await asyncio.sleep(0.2)
+        finished.append(x)
+
+    with pytest.raises(RuntimeError, match="chunk 0 failed"):
+        await gather_bounded(range(4), work, limit=4)
+    assert finished == []
+
+
+@pytest.mark.asyncio
+async def test_return_exceptions_collects_errors():
+    async def work(x):
+        if x == 1:
+            raise ValueError("bad")
+        return x
+
+    results = await gather_bounded(range(3), work, limit=2, return_exceptions=True)
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_burst_then_spaces_calls():
+    limiter = RateLimiter(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        await limiter.acquire()
+    assert time.monotonic() - start < 0.05
+    for _ in range(5):
+        await limiter.acquire()
+    assert time.monotonic() - start >= 0.08
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_pause_blocks_all_callers():
+    limiter = RateLimiter(rate=1000)
+    limiter.pause(0.1)
+    start = time.monotonic()
+    await asyncio.gather(limiter.acquire(), limiter.acquire())
+    assert time.monotonic() - start >= 0.1
+    assert limiter.pauses == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_calls_after_pause():
+    limiter = RateLimiter(rate=10, burst=5)
+    limiter.pause(0.3)
+    stamps = []
+
+    async def send():
+        await limiter.acquire()
+        stamps.append(time.monotonic())
+
+    await asyncio.gather(*(send() for _ in range(3)))
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert all(gap >= 0.09 for gap in gaps), gaps
+
+
+@pytest.mark.asyncio
+async def test_run_dag_starts_steps_when_their_inputs_are_ready():
+    order = []
+
+    async def step(name, delay, value):
+        await asyncio.sleep(delay)
+        order.append(name)
+        return value
+
+    results = await run_dag({
+        "slow": ((), lambda: step("slow", 0.05, 1)),
+        "fast": ((), lambda: step("fast", 0.01, 2)),
+        "after_fast": (("fast",), lambda f: step("after_fast", 0, f * 10)),
+        "both": (("slow", "after_fast"), lambda s, a: step("both", 0, s + a)),
+    })
+    assert results == {"slow": 1, "fast": 2, "after_fast": 20, "both": 21}
+    # after_fast did not wait for the unrelated slow step.
+    assert order == ["fast", "after_fast", "slow", "both"]
+
+
+@pytest.mark.asyncio
+async def test_run_dag_failure_skips_only_dependents():
+    calls = []
+
+    async def boom():
+        raise RuntimeError("boom")
+
+    async def record(*args):
+        calls.append(args)
+        return "ok"
+
+    steps = {
+        "bad": ((), boom),
+        "child": (("bad",), record),
+        "other": ((), record),
+    }
+    results = await run_dag(steps)
+    assert isinstance(results["bad"], RuntimeError)
+    assert results["child"] is results["bad"]
+    assert results["other"] == "ok"
+    assert calls == [()]
+    assert list(root_failures(steps, results)) == ["bad"]
+
+
+@pytest.mark.asyncio
+async def test_run_dag_rejects_cycles_and_unknown_deps():
+    async def noop(*_):
+        return None
+
+    with pytest.raises(ValueError, match="cycle"):
+        await run_dag({"a": (("b",), noop), "b": (("a",), noop)})
+    with pytest.raises(ValueError, match="unknown"):
+        await run_dag({"a": (("missing",), noop)})
+
+
+@pytest.mark.asyncio
+async def test_isolated_pool_timeout_kills_only_its_own_job():
+    pool = IsolatedProcessPool(2)
+    try:
+        stuck, ok = await asyncio.gather(
+            pool.run(1.5, time.sleep, 30),
+            pool.run(20, time.sleep, 2),
+            return_exceptions=True,
+        )
+        assert isinstance(stuck, asyncio.TimeoutError)
+        assert ok is None  # the neighbour finished on its own process
+        assert pool.stats() == {"workers": 2, "busy": 0, "killed": 1}
+        # The killed slot is respawned on demand.
+        assert await pool.run(20, abs, -3) == 3
+    finally:
+        pool.close()
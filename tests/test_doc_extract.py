@@ -0,0 +1,46 @@
+"""Tests for TextExtractor: process-pool extraction, hash cache, timeouts."""
+import concurrent.futures
+import hashlib
+import time
+
+import pytest
+
+from app import concurrency, doc_extract
+from app.doc_extract import TextExtractor, extract_text_sync, is_supported
+
+
+def test_plain_text_decoding():
+    assert extract_text_sync("Привет".encode("utf-8"), "a.txt") == "Привет"
+    assert extract_text_sync("Привет".encode("cp1251"), "a.md") == "Привет"
+    assert extract_text_sync(b"x", "a.png") == ""
+    assert is_supported("Brief.PDF") and not is_supported("photo.jpg")
+
+
+@pytest.mark.asyncio
+async def test_extracts_in_worker_process_and_caches_by_hash():
+    extractor = TextExtractor(workers=1, timeout=60)
+    try:
+        assert await extractor.extract(b"hello", "a.txt") == "hello"
+        # Same bytes under another name: served from the cache.
+        assert await extractor.extract(b"hello", "b.txt") == "hello"
+    finally:
+        extractor.close()
+    assert extractor.stats()["extracted"] == 1
+    assert extractor.stats()["cache"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_returns_empty_and_kills_worker(monkeypatch):
+    def slow(file_bytes, file_name):
+        time.sleep(0.2)
+        return "late"
+
+    monkeypatch.setattr(doc_extract, "extract_text_sync", slow)
+    monkeypatch.setattr(concurrency, "spawn_process_pool",
+                        lambda workers: concurrent.futures.ThreadPoolExecutor(max_workers=workers))
+    extractor = TextExtractor(timeout=0.05)
+
+    assert await extractor.extract(b"big", "big.pdf") == ""
+    assert extractor.stats()["timeouts"] == 1
+    assert extractor.stats()["pool"]["killed"] == 1
+    assert extractor.cache.get((hashlib.sha256(b"big").hexdigest(), ".pdf")) is None
@@ -0,0 +1,97 @@
+"""Tests for batching and retries in app.embeddings._create_embeddings."""
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from app import embeddings, retry
+from app.embeddings import pack_batches
+
+
+def test_pack_batches_respects_token_budget():
+    assert pack_batches([4, 4, 4, 4], max_tokens=10) == [[0, 1], [2, 3]]
+
+
+def test_pack_batches_respects_input_cap():
+    assert pack_batches([1] * 5, max_inputs=2) == [[0, 1], [2, 3], [4]]
+
+
+def test_oversized_input_gets_its_own_batch():
+    assert pack_batches([3, 50, 3], max_tokens=10) == [[0], [1], [2]]
+
+
+def _status_error(cls, status):
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    return cls("boom", response=httpx.Response(status, request=request), body=None)
+
+
+class FakeEmbeddings:
+    def __init__(self, fail_first_with=None):
+        self.calls = []
+        self.fail_first_with = fail_first_with
+
+    async def create(self, model, input):
+        self.calls.append(list(input))
+        if self.fail_first_with is not None:
+            exc, self.fail_first_with = self.fail_first_with, None
+            raise exc
+        data = [SimpleNamespace(index=i, embedding=[float(len(t))]) for i, t in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+class CharEncoding:
+    """One token per character; avoids downloading the real BPE files."""
+
+    def encode(self, text):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+class FakeClient:
+    def __init__(self, fake):
+        self.embeddings = fake
+
+    def with_options(self, **kw):
+        return self
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    def install(fake):
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        monkeypatch.setattr(embeddings, "get_openai_client", lambda key: FakeClient(fake))
+        monkeypatch.setattr(embeddings.tiktoken, "get_encoding", lambda name: CharEncoding())
+        monkeypatch.setattr(embeddings, "MAX_BATCH_INPUTS", 2)
+
+        async def no_sleep(_):
+            return None
+
+        monkeypatch.setattr(retry.asyncio, "sleep", no_sleep)
+        return fake
+    return install
+
+
+@pytest.mark.asyncio
+async def test_batches_keep_input_order(fake_api):
+    fake = fake_api(FakeEmbeddings())
+    result = await embeddings._create_embeddings(["a", "bb", "ccc", "dddd", "eeeee"])
+    assert result == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert sorted(len(c) for c in fake.calls) == [1, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_retried(fake_api):
+    fake = fake_api(FakeEmbeddings(fail_first_with=_status_error(openai.RateLimitError, 429)))
+    assert await embeddings._create_embeddings(["a"]) == [[1.0]]
+    assert len(fake.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_bad_request_is_not_retried(fake_api):
+    fake = fake_api(FakeEmbeddings(fail_first_with=_status_error(openai.BadRequestError, 400)))
+    with pytest.raises(openai.BadRequestError):
+        await embeddings._create_embeddings(["a"])
+    assert len(fake.calls) == 1
@@ -0,0 +1,55 @@
+"""Tests for the embedding_cache path of app.embeddings.generate_embeddings."""
+import pytest
+
+from app import embeddings
+from app.embeddings import content_hash, generate_embeddings
+
+
+class FakeDB:
+    def __init__(self, cached: dict | None = None):
+        self.cache = dict(cached or {})
+        self.saved = []
+
+    async def get_cached_embeddings(self, model, hashes):
+        return {h: self.cache[h] for h in hashes if h in self.cache}
+
+    async def save_cached_embeddings(self, model, items):
+        self.saved.extend(items)
+        self.cache.update(items)
+
+
+@pytest.fixture
+def api_calls(monkeypatch):
+    calls = []
+
+    async def fake_create(chunks):
+        calls.append(list(chunks))
+        return [[float(len(c))] for c in chunks]
+
+    monkeypatch.setattr(embeddings, "_create_embeddings", fake_create)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_only_missing_texts_hit_the_api(api_calls):
+    db = FakeDB({content_hash("a"): [9.0]})
+    result = await generate_embeddings(["a", "bb", "bb", "ccc"], db=db)
+    assert result == [[9.0], [2.0], [2.0], [3.0]]
+    assert api_calls == [["bb", "ccc"]]
+    assert {h for h, _ in db.saved} == {content_hash("bb"), content_hash("ccc")}
+
+
+@pytest.mark.asyncio
+async def test_second_run_is_fully_cached(api_calls):
+    db = FakeDB()
+    first = await generate_embeddings(["x", "yy"], db=db)
+    second = await generate_embeddings(["x", "yy"], db=db)
+    assert first == second
+    assert len(api_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_without_db_always_calls_api(api_calls):
+    await generate_embeddings(["x"])
+    await generate_embeddings(["x"])
+    assert len(api_calls) == 2
@@ -0,0 +1,26 @@
+"""Tests for app.http_client shared session lifecycle."""
+import pytest
+
+from app import http_client
+
+
+@pytest.mark.asyncio
+async def test_pooled_session_is_shared_and_stays_open():
+    async with http_client.pooled_session() as first:
+        pass
+    async with http_client.pooled_session() as second:
+        pass
+    assert first is second
+    assert not first.closed
+    await http_client.close()
+    assert first.closed
+
+
+@pytest.mark.asyncio
+async def test_session_recreated_after_close():
+    await http_client.start()
+    first = http_client.get_session()
+    await http_client.close()
+    second = http_client.get_session()
+    assert second is not first and not second.closed
+    await http_client.close()
@@ -0,0 +1,117 @@
+"""Tests for app.job_queue.JobWorker against an in-memory fake of the DB methods."""
+import asyncio
+
+import pytest
+
+from app.job_queue import JobKind, JobWorker, decode_payload, retry_delay
+
+
+class FakeDB:
+    database_url = None
+
+    def __init__(self, jobs):
+        self.queued = list(jobs)
+        self.completed = []
+        self.failed = []
+        self.released = []
+
+    async def claim_jobs(self, kind, worker_id, limit, lease_seconds):
+        mine = [j for j in self.queued if j['kind'] == kind][:limit]
+        for j in mine:
+            self.queued.remove(j)
+            j['attempts'] += 1
+        return mine
+
+    async def complete_job(self, job_id, worker_id):
+        self.completed.append(job_id)
+
+    async def fail_job(self, job_id, worker_id, error, retry_in):
+        self.failed.append((job_id, retry_in))
+
+    async def release_job(self, job_id, worker_id):
+        self.released.append(job_id)
+
+    async def extend_job_leases(self, ids, worker_id, lease_seconds):
+        pass
+
+    async def purge_finished_jobs(self, days):
+        pass
+
+
+def job(job_id, kind, max_attempts=3, attempts=0, **payload):
+    return {'id': job_id, 'kind': kind, 'payload': payload,
+            'attempts': attempts, 'max_attempts': max_attempts}
+
+
+async def drain(worker, db):
+    await worker.start()
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if not db.queued and not any(worker._running.values()):
+            break
+    await worker.stop()
+
+
+def test_retry_delay_doubles_and_caps():
+    assert [retry_delay(a) for a in (1, 2, 3)] == [30, 60, 120]
+    assert retry_delay(20) == 600
+
+
+def test_decode_payload_accepts_text_and_mapping():
+    assert decode_payload('{"meeting_id": 1}') == {'meeting_id': 1}
+    assert decode_payload({'a': 1}) == {'a': 1}
+    assert decode_payload(None) == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_per_kind():
+    active, peak = 0, 0
+
+    async def handler(n):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    db = FakeDB([job(i, 'work', n=i) for i in range(6)])
+    worker = JobWorker(db, [JobKind('work', handler, concurrency=2)], listen=False, poll_interval=0.01)
+    await drain(worker, db)
+    assert sorted(db.completed) == list(range(6))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_failure_retries_then_gives_up():
+    gave_up = []
+
+    async def boom(meeting_id):
+        raise RuntimeError("nope")
+
+    async def on_give_up(meeting_id):
+        gave_up.append(meeting_id)
+
+    db = FakeDB([job(1, 'x', meeting_id=7), job(2, 'x', max_attempts=1, meeting_id=8)])
+    worker = JobWorker(db, [JobKind('x', boom, concurrency=2, on_give_up=on_give_up)],
+                       listen=False, poll_interval=0.01)
+    await drain(worker, db)
+    assert sorted(db.failed) == [(1, 30), (2, None)]
+    assert gave_up == [8]
+    assert worker.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_releases_running_jobs():
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    db = FakeDB([job(1, 'slow')])
+    worker = JobWorker(db, [JobKind('slow', slow)], listen=False, poll_interval=0.01)
+    await worker.start()
+    await started.wait()
+    await worker.stop()
+    assert db.released == [1]
+    assert db.completed == []
@@ -0,0 +1,109 @@
+"""Tests for app.kimai_sync (mirror sync against fake Kimai/DB)."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.kimai_sync import CURSOR_STATE, FULL_SYNC_STATE, KimaiSync, timesheet_row
+
+
+class FakeKimai:
+    def __init__(self, timesheets):
+        self.timesheets = timesheets
+        self.calls = []
+
+    async def get_users(self):
+        return [{"id": 1, "username": "ann", "alias": "Ann"}]
+
+    async def get_activities(self):
+        return [{"id": 5, "name": "Dev", "project": None}]
+
+    async def get_projects(self):
+        return [{"id": 9, "name": "Site", "customer": 2}]
+
+    async def get_teams(self):
+        return [{"id": 3}]
+
+    async def get_team(self, team_id):
+        return {"id": team_id, "name": "Core", "members": [
+            {"user": {"id": 1}, "teamlead": True},
+            {"user": {"id": 2, "username": "bob"}, "teamlead": False},
+        ]}
+
+    async def get_all_timesheets(self, modified_after=None):
+        self.calls.append(modified_after)
+        return self.timesheets
+
+
+class FakeDB:
+    def __init__(self, state=None):
+        self.state = dict(state or {})
+        self.timesheets = {}
+        self.reference = None
+        self.pruned_with = None
+
+    async def get_kimai_sync_state(self, name):
+        return self.state.get(name)
+
+    async def set_kimai_sync_state(self, name, value):
+        self.state[name] = value
+
+    async def replace_kimai_reference_data(self, **kw):
+        self.reference = kw
+
+    async def upsert_kimai_timesheets(self, rows):
+        for row in rows:
+            self.timesheets[row[0]] = row
+
+    async def prune_kimai_timesheets(self, keep_ids):
+        self.pruned_with = keep_ids
+        gone = [i for i in self.timesheets if i not in keep_ids]
+        for i in gone:
+            del self.timesheets[i]
+        return len(gone)
+
+
+TS = {"id": 7, "user": 1, "project": 9, "activity": 5, "begin": "2026-03-05T10:00:00+0300",
+      "end": "2026-03-05T12:00:00+0300", "duration": 7200, "rate": "150.5", "description": None}
+
+
+def test_timesheet_row_keeps_wall_clock_time():
+    row = timesheet_row(TS)
+    assert row[4] == datetime(2026, 3, 5, 10, 0)
+    assert row[6:] == (7200, 150.5, "")
+    assert timesheet_row({"id": 1, "begin": None}) is None
+
+
+@pytest.mark.asyncio
+async def test_first_sync_is_full_and_prunes():
+    db = FakeDB()
+    db.timesheets[99] = ("stale",)
+    kimai = FakeKimai([TS])
+    result = await KimaiSync(db, kimai).sync()
+    assert result["full"] is True
+    assert kimai.calls == [None]
+    assert set(db.timesheets) == {7}
+    assert CURSOR_STATE in db.state and FULL_SYNC_STATE in db.state
+    # Team members missing from /api/users are still mirrored.
+    assert {u[0] for u in db.reference["users"]} == {1, 2}
+    assert db.reference["members"] == [(3, 1, True), (3, 2, False)]
+
+
+@pytest.mark.asyncio
+async def test_later_sync_is_incremental_with_overlap():
+    now = datetime.now(timezone.utc)
+    cursor = now - timedelta(minutes=10)
+    db = FakeDB({CURSOR_STATE: cursor, FULL_SYNC_STATE: now - timedelta(hours=1)})
+    kimai = FakeKimai([TS])
+    result = await KimaiSync(db, kimai).sync()
+    assert result["full"] is False
+    assert kimai.calls == [(cursor - timedelta(hours=24)).strftime("%Y-%m-%dT%H:%M:%S")]
+    assert db.pruned_with is None
+
+
+@pytest.mark.asyncio
+async def test_empty_full_sync_does_not_wipe_mirror():
+    db = FakeDB()
+    db.timesheets[7] = ("kept",)
+    await KimaiSync(db, FakeKimai([])).sync(full=True)
+    assert db.pruned_with is None
+    assert 7 in db.timesheets
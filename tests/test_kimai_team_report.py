@@ -0,0 +1,63 @@
+"""Tests for KimaiClient.build_team_report_data against a fake Kimai API."""
+import pytest
+
+from app.kimai_client import KimaiClient
+
+TEAMS = {
+    1: {"id": 1, "name": "A", "members": [
+        {"user": {"id": 10, "alias": "Ann"}, "teamlead": True},
+        {"user": {"id": 11, "username": "bob"}},
+    ]},
+    2: {"id": 2, "name": "B", "members": [
+        {"user": {"id": 10, "alias": "Ann"}},
+    ]},
+}
+TIMESHEETS = [
+    {"user": 10, "project": 100, "activity": 1, "duration": 3600, "rate": 50},
+    {"user": 10, "project": 100, "activity": 2, "duration": 0, "rate": 20},
+    {"user": 11, "project": 200, "activity": 1, "duration": 1800, "rate": 30},
+]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    c = KimaiClient("https://kimai.example", "token")
+    c.requests = []
+
+    async def fake_get(path, params=None):
+        c.requests.append((path, dict(params or {})))
+        if path == "/api/teams":
+            return [{"id": 1}, {"id": 2}]
+        if path.startswith("/api/teams/"):
+            return TEAMS[int(path.rsplit("/", 1)[1])]
+        if path == "/api/projects":
+            return [{"id": 100, "name": "Site"}, {"id": 200, "name": "App"}]
+        if path == "/api/activities":
+            return [{"id": 1, "name": "Dev"}, {"id": 2, "name": "Бонусы"}]
+        if path == "/api/timesheets":
+            return TIMESHEETS
+        raise AssertionError(path)
+
+    monkeypatch.setattr(c, "_get", fake_get)
+    return c
+
+
+@pytest.mark.asyncio
+async def test_one_timesheet_pull_grouped_by_user(client):
+    data = await client.build_team_report_data("2026-01-01T00:00:00", "2026-01-31T23:59:59")
+
+    timesheet_calls = [p for path, p in client.requests if path == "/api/timesheets"]
+    assert timesheet_calls == [{
+        "user": "all", "begin": "2026-01-01T00:00:00", "end": "2026-01-31T23:59:59",
+        "size": "500", "page": "1",
+    }]
+    assert [t["id"] for t in data["teams"]] == [1, 2]
+
+    ann_a, bob = data["report_by_team"][1]
+    (ann_b,) = data["report_by_team"][2]
+    assert ann_a["project_hours"] == {100: 1.0}
+    assert ann_a["project_money"] == {100: 50}
+    assert ann_a["bonus_from_activity"] == 20
+    assert ann_a["is_teamlead"] is True and ann_b["is_teamlead"] is False
+    assert ann_b["total_money"] == 50
+    assert bob["name"] == "bob" and bob["total_hours"] == 0.5
@@ -0,0 +1,86 @@
+"""Tests for app.llm_cache.LLMCache against an in-memory fake DB."""
+import asyncio
+
+import pytest
+
+from app.llm_cache import LLMCache, cache_key
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class FakeDB:
+    def __init__(self):
+        self.rows = {}
+
+    async def get_llm_cache(self, key, ttl_days):
+        return self.rows.get(key)
+
+    async def save_llm_cache(self, key, model, response):
+        self.rows[key] = response
+
+    async def purge_llm_cache(self, ttl_days, max_rows):
+        return 0
+
+
+def counting_call(result="answer", delay=0):
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if delay:
+            await asyncio.sleep(delay)
+        return result
+
+    return call, calls
+
+
+def test_cache_key_depends_on_model_messages_and_params():
+    base = cache_key("m", MESSAGES, {"max_tokens": 10})
+    assert base == cache_key("m", list(MESSAGES), {"max_tokens": 10})
+    assert base != cache_key("m2", MESSAGES, {"max_tokens": 10})
+    assert base != cache_key("m", MESSAGES, {"max_tokens": 11})
+    assert base != cache_key("m", [{"role": "user", "content": "hi!"}], {"max_tokens": 10})
+
+
+@pytest.mark.asyncio
+async def test_second_call_is_served_from_db():
+    db = FakeDB()
+    call, calls = counting_call()
+    assert await LLMCache(db).get_or_call("m", MESSAGES, None, call) == "answer"
+    # A fresh instance (new process) has an empty memory layer and reads the DB row.
+    cache = LLMCache(db)
+    assert await cache.get_or_call("m", MESSAGES, None, call) == "answer"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bypass_calls_again_and_overwrites():
+    cache = LLMCache(FakeDB())
+    call, _ = counting_call("old")
+    await cache.get_or_call("m", MESSAGES, None, call)
+    fresh, calls = counting_call("new")
+    assert await cache.get_or_call("m", MESSAGES, None, fresh, bypass=True) == "new"
+    assert await cache.get_or_call("m", MESSAGES, None, fresh) == "new"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call():
+    cache = LLMCache(FakeDB())
+    call, calls = counting_call(delay=0.01)
+    results = await asyncio.gather(*(cache.get_or_call("m", MESSAGES, None, call) for _ in range(5)))
+    assert results == ["answer"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["shared"] == 4
+
+
+@pytest.mark.asyncio
+async def test_empty_answer_is_not_cached():
+    db = FakeDB()
+    cache = LLMCache(db)
+    call, calls = counting_call(None)
+    assert await cache.get_or_call("m", MESSAGES, None, call) is None
+    assert await cache.get_or_call("m", MESSAGES, None, call) is None
+    assert len(calls) == 2
+    assert db.rows == {}
@@ -0,0 +1,32 @@
+"""Tests for app.llm_stream SSE parsing/formatting."""
+import json
+
+import pytest
+
+from app.llm_stream import parse_sse_line, sse_event
+
+
+def test_parse_sse_line_extracts_content_delta():
+    line = 'data: ' + json.dumps({"choices": [{"delta": {"content": "При"}}]})
+    assert parse_sse_line(line) == "При"
+
+
+@pytest.mark.parametrize("line", [
+    ": OPENROUTER PROCESSING",
+    "data: [DONE]",
+    "data: ",
+    'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+    'data: {"choices": []}',
+    "data: {not json",
+])
+def test_parse_sse_line_skips_non_content(line):
+    assert parse_sse_line(line) is None
+
+
+def test_parse_sse_line_raises_on_mid_stream_error():
+    with pytest.raises(RuntimeError, match="overloaded"):
+        parse_sse_line('data: {"error": {"message": "overloaded"}}')
+
+
+def test_sse_event_format():
+    assert sse_event("delta", {"text": "ок"}) == 'event: delta\ndata: {"text": "ок"}\n\n'.encode()
@@ -0,0 +1,41 @@
+"""Tests for app.pgvector_codec."""
+import struct
+
+import pytest
+
+from app.pgvector_codec import decode_vector, encode_vector, register_vector_codec
+
+
+def test_roundtrip_is_float4_exact():
+    values = [0.0, 1.5, -2.25, 1e-3]
+    decoded = decode_vector(encode_vector(values))
+    assert decoded == [struct.unpack(">f", struct.pack(">f", v))[0] for v in values]
+
+
+def test_wire_format_matches_pgvector():
+    data = encode_vector([1.0, 2.0])
+    assert data == b"\x00\x02\x00\x00" + struct.pack(">2f", 1.0, 2.0)
+    assert len(encode_vector([0.0] * 1536)) == 4 + 4 * 1536
+
+
+class FakeConn:
+    def __init__(self, exc=None):
+        self.exc = exc
+        self.registered = None
+
+    async def set_type_codec(self, typename, **kw):
+        if self.exc:
+            raise self.exc
+        self.registered = (typename, kw["format"])
+
+
+@pytest.mark.asyncio
+async def test_register_sets_binary_codec():
+    conn = FakeConn()
+    assert await register_vector_codec(conn) is True
+    assert conn.registered == ("vector", "binary")
+
+
+@pytest.mark.asyncio
+async def test_register_without_extension_is_not_fatal():
+    assert await register_vector_codec(FakeConn(ValueError("unknown type: public.vector"))) is False
@@ -0,0 +1,77 @@
+"""Tests for ReportService: fingerprint cache, shared in-flight renders, timeouts."""
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+from app import concurrency, report_service
+from app.report_service import ReportService, report_fingerprint
+
+
+@pytest.fixture
+def fake_render(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def render(kind, kwargs):
+        time.sleep(0.05)
+        with lock:
+            calls.append((kind, kwargs))
+        return f"{kind}:{kwargs['begin_label']}".encode()
+
+    monkeypatch.setattr(report_service, "_render_in_worker", render)
+    monkeypatch.setattr(concurrency, "spawn_process_pool",
+                        lambda workers: concurrent.futures.ThreadPoolExecutor(max_workers=workers))
+    return calls
+
+
+def test_fingerprint_tracks_data():
+    a = report_fingerprint("team", {"report_by_team": {1: [{"h": 2}]}, "begin_label": "01.02"})
+    assert a == report_fingerprint("team", {"begin_label": "01.02", "report_by_team": {1: [{"h": 2}]}})
+    assert a != report_fingerprint("team", {"report_by_team": {1: [{"h": 3}]}, "begin_label": "01.02"})
+    assert report_fingerprint("team", {"m": {1: "a", "b": 2}}) is None
+
+
+@pytest.mark.asyncio
+async def test_cached_until_data_changes(fake_render):
+    reports = ReportService(workers=1, timeout=10)
+    try:
+        first = await reports.render("team", report_by_team={1: 5}, begin_label="01.02")
+        again = await reports.render("team", report_by_team={1: 5}, begin_label="01.02")
+        changed = await reports.render("team", report_by_team={1: 6}, begin_label="01.02")
+    finally:
+        reports.close()
+    assert first == again == changed == b"team:01.02"
+    assert len(fake_render) == 2
+    assert reports.stats()["cache"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_render(fake_render):
+    reports = ReportService(workers=2, timeout=10)
+    try:
+        results = await asyncio.gather(*(
+            reports.render("client", customer_name="ACME", begin_label="01.02") for _ in range(3)
+        ))
+    finally:
+        reports.close()
+    assert results == [b"client:01.02"] * 3
+    assert len(fake_render) == 1
+    assert reports.stats()["shared"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_kind_and_timeout(fake_render):
+    reports = ReportService(workers=1, timeout=0.01)
+    with pytest.raises(ValueError):
+        await reports.render("excel")
+    with pytest.raises(TimeoutError):
+        await reports.render("team", begin_label="01.02")
+    assert reports.stats()["timeouts"] == 1
+    assert reports.stats()["pool"]["killed"] == 1
+    # The next render gets a fresh worker instead of failing on a broken pool.
+    reports.timeout = 10
+    assert await reports.render("team", begin_label="02.02") == b"team:02.02"
+    reports.close()
@@ -0,0 +1,82 @@
+"""Tests for the on-disk MediaCache (hits, single-flight, eviction)."""
+import asyncio
+import os
+
+import pytest
+
+from app.s3_media import MediaCache
+
+
+def _downloader(payload: bytes, calls: list, delay: float = 0):
+    async def download(path):
+        calls.append(path)
+        await asyncio.sleep(delay)
+        with open(path, "wb") as f:
+            f.write(payload)
+        return len(payload)
+    return download
+
+
+@pytest.mark.asyncio
+async def test_second_fetch_is_served_from_disk(tmp_path):
+    cache = MediaCache(str(tmp_path / "cache"), max_bytes=1024)
+    calls = []
+
+    assert await cache.fetch("k", str(tmp_path / "a.mp3"), _downloader(b"abc", calls)) == 3
+    assert await cache.fetch("k", str(tmp_path / "b.mp3"), _downloader(b"abc", calls)) == 3
+
+    assert len(calls) == 1 and calls[0].endswith(".part")
+    assert (tmp_path / "b.mp3").read_bytes() == b"abc"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_download(tmp_path):
+    cache = MediaCache(str(tmp_path / "cache"), max_bytes=1024)
+    calls = []
+    download = _downloader(b"xyz", calls, delay=0.01)
+
+    sizes = await asyncio.gather(*(
+        cache.fetch("k", str(tmp_path / f"{i}.mp3"), download) for i in range(3)
+    ))
+
+    assert sizes == [3, 3, 3]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_download_is_not_cached(tmp_path):
+    cache = MediaCache(str(tmp_path / "cache"), max_bytes=1024)
+
+    async def empty(path):
+        open(path, "wb").close()
+        return 0
+
+    assert await cache.fetch("k", str(tmp_path / "a.mp3"), empty) == 0
+    assert os.listdir(tmp_path / "cache") == []
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_is_evicted(tmp_path):
+    cache = MediaCache(str(tmp_path / "cache"), max_bytes=10)
+    calls = []
+    await cache.fetch("old", str(tmp_path / "1"), _downloader(b"123456", calls))
+    os.utime(cache._path("old"), (1, 1))
+    await cache.fetch("new", str(tmp_path / "2"), _downloader(b"654321", calls))
+
+    assert not os.path.exists(cache._path("old"))
+    assert os.path.exists(cache._path("new"))
+    # The caller's copy survives eviction.
+    assert (tmp_path / "1").read_bytes() == b"123456"
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_downloads_directly(tmp_path):
+    cache = MediaCache(str(tmp_path / "cache"), max_bytes=0)
+    calls = []
+    dest = str(tmp_path / "a.mp3")
+
+    await cache.fetch("k", dest, _downloader(b"abc", calls))
+
+    assert calls == [dest]
+    assert not os.path.exists(tmp_path / "cache")
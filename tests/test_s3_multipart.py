@@ -0,0 +1,85 @@
+"""Tests for app.s3_client.S3MultipartWriter against an in-memory fake boto3 client."""
+import os
+import threading
+import time
+
+import pytest
+
+from app.s3_client import S3Client, S3MultipartWriter
+
+
+class FakeS3:
+    def __init__(self, fail_part: int | None = None):
+        self.parts: dict[int, bytes] = {}
+        self.completed = None
+        self.aborted = False
+        self.fail_part = fail_part
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def create_multipart_upload(self, **kw):
+        return {"UploadId": "u1"}
+
+    def upload_part(self, PartNumber, Body, **kw):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        if PartNumber == self.fail_part:
+            raise RuntimeError("part upload failed")
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, MultipartUpload, **kw):
+        self.completed = MultipartUpload["Parts"]
+
+    def abort_multipart_upload(self, **kw):
+        self.aborted = True
+
+
+def _writer(fake: FakeS3, **kw) -> S3MultipartWriter:
+    s3 = S3Client()
+    s3._client = fake
+    return S3MultipartWriter(s3, "meetings/1/video.mp4", "video/mp4", **kw)
+
+
+@pytest.mark.asyncio
+async def test_parts_are_reassembled_in_order():
+    fake = FakeS3()
+    writer = _writer(fake, max_in_flight=2)
+    payload = os.urandom(writer.part_size * 3 + 12345)
+    await writer.start()
+    for i in range(0, len(payload), 65536):
+        await writer.write(payload[i:i + 65536])
+    url = await writer.complete()
+
+    assert url.endswith("/meetings/1/video.mp4")
+    assert [p["PartNumber"] for p in fake.completed] == sorted(fake.parts)
+    assert b"".join(fake.parts[n] for n in sorted(fake.parts)) == payload
+    assert all(len(fake.parts[n]) == writer.part_size for n in sorted(fake.parts)[:-1])
+    assert fake.peak <= 2
+
+
+@pytest.mark.asyncio
+async def test_small_body_uploads_single_part():
+    fake = FakeS3()
+    writer = _writer(fake)
+    await writer.start()
+    await writer.write(b"tiny")
+    await writer.complete()
+    assert fake.parts == {1: b"tiny"}
+
+
+@pytest.mark.asyncio
+async def test_failed_part_can_be_aborted():
+    fake = FakeS3(fail_part=1)
+    writer = _writer(fake)
+    await writer.start()
+    with pytest.raises(RuntimeError):
+        await writer.write(b"x" * writer.part_size)
+        await writer.complete()
+    await writer.abort()
+    assert fake.aborted and fake.completed is None
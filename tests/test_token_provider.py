@@ -0,0 +1,66 @@
+"""Tests for app.token_provider.TokenProvider."""
+import asyncio
+
+import pytest
+
+from app.token_provider import TokenProvider
+
+
+def fake_fetch(expires_in=3600, delay=0.01, fail=False):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("token endpoint down")
+        return f"tok{len(calls)}", expires_in
+
+    return fetch, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_fetch():
+    fetch, calls = fake_fetch()
+    tokens = TokenProvider(fetch)
+    results = await asyncio.gather(*(tokens.get() for _ in range(20)))
+    assert results == ["tok1"] * 20
+    assert len(calls) == 1
+    assert await tokens.get() == "tok1"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_ahead_does_not_block_callers():
+    # Valid for 200s, but inside the 300s refresh-ahead window.
+    fetch, calls = fake_fetch(expires_in=200)
+    tokens = TokenProvider(fetch)
+    assert await tokens.get() == "tok1"
+    assert await tokens.get() == "tok1"  # served immediately, refresh started
+    await asyncio.sleep(0.05)
+    assert len(calls) == 2
+    assert await tokens.get() == "tok2"
+
+
+@pytest.mark.asyncio
+async def test_invalidate_only_forgets_matching_token():
+    fetch, calls = fake_fetch()
+    tokens = TokenProvider(fetch)
+    await tokens.get()
+    tokens.invalidate("stale")
+    assert await tokens.get() == "tok1"
+    tokens.invalidate("tok1")
+    assert await tokens.get() == "tok2"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_every_waiter_and_is_retried_next_time():
+    fetch, calls = fake_fetch(fail=True)
+    tokens = TokenProvider(fetch)
+    results = await asyncio.gather(*(tokens.get() for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(calls) == 1
+    with pytest.raises(RuntimeError):
+        await tokens.get()
+    assert tokens.stats()["failures"] == 2
@@ -0,0 +1,70 @@
+"""Tests for app.ttl_cache.TTLCache."""
+from app import ttl_cache
+from app.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _with_clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_hit_and_miss_counters():
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats() == {'size': 1, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+
+def test_entries_expire(monkeypatch):
+    clock = _with_clock(monkeypatch)
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+    clock.now += 10
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    clock.now += 60
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_is_capped_by_default_ttl(monkeypatch):
+    clock = _with_clock(monkeypatch)
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1, ttl=3600)
+    clock.now += 31
+    assert "a" not in cache
+
+
+def test_non_positive_ttl_is_not_stored():
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1, ttl=0)
+    assert "a" not in cache
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")          # a is now most recently used
+    cache.set("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+
+def test_invalidate_where():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("t1", {"telegram_id": 1})
+    cache.set("t2", {"telegram_id": 2})
+    cache.set("t3", {"telegram_id": 1})
+    assert cache.invalidate_where(lambda k, v: v["telegram_id"] == 1) == 2
+    assert "t2" in cache and len(cache) == 1
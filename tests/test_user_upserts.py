@@ -0,0 +1,69 @@
+"""Tests for UserUpsertBuffer: coalescing, skipping unchanged profiles, shutdown flush."""
+import asyncio
+
+import pytest
+
+from app.user_upserts import UserUpsertBuffer
+
+
+class FakeDB:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def save_users_batch(self, rows):
+        if self.fail:
+            raise RuntimeError("db down")
+        self.batches.append(rows)
+
+
+@pytest.mark.asyncio
+async def test_updates_coalesce_per_user():
+    db = FakeDB()
+    buf = UserUpsertBuffer(db)
+    for _ in range(5):
+        buf.add(1, "Ann", None, "ann")
+    buf.add(2, "Bob", None, None)
+    buf.add(1, "Anna", None, "ann")
+
+    assert await buf.flush() == 2
+    assert db.batches == [[(1, "Anna", None, "ann", None), (2, "Bob", None, None, None)]]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_profile_is_not_rewritten():
+    db = FakeDB()
+    buf = UserUpsertBuffer(db)
+    buf.add(1, "Ann", None, "ann")
+    await buf.flush()
+
+    buf.add(1, "Ann", None, "ann")
+    assert await buf.flush() == 0
+    buf.add(1, "Ann", "Lee", "ann")
+    assert await buf.flush() == 1
+    assert buf.stats()["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_rows():
+    db = FakeDB(fail=True)
+    buf = UserUpsertBuffer(db)
+    buf.add(1, "Ann", None, "ann")
+
+    assert await buf.flush() == 0
+    db.fail = False
+    assert await buf.flush() == 1
+
+
+@pytest.mark.asyncio
+async def test_periodic_flush_and_final_flush_on_close():
+    db = FakeDB()
+    buf = UserUpsertBuffer(db, interval_ms=10)
+    buf.start()
+    buf.add(1, "Ann", None, "ann")
+    await asyncio.sleep(0.05)
+    assert len(db.batches) == 1
+
+    buf.add(2, "Bob", None, None)
+    await buf.close()
+    assert db.batches[-1] == [(2, "Bob", None, None, None)]
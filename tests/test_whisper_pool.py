@@ -0,0 +1,71 @@
+"""Tests for WhisperPool scheduling (the model itself is replaced by a stub)."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app import whisper_pool
+from app.whisper_pool import WhisperPool
+
+
+def test_nothing_starts_until_first_use():
+    pool = WhisperPool(mode="thread", workers=2)
+    assert pool.stats()["started"] is False
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        WhisperPool(mode="gpu")
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_and_extra_requests_queue(monkeypatch):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_transcribe(path, language, model_size, num_workers, cpu_threads):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return f"{path}:{language}:{num_workers}"
+
+    monkeypatch.setattr(whisper_pool, "_transcribe_file", fake_transcribe)
+    pool = WhisperPool(mode="thread", workers=2)
+    try:
+        tasks = [asyncio.ensure_future(pool.transcribe(f"v{i}.ogg")) for i in range(5)]
+        await asyncio.sleep(0.005)
+        assert pool.stats()["queued"] == 3
+        results = await asyncio.gather(*tasks)
+    finally:
+        pool.close()
+
+    assert results == [f"v{i}.ogg:ru:2" for i in range(5)]
+    assert peak == 2
+    assert pool.stats()["completed"] == 5 and pool.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failure_is_counted_and_frees_the_slot(monkeypatch):
+    calls = []
+
+    def fake_transcribe(path, *args):
+        calls.append(path)
+        if path == "bad.ogg":
+            raise RuntimeError("decode error")
+        return "ok"
+
+    monkeypatch.setattr(whisper_pool, "_transcribe_file", fake_transcribe)
+    pool = WhisperPool(mode="thread", workers=1)
+    try:
+        with pytest.raises(RuntimeError):
+            await pool.transcribe("bad.ogg")
+        assert await pool.transcribe("good.ogg") == "ok"
+    finally:
+        pool.close()
+    assert pool.stats()["failed"] == 1
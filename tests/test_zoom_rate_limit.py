@@ -0,0 +1,77 @@
+"""Tests for Zoom API rate-limit handling in app.zoom_client."""
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import zoom_client
+from app.zoom_client import ZoomClient, retry_after_seconds
+
+
+def test_retry_after_seconds_formats():
+    assert retry_after_seconds("3", 1) == 3.0
+    future = (datetime.now(timezone.utc) + timedelta(seconds=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    assert 25 <= retry_after_seconds(future, 1) <= 31
+    assert retry_after_seconds(None, 2) == 4.0
+    assert retry_after_seconds("garbage", 1) == 2.0
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None, data=None):
+        self.status = status
+        self.headers = headers or {}
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = 0
+
+    @asynccontextmanager
+    async def get(self, url, **kw):
+        self.calls += 1
+        yield self.responses.pop(0)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    c = ZoomClient("acc", "id", "secret")
+
+    async def token():
+        return "t"
+
+    monkeypatch.setattr(c, "get_access_token", token)
+    return c
+
+
+def use_session(monkeypatch, session):
+    @asynccontextmanager
+    async def pooled():
+        yield session
+
+    monkeypatch.setattr(zoom_client, "pooled_session", pooled)
+
+
+@pytest.mark.asyncio
+async def test_429_pauses_limiter_and_retries(client, monkeypatch):
+    session = FakeSession([
+        FakeResponse(429, {"Retry-After": "0.05", "X-RateLimit-Type": "QPS"}),
+        FakeResponse(200, data={"duration": 42}),
+    ])
+    use_session(monkeypatch, session)
+    assert await client.get_past_meeting(1) == {"duration": 42}
+    assert session.calls == 2
+    assert client.limiter.pauses == 1
+
+
+@pytest.mark.asyncio
+async def test_long_retry_after_is_not_waited_out(client, monkeypatch):
+    session = FakeSession([FakeResponse(429, {"Retry-After": "3600"}, data={"code": 429})])
+    use_session(monkeypatch, session)
+    assert await client.get_meeting_recordings(1) is None
+    assert session.calls == 1
+    assert client.limiter.pauses == 0